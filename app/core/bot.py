@@ -3,7 +3,9 @@ from __future__ import annotations
 import functools
 import os
 import re
+import sys
 from textwrap import dedent
+from time import perf_counter
 from typing import Any, ClassVar, Final, TYPE_CHECKING
 
 import discord
@@ -11,11 +13,15 @@ import jishaku
 from aiohttp import ClientSession
 from discord.ext import commands
 
-from app.core.help import HelpCommand
+from app.core.help import HelpCache, HelpCommand
 from app.core.models import Command, Context
+from app.core.prefix import PrefixMatcher, resolve_prefix_matcher
 from app.database import Database
 from app.util.common import humanize_duration, pluralize
-from app.util.structures import LockWithReason
+from app.util.members import GuildChunker, MemberIndexCache
+from app.util.metrics import MetricsServer, metrics
+from app.util.structures import ExpiringLockRegistry, PromptRegistry
+import config
 from config import Colors, allowed_mentions, beta, beta_token, default_prefix, description, name, owner, token, version
 
 if TYPE_CHECKING:
@@ -33,17 +39,25 @@ class Bot(commands.Bot):
 
     session: ClientSession
     startup_timestamp: datetime
-    transaction_locks: dict[int, LockWithReason]
+    transaction_locks: ExpiringLockRegistry
+    prompts: PromptRegistry
+    member_index: MemberIndexCache
+    chunker: GuildChunker
+    help_cache: HelpCache
+    metrics_server: MetricsServer | None
+
+    _prefix_matchers: dict[int | None, PrefixMatcher]
+    _command_table: dict[str, commands.Command] | None = None
 
     INTENTS: Final[ClassVar[discord.Intents]] = discord.Intents(
         messages=True,
-        presences=True,
         members=True,
         guilds=True,
     )
 
     def __init__(self) -> None:
         key = 'owner_id' if isinstance(owner, int) else 'owner_ids'
+        self.help_cache: HelpCache = HelpCache()  # This has to exist before the help command is added
 
         super().__init__(
             command_prefix=self.__class__.resolve_command_prefix,
@@ -53,6 +67,7 @@ class Bot(commands.Bot):
             case_insensitive=True,
             allowed_mentions=allowed_mentions,
             intents=self.INTENTS,
+            chunk_guilds_at_startup=False,
             status=discord.Status.dnd,
             max_messages=10,
             **{key: owner},
@@ -61,15 +76,71 @@ class Bot(commands.Bot):
         self._BotBase__cogs = commands.core._CaseInsensitiveDict()
         self.prepare()
 
+    def get_prefixes(self, guild: discord.abc.Snowflake | None) -> tuple[str, ...]:
+        """Returns the prefixes (excluding mentions) for the given guild. This never queries the database."""
+        if guild is None:
+            return default_prefix,
+
+        return self.db.guild_prefixes.get(guild.id) or (default_prefix,)
+
+    def get_prefix_matcher(self, guild: discord.abc.Snowflake | None) -> PrefixMatcher:
+        """Returns the precompiled prefix matcher for the given guild.
+
+        Guilds without custom prefixes share the default matcher, which is stored under ``None``.
+        These are built lazily as they require the bot user.
+        """
+        return resolve_prefix_matcher(
+            self._prefix_matchers,
+            self.db.guild_prefixes,
+            guild.id if guild is not None else None,
+            user_id=self.user.id,
+            default=(default_prefix,),
+        )
+
+    def invalidate_prefix_matcher(self, guild_id: int) -> None:
+        self._prefix_matchers.pop(guild_id, None)
+
+    @property
+    def command_table(self) -> dict[str, commands.Command]:
+        """A flat mapping of casefolded top-level command names and aliases to their commands."""
+        if self._command_table is None:
+            self._command_table = dict(self.all_commands)
+
+        return self._command_table
+
+    def add_command(self, command: commands.Command, /) -> None:
+        super().add_command(command)
+        self._command_table = None
+        self.help_cache.clear()
+
+    def remove_command(self, name: str, /) -> commands.Command | None:
+        command = super().remove_command(name)
+        self._command_table = None
+        self.help_cache.clear()
+        return command
+
     async def resolve_command_prefix(self, message: discord.Message) -> list[str]:
         """Resolves a command prefix from a message."""
-        return commands.when_mentioned_or(default_prefix)(self, message)
+        return list(self.get_prefix_matcher(message.guild).prefixes)
 
     async def _dispatch_first_ready(self) -> None:
         """Waits for the inbound READY gateway event, then dispatches the `first_ready` event."""
         await self.wait_until_ready()
         self.dispatch('first_ready')
 
+    async def _start_metrics_server(self) -> None:
+        """Starts the metrics server, reporting rather than swallowing a failure to bind."""
+        server = self.metrics_server
+
+        try:
+            await server.start()
+        except OSError as exc:
+            print(f'Failed to start the metrics server on {server.host}:{server.port}: {exc}', file=sys.stderr)
+            await server.close()
+            self.metrics_server = None
+        else:
+            print(f'Serving metrics on http://{server.host}:{server.port}/metrics')
+
     def _load_extensions(self) -> None:
         """Loads all command extensions, including Jishaku."""
         self.load_extension('jishaku')
@@ -82,13 +153,27 @@ class Bot(commands.Bot):
                 self.load_extension(f'app.extensions.{file[:-3]}')
 
         self.load_extension('app.extensions.slash')  # Load this last
+        self.help_cache.build(self)
 
     def prepare(self) -> None:
         """Prepares the bot for startup."""
         self.db: Database = Database(self, loop=self.loop)
-        self.transaction_locks: dict[int, LockWithReason] = {}
+        self.transaction_locks: ExpiringLockRegistry = ExpiringLockRegistry()
+        self._prefix_matchers: dict[int | None, PrefixMatcher] = {}
+        self.prompts: PromptRegistry = PromptRegistry()
+        self.member_index: MemberIndexCache = MemberIndexCache()
+        self.chunker: GuildChunker = GuildChunker(on_release=self.member_index.remove_guild)
         self.session: ClientSession = ClientSession()
 
+        # Metrics are only served if metrics_port is set in the config
+        metrics.bind(self)
+        self.metrics_server: MetricsServer | None = None
+
+        if (port := getattr(config, 'metrics_port', None)) is not None:
+            self.metrics_server = MetricsServer(metrics, host=getattr(config, 'metrics_host', '127.0.0.1'), port=port)
+            self.loop.create_task(self._start_metrics_server())
+
+        self.loop.create_task(metrics.monitor_loop_lag())
         self.loop.create_task(self._dispatch_first_ready())
         self._load_extensions()
 
@@ -96,9 +181,25 @@ class Bot(commands.Bot):
         if message.author.bot:
             return
 
+        # Discard anything that isn't a command before building a context
+        match = self.get_prefix_matcher(message.guild).match(message.content)
+        if match is None or match.invoker.casefold() not in self.command_table:
+            return
+
         ctx = await self.get_context(message, cls=Context)
         await self.invoke(ctx)
 
+    async def invoke(self, ctx: Context, /) -> None:
+        start = perf_counter()
+
+        try:
+            await super().invoke(ctx)
+        finally:
+            if command := ctx.invoked_subcommand or ctx.command:
+                name = command.qualified_name
+                metrics.command_invocations.labels(name).inc()
+                metrics.command_latency.labels(name).observe(perf_counter() - start)
+
     async def on_first_ready(self) -> None:
         self.startup_timestamp = discord.utils.utcnow()
 
@@ -108,13 +209,35 @@ class Bot(commands.Bot):
         print(format(center, f'=^{len(text)}'))
         print(text)
 
+    async def on_member_join(self, member: discord.Member) -> None:
+        self.member_index.add_member(member)
+
+    async def on_member_remove(self, member: discord.Member) -> None:
+        self.member_index.remove_member(member)
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        if before.display_name != after.display_name:
+            self.member_index.add_member(after)
+
+    async def on_user_update(self, before: discord.User, after: discord.User) -> None:
+        if str(before) != str(after):
+            self.member_index.update_user(after, self.get_guild)
+
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self.member_index.remove_guild(guild)
+        self.chunker.forget(guild)
+
     @staticmethod
-    def remove_ansi_if_mobile(ctx: Context, text: str) -> str:
+    def remove_ansi_if_preferred(ctx: Context, text: str) -> str:
         """Currently, ANSI syntax highlighting does not render properly on mobile devices.
 
-        Here, we check if `mobile_status` is not offline - if it is, we remove all ANSI syntax higlighting.
+        We can't tell which device a user is on without the presences intent, so users opt into
+        plain text through the `plain_text_errors` setting instead. If it is enabled, we remove all ANSI syntax highlighting.
         """
-        if ctx.author.mobile_status != discord.Status.offline:
+        # Only read from the cache, creating an unfetched record here would leave it in the cache with no data
+        record = ctx.db.user_records.get(ctx.author.id)
+
+        if record is not None and record.data.get('plain_text_errors'):
             return ANSI_REGEX.sub('', text)
 
         return text
@@ -123,10 +246,16 @@ class Bot(commands.Bot):
         if message.author.bot:
             return
 
-        if message.content in {f'<@{self.user.id}>', f'<@!{self.user.id}>'}:
+        self.prompts.dispatch(message)
+
+        if message.content in self.get_prefix_matcher(message.guild).mentions:
+            prefixes = self.get_prefixes(message.guild)
+            prefix = prefixes[0]
+            readable = ', '.join(f'`{p}`' for p in prefixes)
+
             await message.reply(
-                f"Hey, I'm {self.user.name}. My prefix here is `{default_prefix}`.\nAdditionally, "
-                f"some of my commands are available as slash commands.\n\nFor more help, run `{default_prefix}help`."
+                f"Hey, I'm {self.user.name}. My prefix here is {readable}.\nAdditionally, "
+                f"some of my commands are available as slash commands.\n\nFor more help, run `{prefix}help`."
             )
 
         await self.process_commands(message)
@@ -138,6 +267,9 @@ class Bot(commands.Bot):
         if isinstance(error, commands.BadUnionArgument):
             error = error.errors[0]
 
+        if ctx.command is not None:
+            metrics.command_errors.labels((ctx.command.qualified_name, type(error).__name__)).inc()
+
         blacklist = (
             commands.CommandNotFound,
             commands.CheckFailure,
@@ -173,9 +305,9 @@ class Bot(commands.Bot):
 
             # inspired by Rust error messages
             #
-            # this looks really nice on PC, but it looks horrible on mobile
-            # maybe make it look different on mobile?
-            return await respond(self.remove_ansi_if_mobile(ctx, dedent(f"""
+            # this looks really nice on PC, but it looks horrible on mobile,
+            # which is what the plain_text_errors setting is for
+            return await respond(self.remove_ansi_if_preferred(ctx, dedent(f"""
                 Could not parse your command input properly:
                 ```ansi
                 Attempted to parse signature:
@@ -216,6 +348,9 @@ class Bot(commands.Bot):
         raise error
 
     async def close(self) -> None:
+        if self.metrics_server is not None:
+            await self.metrics_server.close()
+
         await self.session.close()
         await super().close()
 
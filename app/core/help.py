@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, TYPE_CHECKING
+from typing import Any, Iterable, TYPE_CHECKING
 
 import discord
 from discord.ext import commands
@@ -12,7 +12,73 @@ from app.util.views import UserView
 from config import Colors
 
 if TYPE_CHECKING:
-    from app.core import Cog, Context, GroupCommand
+    from app.core import Bot, Cog, Context, GroupCommand
+
+    CommandEntry = tuple[str, str]  # (qualified_name + signature, description)
+
+__all__ = (
+    'HelpCache',
+    'HelpCommand',
+)
+
+
+class HelpCache:
+    """Caches the parts of help pages that don't depend on who invoked the command.
+
+    This is built once all extensions are loaded, and cleared whenever a command is added or removed
+    (which is what loading, unloading or reloading an extension does). Anything that isn't cached yet is built lazily.
+    Only the prefix and the author are filled in per invocation.
+    """
+
+    def __init__(self) -> None:
+        self._mapping: dict[Cog, list[Command]] | None = None
+        self._bot_fields: list[dict[str, str | bool]] | None = None
+        self._entries: dict[Cog | GroupCommand, tuple[CommandEntry, ...]] = {}
+
+    def clear(self) -> None:
+        self._mapping = None
+        self._bot_fields = None
+        self._entries.clear()
+
+    def build(self, bot: Bot) -> None:
+        """Eagerly builds the cache for every visible cog and every group within them."""
+        self.clear()
+
+        for cog, cmds in self.mapping(bot).items():
+            self.entries_for(cog, cmds)
+
+            for command in cog.walk_commands():
+                if isinstance(command, commands.Group):
+                    self.entries_for(command, command.commands)
+
+        self.bot_fields(bot)
+
+    def mapping(self, bot: Bot) -> dict[Cog, list[Command]]:
+        """The mapping of visible cogs to their commands."""
+        if self._mapping is None:
+            self._mapping = HelpCommand.filter_mapping({cog: cog.get_commands() for cog in bot.cogs.values()})
+
+        return self._mapping
+
+    def bot_fields(self, bot: Bot) -> list[dict[str, str | bool]]:
+        if self._bot_fields is None:
+            self._bot_fields = [
+                {
+                    'name': cog.qualified_name,
+                    'value': f'{cog.description}\n{HelpCommand.format_commands(cmds)}',
+                    'inline': False,
+                }
+                for cog, cmds in self.mapping(bot).items()
+            ]
+
+        return self._bot_fields
+
+    def entries_for(self, key: Cog | GroupCommand, cmds: Iterable[Command]) -> tuple[CommandEntry, ...]:
+        try:
+            return self._entries[key]
+        except KeyError:
+            entries = self._entries[key] = HelpCommand.commands_into_entries(cmds)
+            return entries
 
 
 class CogSelect(discord.ui.Select[PaginatorView]):
@@ -36,7 +102,8 @@ class CogSelect(discord.ui.Select[PaginatorView]):
 
     @staticmethod
     def get_command_fields(ctx: Context, cog: Cog) -> list[dict[str, str | bool]]:
-        return HelpCommand.commands_into_fields(ctx, cog.get_commands())
+        entries = ctx.bot.help_cache.entries_for(cog, cog.get_commands())
+        return HelpCommand.entries_into_fields(ctx, entries)
 
     @staticmethod
     def get_base_cog_embed(ctx: Context, cog: Cog) -> discord.Embed:
@@ -137,42 +204,43 @@ class HelpCommand(commands.HelpCommand):
         return '\u2002'.join(f'`{cmd.qualified_name}`' for cmd in sorted(cmds, key=lambda c: c.qualified_name))
 
     def get_bot_mapping(self) -> dict[Cog, list[Command]]:
-        mapping = super().get_bot_mapping()
-        del mapping[None]
-
-        return mapping
+        return self.context.bot.help_cache.mapping(self.context.bot)
 
     @staticmethod
     def filter_mapping(mapping: dict[Cog, list[Command]]) -> dict[Cog, list[Command]]:
         return {cog: v for cog, v in mapping.items() if not getattr(cog, '__hidden__', True)}
 
     @staticmethod
-    def commands_into_fields(ctx: Context, cmd: list[Command]) -> list[dict[str, str | bool]]:
-        return [
-            {
-                'name': cutoff(ctx.clean_prefix + command.qualified_name + ' ' + command.signature, exact=True),
-                'value': command.short_doc or command.description or 'No description provided.',
-                'inline': False,
-            }
-            for command in sorted(cmd, key=lambda c: c.qualified_name)
+    def commands_into_entries(cmds: Iterable[Command]) -> tuple[CommandEntry, ...]:
+        return tuple(
+            (
+                command.qualified_name + ' ' + command.signature,
+                command.short_doc or command.description or 'No description provided.',
+            )
+            for command in sorted(cmds, key=lambda c: c.qualified_name)
             if not command.hidden
+        )
+
+    @staticmethod
+    def entries_into_fields(ctx: Context, entries: Iterable[CommandEntry]) -> list[dict[str, str | bool]]:
+        prefix = ctx.clean_prefix
+
+        return [
+            {'name': cutoff(prefix + signature, exact=True), 'value': value, 'inline': False}
+            for signature, value in entries
         ]
 
+    @classmethod
+    def commands_into_fields(cls, ctx: Context, cmd: list[Command]) -> list[dict[str, str | bool]]:
+        return cls.entries_into_fields(ctx, cls.commands_into_entries(cmd))
+
     @classmethod
     def get_bot_help_paginator(cls, ctx: Context, mapping: dict[Cog, list[Command]]) -> Paginator:
         embed = discord.Embed(color=Colors.primary, timestamp=ctx.now)
         embed.set_author(name=f'Help: {ctx.author.name}', icon_url=ctx.author.avatar.url)
 
         mapping = cls.filter_mapping(mapping)
-
-        fields = [
-            {
-                'name': cog.qualified_name,
-                'value': f'{cog.description}\n{cls.format_commands(cmds)}',
-                'inline': False,
-            }
-            for cog, cmds in mapping.items()
-        ]
+        fields = list(ctx.bot.help_cache.bot_fields(ctx.bot))
 
         return Paginator(
             ctx,
@@ -196,7 +264,7 @@ class HelpCommand(commands.HelpCommand):
             self.context,
             FieldBasedFormatter(embed, fields, page_in_footer=True),
             center_button=CenterButton(ctx=self.context),
-            other_components=[CogSelect(self.filter_mapping(self.get_bot_mapping()))],
+            other_components=[CogSelect(self.get_bot_mapping())],
             row=1,
         )
 
@@ -214,7 +282,7 @@ class HelpCommand(commands.HelpCommand):
             usage = command.usage
 
         body = command.help or 'No description provided.'
-        embed.description = ctx.bot.remove_ansi_if_mobile(
+        embed.description = ctx.bot.remove_ansi_if_preferred(
             ctx,
             f'```ansi\n\u001b[37;1m{ctx.clean_prefix}\u001b[32;1m{command.qualified_name} {usage}```\n{body}',
         )
@@ -239,7 +307,8 @@ class HelpCommand(commands.HelpCommand):
     async def send_group_help(self, group: GroupCommand) -> None:
         """Send the group's help command."""
         embed = self.get_base_command_embed(group)
-        fields = self.commands_into_fields(self.context, list(group.commands))
+        entries = self.context.bot.help_cache.entries_for(group, group.commands)
+        fields = self.entries_into_fields(self.context, entries)
 
         paginator = Paginator(
             self.context,
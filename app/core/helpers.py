@@ -12,6 +12,7 @@ from app.core.models import Command, GroupCommand
 from app.util.common import setinel
 from app.util.pagination import Paginator
 from app.util.structures import LockWithReason
+from app.util.tracing import tracer
 
 if TYPE_CHECKING:
     from app.core.models import Context, Cog
@@ -139,10 +140,12 @@ async def process_message(ctx: Context, payload: Any) -> discord.Message | None:
 
     if paginator:
         clean_interaction_kwargs(kwargs)
-        return await paginator.start(interaction=interaction, **kwargs)
+        await paginator.start(interaction=interaction, **kwargs)
+        return ctx.record_first_response()
 
     if interaction:
-        return await _into_interaction_response(interaction, kwargs)
+        await _into_interaction_response(interaction, kwargs)
+        return ctx.record_first_response()
 
     return await ctx.send(**kwargs)
 
@@ -152,19 +155,23 @@ async def process_message(ctx: Context, payload: Any) -> discord.Message | None:
 def easy_command_callback(func: callable) -> callable:
     @wraps(func)
     async def wrapper(cog: Cog, ctx: Context, /, *args, **kwargs) -> None:
-        coro = func(cog, ctx, *args, **kwargs)
-
-        if inspect.isasyncgen(coro):
-            async for payload in coro:
-                await process_message(ctx, payload)
-        else:
-            await process_message(ctx, await coro)
+        with tracer.trace(ctx.command.qualified_name, ctx.author.id):
+            coro = func(cog, ctx, *args, **kwargs)
+
+            if inspect.isasyncgen(coro):
+                async for payload in coro:
+                    with tracer.span('process_message', 'yield'):
+                        await process_message(ctx, payload)
+            else:
+                payload = await coro
+                with tracer.span('process_message', 'yield'):
+                    await process_message(ctx, payload)
 
     return wrapper
 
 
 def _get_lock(ctx: Context) -> LockWithReason:
-    return ctx.bot.transaction_locks.setdefault(ctx.author.id, LockWithReason())
+    return ctx.bot.transaction_locks.get(ctx.author.id)
 
 
 def lock_transactions(func: callable) -> callable:
@@ -2,10 +2,15 @@ from __future__ import annotations
 
 import discord
 import datetime
+from time import perf_counter
+from weakref import WeakKeyDictionary
 
 from discord.ext import commands
+from discord.ext.commands import run_converters
 from discord.utils import maybe_coroutine as maybe_coro
 
+from app.util.metrics import metrics
+from app.util.tracing import tracer
 from app.util.types import TypedContext
 from app.util.views import AnyUser, ConfirmationView
 
@@ -15,10 +20,19 @@ if TYPE_CHECKING:
     from app.core.bot import Bot
     from app.database import Database
 
+# command -> {until: (ansi, count, length)}
+# Weakly referenced so that commands from unloaded or reloaded extensions are dropped
+_ANSI_SIGNATURE_CACHE: WeakKeyDictionary[commands.Command, dict[str, tuple[str, int, int]]] = WeakKeyDictionary()
+
 
 class Context(TypedContext):
     bot: Bot
 
+    # Already resolved arguments, keyed by parameter name. See Command._parse_arguments.
+    direct_arguments: dict[str, Any] | None = None
+    # (dispatch method, perf_counter() on receipt) of the slash command this context came from, until it first responds
+    slash_dispatch: tuple[str, float] | None = None
+
     def __init__(self, **attrs) -> None:
         self._message: discord.Message | None = None
         super().__init__(**attrs)
@@ -47,6 +61,15 @@ class Context(TypedContext):
     def utcnow() -> datetime.datetime:
         return discord.utils.utcnow()
 
+    def record_first_response(self) -> None:
+        """Records the time from receiving the slash command to its first response. Only the first call counts."""
+        if self.slash_dispatch is None:
+            return
+
+        method, received_at = self.slash_dispatch
+        self.slash_dispatch = None
+        metrics.slash_first_response.labels(method).observe(perf_counter() - received_at)
+
     async def thumbs(self, message: discord.Message = None) -> None:
         message = message or self.message
         try:
@@ -80,7 +103,8 @@ class Context(TypedContext):
 
     async def maybe_edit(self, message: discord.Message, content: Any = None, **kwargs: Any) -> discord.Message | None:
         try:
-            await message.edit(content=content, **kwargs)
+            with tracer.span('edit', 'rest'):
+                await message.edit(content=content, **kwargs)
         except (AttributeError, discord.NotFound):
             if (not message) or message.channel == self.channel:
                 return await self.send(content, **kwargs)
@@ -110,7 +134,10 @@ class Context(TypedContext):
             await self.maybe_edit(self._message, content, **kwargs)
             return self._message
 
-        self._message = result = await super().send(content, **kwargs)
+        with tracer.span('send', 'rest'):
+            self._message = result = await super().send(content, **kwargs)
+
+        self.record_first_response()
         return result
 
 
@@ -130,12 +157,64 @@ class Cog(commands.Cog):
 
 
 class Command(commands.Command):
+    async def _parse_arguments(self, ctx: Context) -> None:
+        """If the context was given direct arguments (i.e. from a slash command), use those instead of parsing the message.
+
+        Non-string values are passed through as-is; strings are still run through the parameter's converter.
+        """
+        arguments = ctx.direct_arguments
+        if arguments is None:
+            return await super()._parse_arguments(ctx)
+
+        ctx.args = [ctx] if self.cog is None else [self.cog, ctx]
+        ctx.kwargs = {}
+
+        for name, param in self.clean_params.items():
+            value = arguments.get(name)
+
+            if param.kind == param.VAR_POSITIONAL:
+                # Greedy arguments are expected to be passed in already converted
+                ctx.args.extend(value or ())
+                continue
+
+            if value is None:
+                if param.default is param.empty:
+                    raise commands.MissingRequiredArgument(param)
+
+                value = param.default
+
+            elif isinstance(value, str):
+                converter = str if param.annotation is param.empty else param.annotation
+                ctx.current_parameter = param
+                value = await run_converters(ctx, converter, value, param)
+
+            if param.kind == param.KEYWORD_ONLY:
+                ctx.kwargs[name] = value
+            else:
+                ctx.args.append(value)
+
     def ansi_signature(self) -> str:
         return self.ansi_signature_until("$")[0]
 
+    def ansi_signature_until(self, until: str) -> tuple[str, int, int]:
+        """Returns the ANSI signature along with the offset and length of the carets pointing at the ``until`` parameter.
+
+        This is memoized per (command, parameter), as the signature of a command never changes once it is loaded.
+        """
+        try:
+            cache = _ANSI_SIGNATURE_CACHE[self]
+        except KeyError:
+            cache = _ANSI_SIGNATURE_CACHE[self] = {}
+
+        try:
+            return cache[until]
+        except KeyError:
+            result = cache[until] = Command._ansi_signature_until(self, until)
+            return result
+
     # This code consists of purely hell.
     # The base of this method was taken from the actual library, but I cba to actually optimize it nor it's changes.
-    def ansi_signature_until(self, until: str) -> tuple[str, int, int]:  # sourcery no-metrics
+    def _ansi_signature_until(self, until: str) -> tuple[str, int, int]:  # sourcery no-metrics
         params = self.clean_params
         if not params:
             return '', 0, 0
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable, Mapping, NamedTuple
+
+__all__ = (
+    'PrefixMatch',
+    'PrefixMatcher',
+    'resolve_prefix_matcher',
+)
+
+
+class PrefixMatch(NamedTuple):
+    prefix: str
+    invoker: str
+
+
+class PrefixMatcher:
+    """Matches a message's prefix and invoked command name with a single precompiled regex.
+
+    This lets us discard messages that aren't commands before any :class:`Context` is built.
+    Prefixes are tried in the order given, the same way ``commands.Bot`` tries them.
+    """
+
+    __slots__ = ('prefixes', 'mentions', '_pattern')
+
+    def __init__(self, prefixes: Iterable[str], *, mentions: Iterable[str] = ()) -> None:
+        self.prefixes: tuple[str, ...] = tuple(dict.fromkeys(prefixes))
+        self.mentions: frozenset[str] = frozenset(mentions)
+
+        alternatives = '|'.join(map(re.escape, self.prefixes))
+        self._pattern: re.Pattern[str] = re.compile(rf'(?P<prefix>{alternatives})(?P<invoker>\S+)')
+
+    @classmethod
+    def for_user(cls, user_id: int, prefixes: Iterable[str]) -> PrefixMatcher:
+        """Creates a matcher for the given prefixes that also accepts mentions of the given user."""
+        return cls((f'<@{user_id}> ', f'<@!{user_id}> ', *prefixes), mentions=(f'<@{user_id}>', f'<@!{user_id}>'))
+
+    def match(self, content: str) -> PrefixMatch | None:
+        if match := self._pattern.match(content):
+            return PrefixMatch(*match.groups())
+
+        return None
+
+
+def resolve_prefix_matcher(
+    matchers: dict[int | None, PrefixMatcher],
+    guild_prefixes: Mapping[int, tuple[str, ...]],
+    guild_id: int | None,
+    *,
+    user_id: int,
+    default: tuple[str, ...],
+) -> PrefixMatcher:
+    """Returns the matcher for the given guild from ``matchers``, building and storing it if necessary.
+
+    Guilds without custom prefixes share the default matcher, which is stored under ``None``.
+    """
+    key = guild_id if guild_id is not None and guild_id in guild_prefixes else None
+
+    try:
+        return matchers[key]
+    except KeyError:
+        matcher = matchers[key] = PrefixMatcher.for_user(user_id, guild_prefixes.get(key) or default)
+        return matcher
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import random
 from collections import defaultdict
 from dataclasses import dataclass
@@ -11,6 +10,7 @@ from typing import Any, Awaitable, Callable, Generator, Generic, NamedTuple, TYP
 
 from discord.ext.commands import BadArgument
 
+from app.util import tracing
 from app.util.common import pluralize
 from config import Emojis
 
@@ -242,7 +242,7 @@ class Items:
     async def use_banknote(self, ctx: Context, item: Item, quantity: int) -> None:
         message = await ctx.message.reply(pluralize(f'{item.emoji} Using {quantity} banknote(s)...'))
 
-        await asyncio.sleep(random.uniform(2, 4))
+        await tracing.sleep(random.uniform(2, 4))
 
         profit = random.randint(1000 * quantity, 3000 * quantity)
         await ctx.db.get_user_record(ctx.author.id, fetch=False).add(max_bank=profit)
@@ -280,7 +280,7 @@ class Items:
             readable = f'{quantity:,} slices of {item.name}'
 
         original = await ctx.send(f'{item.emoji} Eating {readable}...', reference=ctx.message)
-        await asyncio.sleep(random.uniform(2, 4))
+        await tracing.sleep(random.uniform(2, 4))
 
         chance = 1 - 0.98 ** quantity
         if random.random() < chance:
@@ -922,7 +922,7 @@ class Items:
                     await record.inventory_manager.add_item(item, amount, connection=conn)
                     break
 
-        await asyncio.sleep(random.uniform(1.5, 3.5))
+        await tracing.sleep(random.uniform(1.5, 3.5))
 
         readable = f'{Emojis.coin} {profit:,}\n' + '\n'.join(
             f'{item.emoji} {item.name} x{quantity:,}' for item, quantity in items.items()
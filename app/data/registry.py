@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from typing import Final, Iterable, TYPE_CHECKING, TypeAlias
+
+from app.data.items import Item, Items
+from app.data.recipes import Recipe, Recipes
+from app.data.skills import Skill, Skills
+from app.util.common import walk_collection
+
+if TYPE_CHECKING:
+    Entity: TypeAlias = 'Item | Skill | Recipe'
+
+__all__ = (
+    'CatalogRegistry',
+    'REGISTRY',
+)
+
+# These IDs are stored in the database and are permanent:
+# never renumber or reuse an ID, and keep the IDs of removed entries reserved by leaving them here.
+# New entries must be appended with a new ID. Items, skills and recipes share a single ID space,
+# each kind starting at its own offset, so that an ID alone identifies its entity.
+
+ITEM_IDS: Final[dict[str, int]] = {
+    'lifesaver': 1,
+    'padlock': 2,
+    'banknote': 3,
+    'cheese': 4,
+    'spinning_coin': 5,
+    'key': 6,
+    'fishing_pole': 7,
+    'fish_bait': 8,
+    'stick': 9,
+    'axe': 10,
+    'dirt': 11,
+    'worm': 12,
+    'gummy_worm': 13,
+    'earthworm': 14,
+    'hook_worm': 15,
+    'poly_worm': 16,
+    'ancient_relic': 17,
+    'shovel': 18,
+    'durable_shovel': 19,
+    'fish': 20,
+    'sardine': 21,
+    'angel_fish': 22,
+    'blowfish': 23,
+    'crab': 24,
+    'lobster': 25,
+    'octopus': 26,
+    'dolphin': 27,
+    'shark': 28,
+    'whale': 29,
+    'axolotl': 30,
+    'vibe_fish': 31,
+    'wood': 32,
+    'redwood': 33,
+    'blackwood': 34,
+    'iron': 35,
+    'copper': 36,
+    'silver': 37,
+    'gold': 38,
+    'obsidian': 39,
+    'emerald': 40,
+    'diamond': 41,
+    'pickaxe': 42,
+    'durable_pickaxe': 43,
+    'diamond_pickaxe': 44,
+    'common_crate': 45,
+    'uncommon_crate': 46,
+    'rare_crate': 47,
+    'epic_crate': 48,
+    'legendary_crate': 49,
+    'mythic_crate': 50,
+    'cup': 51,
+    'watering_can': 52,
+    'glass_of_water': 53,
+    'tomato': 54,
+    'tomato_crop': 55,
+    'wheat': 56,
+    'wheat_crop': 57,
+    'carrot': 58,
+    'carrot_crop': 59,
+    'corn': 60,
+    'corn_crop': 61,
+    'lettuce': 62,
+    'lettuce_crop': 63,
+    'potato': 64,
+    'potato_crop': 65,
+    'tobacco': 66,
+    'tobacco_crop': 67,
+    'flour': 68,
+    'loaf_of_bread': 69,
+}
+
+SKILL_IDS: Final[dict[str, int]] = {
+    'begging': 10000,
+    'robbery': 10001,
+    'defense': 10002,
+}
+
+RECIPE_IDS: Final[dict[str, int]] = {
+    'durable_shovel': 20000,
+    'durable_pickaxe': 20001,
+    'diamond_pickaxe': 20002,
+    'fish_bait': 20003,
+    'stick': 20004,
+    'flour': 20005,
+    'bread': 20006,
+    'glass_of_water': 20007,
+}
+
+class CatalogRegistry:
+    """Maps items, skills and recipes to and from their permanent smallint IDs."""
+
+    KINDS: Final[dict[type, str]] = {Item: 'item', Skill: 'skill', Recipe: 'recipe'}
+
+    def __init__(self) -> None:
+        self._entities: dict[int, Entity] = {}
+        self._ids: dict[tuple[str, str], int] = {}  # (kind, key): id
+        self._keys: dict[int, tuple[str, str]] = {}  # id: (kind, key)
+
+    def register(self, cls: type, ids: dict[str, int], entities: Iterable[Entity]) -> None:
+        kind = self.KINDS[cls]
+
+        for key, id in ids.items():
+            if id in self._keys:
+                raise RuntimeError(f'ID {id} is assigned to both {self._keys[id]} and {(kind, key)}')
+
+            self._ids[kind, key] = id
+            self._keys[id] = kind, key
+
+        for entity in entities:
+            if (id := self._ids.get((kind, entity.key))) is not None:
+                self._entities[id] = entity
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def entries(self) -> list[tuple[int, str, str]]:
+        """Returns (id, kind, key) for every registered ID."""
+        return [(id, kind, key) for id, (kind, key) in self._keys.items()]
+
+    def id_of(self, entity: Entity) -> int:
+        return self._ids[self.KINDS[type(entity)], entity.key]
+
+    def get(self, id: int) -> Entity | None:
+        return self._entities.get(id)
+
+    def check(self, catalogs: Iterable[tuple[type, Iterable[Entity]]]) -> None:
+        """Makes sure every entity in the given catalogs has an ID. This is ran on startup."""
+        missing = [
+            f'{self.KINDS[cls]} {entity.key!r}'
+            for cls, entities in catalogs
+            for entity in entities
+            if (self.KINDS[cls], entity.key) not in self._ids
+        ]
+
+        if missing:
+            raise RuntimeError(f'The following have no ID assigned in app/data/registry.py: {", ".join(missing)}')
+
+
+REGISTRY: CatalogRegistry = CatalogRegistry()
+REGISTRY.register(Item, ITEM_IDS, Items.all())
+REGISTRY.register(Skill, SKILL_IDS, walk_collection(Skills, Skill))
+REGISTRY.register(Recipe, RECIPE_IDS, walk_collection(Recipes, Recipe))
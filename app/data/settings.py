@@ -29,3 +29,24 @@ class Settings:
         name='DM Notifications',
         description='When enabled, I will direct message you whenever you receive a notification.',
     )
+
+    plain_text_errors = Setting(
+        key='plain_text_errors',
+        name='Plain Text Errors',
+        description='When enabled, error messages and command signatures are sent without ANSI highlighting, which does not render on mobile.',
+    )
+
+    crop_notifications = Setting(
+        key='crop_notifications',
+        name='Crop Notifications',
+        description='When enabled, you will receive a notification whenever one of your crops is ready to be harvested.',
+    )
+
+    silo_mode = Setting(
+        key='silo_mode',
+        name='Silo Mode',
+        description=(
+            'When enabled, your crops keep producing while you are away and store their harvests in a silo. '
+            'Use the `collect` command to collect everything at once.'
+        ),
+    )
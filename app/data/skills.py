@@ -7,6 +7,7 @@ from typing import Any, Awaitable, Callable, TYPE_CHECKING, TypeAlias
 
 import discord
 
+from app.util import tracing
 from app.util.common import insert_random_u200b
 from app.util.views import AnyUser, UserView
 from config import Colors
@@ -229,10 +230,8 @@ class Skills:
             await ctx.send(embed=embed)
 
             try:
-                message = await ctx.bot.wait_for(
-                    event='message',
-                    check=lambda m: m.author == ctx.author and m.content.lower() == prompt,
-                    timeout=15,
+                message = await ctx.bot.prompts.wait_for(
+                    ctx.author.id, check=lambda m: m.content.lower() == prompt, timeout=15,
                 )
             except asyncio.TimeoutError:
                 raise TrainingFailure("You didn't send the prompt in time, and you failed training for this session. Try again next time!")
@@ -308,7 +307,7 @@ class Skills:
         )
 
         await ctx.send(embed=embed, reference=ctx.message)
-        await asyncio.sleep(5)
+        await tracing.sleep(5)
 
         for i in range(1, 6):
             action = random.choice((PUNCH, KICK, LOW_PUNCH, HIGH_KICK))
@@ -2,20 +2,30 @@ from __future__ import annotations
 
 import asyncio
 import datetime
+import heapq
+import math
 import random
+import sys
+import time
+from array import array
 from collections import defaultdict
 from string import ascii_letters
-from typing import Any, Awaitable, Callable, Literal, NamedTuple, overload, TYPE_CHECKING
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Literal, overload, TYPE_CHECKING
 
 import asyncpg
 import discord.utils
-from discord.utils import cached_property
 
-from app.data.items import CropMetadata, Item, Items
+from app.data.items import CropMetadata, Item, ItemRarity, ItemType, Items
+from app.data.recipes import Recipe, Recipes
+from app.data.registry import REGISTRY
 from app.data.skills import Skill, Skills
-from app.util.common import calculate_level, get_by_key
+from app.util.common import get_by_key, walk_collection
+from app.util.leveling import get_curve
+from app.util.metrics import metrics
+from app.util.tracing import tracer
 from config import DatabaseConfig, Emojis, beta
 from .migrations import Migrator
+from .profiling import SlowQueryLog
 
 if TYPE_CHECKING:
     from app.core import Bot, Command
@@ -26,12 +36,48 @@ __all__ = (
 )
 
 
+class _AcquireContext:
+    """Wraps a pool acquire context, recording the wait for a connection in metrics and, if tracing, as a span."""
+
+    __slots__ = ('_context',)
+
+    def __init__(self, context: asyncpg.pool.PoolAcquireContext) -> None:
+        self._context: asyncpg.pool.PoolAcquireContext = context
+
+    async def __aenter__(self) -> asyncpg.Connection:
+        metrics.pool_waiters.inc()
+        start = time.perf_counter()
+
+        try:
+            with tracer.span('acquire', 'pool'):
+                return await self._context.__aenter__()
+        finally:
+            metrics.pool_waiters.dec()
+            metrics.pool_acquire_wait.observe(time.perf_counter() - start)
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self._context.__aexit__(*exc_info)
+
+    def __await__(self):
+        return self._context.__await__()
+
+
+def _describe_query(query: str) -> str:
+    query = ' '.join(query.split())
+    return query if len(query) <= 60 else query[:57] + '...'
+
+
 class _Database:
     _internal_pool: asyncpg.Pool
 
     def __init__(self, *, loop: asyncio.AbstractEventLoop = None) -> None:
         self.loop: asyncio.AbstractEventLoop = loop or asyncio.get_event_loop()
-        self.loop.create_task(self._connect())
+        self.slow_queries: SlowQueryLog = SlowQueryLog(getattr(DatabaseConfig, 'slow_query_threshold', 0.25))
+        self._connect_task: asyncio.Task = self.loop.create_task(self._connect())
+
+    def wait_until_connected(self) -> Awaitable[None]:
+        """Waits until the pool is connected and everything loaded on startup is loaded."""
+        return asyncio.shield(self._connect_task)
 
     async def _connect(self) -> None:
         self._internal_pool = await asyncpg.create_pool(
@@ -39,31 +85,49 @@ class _Database:
             port=DatabaseConfig.port,
             user=DatabaseConfig.user,
             database=DatabaseConfig.name,
-            password=DatabaseConfig.beta_password if beta else DatabaseConfig.password
+            password=DatabaseConfig.beta_password if beta else DatabaseConfig.password,
+            init=self._init_connection,
         )
 
         async with self.acquire() as conn:
             migrator = Migrator(conn)
             await migrator.run_migrations()
 
+    async def _init_connection(self, connection: asyncpg.Connection) -> None:
+        """Called on every new connection in the pool, e.g. to register type codecs."""
+        # Query loggers are called with the context of the query, so SQL spans nest under whatever was current
+        if hasattr(connection, 'add_query_logger'):
+            connection.add_query_logger(self._log_query)
+
+    def _log_query(self, record: Any) -> None:
+        tracer.record(_describe_query(record.query), 'sql', record.elapsed)
+        # Only the statement text is kept, never the arguments
+        self.slow_queries.record(record.query, record.elapsed, failed=record.exception is not None)
+
     @overload
     def acquire(self, *, timeout: float = None) -> Awaitable[asyncpg.Connection]:
         ...
 
-    def acquire(self, *, timeout: float = None) -> asyncpg.pool.PoolAcquireContext:
-        return self._internal_pool.acquire(timeout=timeout)
+    def acquire(self, *, timeout: float = None) -> _AcquireContext:
+        return _AcquireContext(self._internal_pool.acquire(timeout=timeout))
+
+    # These acquire through the wrapper above rather than using the pool's own shortcuts, so every wait is measured
 
-    def execute(self, query: str, *args: Any, timeout: float = None) -> Awaitable[str]:
-        return self._internal_pool.execute(query, *args, timeout=timeout)
+    async def execute(self, query: str, *args: Any, timeout: float = None) -> str:
+        async with self.acquire() as connection:
+            return await tracer.wrap(connection.execute(query, *args, timeout=timeout), 'execute', 'db')
 
-    def fetch(self, query: str, *args: Any, timeout: float = None) -> Awaitable[list[asyncpg.Record]]:
-        return self._internal_pool.fetch(query, *args, timeout=timeout)
+    async def fetch(self, query: str, *args: Any, timeout: float = None) -> list[asyncpg.Record]:
+        async with self.acquire() as connection:
+            return await tracer.wrap(connection.fetch(query, *args, timeout=timeout), 'fetch', 'db')
 
-    def fetchrow(self, query: str, *args: Any, timeout: float = None) -> Awaitable[asyncpg.Record]:
-        return self._internal_pool.fetchrow(query, *args, timeout=timeout)
+    async def fetchrow(self, query: str, *args: Any, timeout: float = None) -> asyncpg.Record:
+        async with self.acquire() as connection:
+            return await tracer.wrap(connection.fetchrow(query, *args, timeout=timeout), 'fetchrow', 'db')
 
-    def fetchval(self, query: str, *args: Any, column: str | int = 0, timeout: float = None) -> Awaitable[Any]:
-        return self._internal_pool.fetchval(query, *args, column=column, timeout=timeout)
+    async def fetchval(self, query: str, *args: Any, column: str | int = 0, timeout: float = None) -> Any:
+        async with self.acquire() as connection:
+            return await tracer.wrap(connection.fetchval(query, *args, column=column, timeout=timeout), 'fetchval', 'db')
 
 
 class Database(_Database):
@@ -75,8 +139,143 @@ class Database(_Database):
     def __init__(self, bot: Bot, *, loop: asyncio.AbstractEventLoop | None = None) -> None:
         super().__init__(loop=loop)
         self.user_records: dict[int, UserRecord] = {}
+        self.guild_prefixes: dict[int, tuple[str, ...]] = {}
+        self.crop_scheduler: CropReadinessScheduler = CropReadinessScheduler(self)
         self.bot: Bot = bot
 
+    async def _connect(self) -> None:
+        REGISTRY.check((
+            (Item, Items.all()),
+            (Skill, walk_collection(Skills, Skill)),
+            (Recipe, walk_collection(Recipes, Recipe)),
+        ))
+
+        await super()._connect()
+        await self.sync_catalog_ids()
+
+        # Prefixes are needed on every message, so they are loaded up front and never fetched per-message
+        records = await self.fetch('SELECT guild_id, prefixes FROM guilds')
+        self.guild_prefixes = {record['guild_id']: tuple(record['prefixes']) for record in records}
+
+        await self.sync_item_prices()
+        await self.crop_scheduler.start()
+
+    async def sync_catalog_ids(self) -> None:
+        """Checks the IDs stored in the database against the registry, and stores any new ones.
+
+        This refuses to start if an ID was reassigned, as that would silently corrupt existing rows.
+        """
+        stored = {record['id']: (record['kind'], record['key']) for record in await self.fetch(
+            'SELECT id, kind, key FROM catalog_ids'
+        )}
+
+        conflicts = [
+            f'{id}: {stored[id]} in the database but {(kind, key)} in the registry'
+            for id, kind, key in REGISTRY.entries()
+            if id in stored and stored[id] != (kind, key)
+        ]
+
+        if conflicts:
+            raise RuntimeError('Catalog IDs were reassigned:\n' + '\n'.join(conflicts))
+
+        if new := [(id, kind, key) for id, kind, key in REGISTRY.entries() if id not in stored]:
+            async with self.acquire() as conn:
+                await conn.executemany('INSERT INTO catalog_ids (id, kind, key) VALUES ($1, $2, $3)', new)
+
+    async def sync_item_prices(self) -> None:
+        """Syncs item prices into the item_prices table used by the net worth trigger.
+
+        If any price changed since the last sync (i.e. on deploy), every user's net worth is recomputed.
+        """
+        query = """
+                INSERT INTO item_prices (item, price) SELECT * FROM unnest($1::SMALLINT[], $2::BIGINT[])
+                ON CONFLICT (item) DO UPDATE SET price = excluded.price
+                WHERE item_prices.price <> excluded.price
+                RETURNING item;
+                """
+
+        items = list(Items.all())
+        ids = [REGISTRY.id_of(item) for item in items]
+
+        async with self.acquire() as conn:
+            async with conn.transaction():
+                changed = await conn.fetch(query, ids, [item.price for item in items])
+
+                if changed:
+                    await self.check_net_worth(repair=True, connection=conn)
+
+    async def check_net_worth(
+        self,
+        *,
+        repair: bool = False,
+        connection: asyncpg.Connection | None = None,
+    ) -> list[tuple[int, int, int]]:
+        """Recomputes the net worth of every user in bulk and reports drift.
+
+        Returns a list of (user_id, stored, expected) for every user whose stored net worth is wrong.
+        If ``repair`` is true, these are also corrected, both in the database and in the cache.
+        """
+        if connection is None:
+            async with self.acquire() as conn:
+                return await self.check_net_worth(repair=repair, connection=conn)
+
+        query = """
+                SELECT users.user_id, users.net_worth AS stored, COALESCE(expected.net_worth, 0) AS expected
+                FROM users
+                LEFT JOIN (
+                    SELECT items.user_id, SUM(items.count * COALESCE(item_prices.price, 0)) AS net_worth
+                    FROM items
+                    LEFT JOIN item_prices ON item_prices.item = items.item
+                    GROUP BY items.user_id
+                ) AS expected ON expected.user_id = users.user_id
+                WHERE users.net_worth <> COALESCE(expected.net_worth, 0);
+                """
+
+        drift = [(row['user_id'], row['stored'], row['expected']) for row in await connection.fetch(query)]
+
+        if repair and drift:
+            await connection.executemany(
+                'UPDATE users SET net_worth = $2 WHERE user_id = $1',
+                [(user_id, expected) for user_id, _, expected in drift],
+            )
+
+            for user_id, _, expected in drift:
+                # Records that were never fetched will load the repaired value when they are
+                if (record := self.user_records.get(user_id)) and record.data:
+                    record.data['net_worth'] = expected
+
+        return drift
+
+    async def set_guild_prefixes(self, guild_id: int, prefixes: Iterable[str]) -> None:
+        """Sets the prefixes of a guild, writing through to the cache."""
+        prefixes = tuple(dict.fromkeys(prefixes))
+
+        query = """
+                INSERT INTO guilds (guild_id, prefixes) VALUES ($1, $2)
+                ON CONFLICT (guild_id) DO UPDATE SET prefixes = $2;
+                """
+
+        await self.execute(query, guild_id, list(prefixes))
+        self.guild_prefixes[guild_id] = prefixes
+        self.bot.invalidate_prefix_matcher(guild_id)
+
+    async def reset_guild_prefixes(self, guild_id: int) -> None:
+        """Resets the prefixes of a guild back to the default prefix."""
+        await self.execute('DELETE FROM guilds WHERE guild_id = $1', guild_id)
+
+        self.guild_prefixes.pop(guild_id, None)
+        self.bot.invalidate_prefix_matcher(guild_id)
+
+    def cache_sizes(self) -> dict[str, int]:
+        """The amount of cached entries across all user records, per manager. This is O(n) in the amount of records."""
+        sizes = dict.fromkeys(UserRecord.MANAGERS, 0)
+
+        for record in self.user_records.values():
+            for name, manager in record.loaded_managers():
+                sizes[name] += len(manager.cached or ())
+
+        return sizes
+
     @overload
     def get_user_record(self, user_id: int, *, fetch: Literal[True] = True) -> Awaitable[UserRecord]:
         ...
@@ -89,7 +288,10 @@ class Database(_Database):
         try:
             record = self.user_records[user_id]
         except KeyError:
+            metrics.user_record_misses.inc()
             record = self.user_records[user_id] = UserRecord(user_id, db=self)
+        else:
+            metrics.user_record_hits.inc()
 
         if not fetch:
             return record
@@ -98,6 +300,40 @@ class Database(_Database):
 
 
 class InventoryMapping(dict[Item, int]):
+    """Maps items to their quantities.
+
+    Aggregates are maintained incrementally on every write rather than recomputed by scanning the inventory:
+    the net worth (sum of price * quantity), the amount of discovered (owned) items per rarity,
+    and the total quantity of items per type.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.net_worth: int = 0
+        self.discovered_counts: defaultdict[ItemRarity, int] = defaultdict(int)
+        self.type_counts: defaultdict[ItemType, int] = defaultdict(int)
+
+    @property
+    def discovered(self) -> int:
+        """The amount of unique items owned."""
+        return sum(self.discovered_counts.values())
+
+    def recompute(self) -> tuple[int, dict[ItemRarity, int], dict[ItemType, int]]:
+        """Recomputes the aggregates from scratch. This is only used for consistency checks."""
+        net_worth = 0
+        discovered_counts = defaultdict(int)
+        type_counts = defaultdict(int)
+
+        for item, quantity in self.items():
+            net_worth += item.price * quantity
+            type_counts[item.type] += quantity
+
+            if quantity > 0:
+                discovered_counts[item.rarity] += 1
+
+        return net_worth, discovered_counts, type_counts
+
     def get(self, k: Item | str, d: Any = None) -> int:
         return super().get(k, d)
 
@@ -123,6 +359,17 @@ class InventoryMapping(dict[Item, int]):
         if item is None:
             return
 
+        old = super().get(item, 0)
+        delta = value - old
+
+        self.net_worth += item.price * delta
+        self.type_counts[item.type] += delta
+
+        if old <= 0 < value:
+            self.discovered_counts[item.rarity] += 1
+        elif value <= 0 < old:
+            self.discovered_counts[item.rarity] -= 1
+
         return super().__setitem__(item, value)
 
     def __contains__(self, item: Item | str) -> bool:
@@ -136,6 +383,8 @@ class InventoryMapping(dict[Item, int]):
 
 
 class InventoryManager:
+    __slots__ = ('cached', '_record', '_task')
+
     def __init__(self, record: UserRecord) -> None:
         self.cached: InventoryMapping = InventoryMapping()
 
@@ -151,32 +400,47 @@ class InventoryManager:
         records = await self._record.db.fetch(query, self._record.user_id)
 
         for record in records:
-            self.cached[record['item']] = record['count']
+            # Items that were removed from the catalog keep their ID reserved, but no longer resolve
+            if isinstance(item := REGISTRY.get(record['item']), Item):
+                self.cached[item] = record['count']
 
     async def add_item(self, item: Item | str, amount: int = 1, *, connection: asyncpg.Connection | None = None) -> None:
         await self.wait()
 
+        if isinstance(item, str):
+            item = get_by_key(Items, item)
+
         query = """
                 INSERT INTO items (user_id, item, count) VALUES ($1, $2, $3)
                 ON CONFLICT (user_id, item) DO UPDATE SET count = items.count + $3 
                 RETURNING items.count
                 """
 
-        row = await (connection or self._record.db).fetchrow(query, self._record.user_id, str(item), amount)
+        row = await (connection or self._record.db).fetchrow(query, self._record.user_id, REGISTRY.id_of(item), amount)
         self.cached[item] = row['count']
 
+        # The database keeps its own copy up to date through a trigger on the items table
+        if self._record.data:
+            self._record.data['net_worth'] = self.cached.net_worth
 
-class Notification(NamedTuple):
-    created_at: datetime.datetime
-    title: str
-    content: str
+
+class Notification:
+    __slots__ = ('created_at', 'title', 'content')
+
+    def __init__(self, created_at: datetime.datetime, title: str, content: str) -> None:
+        self.created_at: datetime.datetime = created_at
+        self.title: str = title
+        self.content: str = content
 
     @classmethod
     def from_record(cls, record: asyncpg.Record) -> Notification:
-        return cls(created_at=record['created_at'], title=record['title'], content=record['content'])
+        # Titles are mostly the same handful of strings (e.g. "You leveled up!"), so they are interned
+        return cls(created_at=record['created_at'], title=sys.intern(record['title']), content=record['content'])
 
 
 class NotificationsManager:
+    __slots__ = ('cached', '_record', '_task')
+
     def __init__(self, record: UserRecord) -> None:
         self.cached: list[Notification] | None = None
 
@@ -231,20 +495,25 @@ class NotificationsManager:
             await self._record.add(unread_notifications=1, connection=connection)
 
 
-class SkillInfo(NamedTuple):
-    skill: str
-    points: int
-    cooldown_until: datetime.datetime | None
+class SkillInfo:
+    __slots__ = ('skill', 'points', 'cooldown_until')
+
+    def __init__(self, skill: str, points: int, cooldown_until: datetime.datetime | None) -> None:
+        self.skill: str = skill
+        self.points: int = points
+        self.cooldown_until: datetime.datetime | None = cooldown_until
 
     def into_skill(self) -> Skill:
         return get_by_key(Skills, self.skill)
 
     @classmethod
     def from_record(cls, record: asyncpg.Record) -> SkillInfo:
-        return cls(skill=record['skill'], points=record['points'], cooldown_until=record['on_cooldown_until'])
+        return cls(skill=REGISTRY.get(record['skill']).key, points=record['points'], cooldown_until=record['on_cooldown_until'])
 
 
 class SkillManager:
+    __slots__ = ('cached', '_record', '_task')
+
     def __init__(self, record: UserRecord) -> None:
         self.cached: dict[str, SkillInfo] = {}
 
@@ -259,7 +528,11 @@ class SkillManager:
         query = 'SELECT * FROM skills WHERE user_id = $1'
         records = await self._record.db.fetch(query, self._record.user_id)
 
-        self.cached = {record['skill']: SkillInfo.from_record(record) for record in records}
+        self.cached = {
+            skill.key: SkillInfo.from_record(record)
+            for record in records
+            if isinstance(skill := REGISTRY.get(record['skill']), Skill)  # Skills that were removed no longer resolve
+        }
 
     def get_skill(self, skill: Skill | str) -> SkillInfo | None:
         if not self.has_skill(skill := str(skill)):
@@ -279,8 +552,8 @@ class SkillManager:
     async def add_skill(self, skill: Skill | str, *, connection: asyncpg.Connection | None = None) -> None:
         await self.wait()
 
-        if isinstance(skill, Skill):
-            skill = skill.key
+        if isinstance(skill, str):
+            skill = get_by_key(Skills, skill)
 
         query = """
                 INSERT INTO skills (user_id, skill) VALUES ($1, $2)
@@ -288,14 +561,14 @@ class SkillManager:
                 RETURNING *;
                 """
 
-        row = await (connection or self._record.db).fetchrow(query, self._record.user_id, skill)
-        self.cached[skill] = SkillInfo.from_record(row)
+        row = await (connection or self._record.db).fetchrow(query, self._record.user_id, REGISTRY.id_of(skill))
+        self.cached[skill.key] = SkillInfo.from_record(row)
 
     async def add_skill_points(self, skill: Skill | str, points: int, *, connection: asyncpg.Connection | None = None) -> None:
         await self.wait()
 
-        if isinstance(skill, Skill):
-            skill = skill.key
+        if isinstance(skill, str):
+            skill = get_by_key(Skills, skill)
 
         query = """
                 INSERT INTO skills (user_id, skill, points) VALUES ($1, $2, $3)
@@ -303,16 +576,16 @@ class SkillManager:
                 RETURNING *;
                 """
 
-        row = await (connection or self._record.db).fetchrow(query, self._record.user_id, skill, points)
-        self.cached[skill] = SkillInfo.from_record(row)
+        row = await (connection or self._record.db).fetchrow(query, self._record.user_id, REGISTRY.id_of(skill), points)
+        self.cached[skill.key] = SkillInfo.from_record(row)
 
     async def add_skill_cooldown(
         self, skill: Skill | str, cooldown: datetime.timedelta, *, connection: asyncpg.Connection | None = None,
     ) -> None:
         await self.wait()
 
-        if isinstance(skill, Skill):
-            skill = skill.key
+        if isinstance(skill, str):
+            skill = get_by_key(Skills, skill)
 
         query = """
                 INSERT INTO skills (user_id, skill, on_cooldown_until) VALUES ($1, $2, CURRENT_TIMESTAMP + $3)
@@ -320,14 +593,17 @@ class SkillManager:
                 RETURNING *;
                 """
 
-        row = await (connection or self._record.db).fetchrow(query, self._record.user_id, skill, cooldown)
-        self.cached[skill] = SkillInfo.from_record(row)
+        row = await (connection or self._record.db).fetchrow(query, self._record.user_id, REGISTRY.id_of(skill), cooldown)
+        self.cached[skill.key] = SkillInfo.from_record(row)
+
 
+class CooldownInfo:
+    __slots__ = ('command', 'expires', 'previous_expiry')
 
-class CooldownInfo(NamedTuple):
-    command: str
-    expires: datetime.datetime
-    previous_expiry: datetime.datetime | None
+    def __init__(self, command: str, expires: datetime.datetime, previous_expiry: datetime.datetime | None) -> None:
+        self.command: str = command
+        self.expires: datetime.datetime = expires
+        self.previous_expiry: datetime.datetime | None = previous_expiry
 
     @classmethod
     def from_record(cls, record: asyncpg.Record) -> CooldownInfo:
@@ -335,6 +611,8 @@ class CooldownInfo(NamedTuple):
 
 
 class CooldownManager:
+    __slots__ = ('cached', '_record', '_task')
+
     def __init__(self, record: UserRecord) -> None:
         self.cached: dict[str, CooldownInfo] = {}
 
@@ -381,13 +659,24 @@ class CooldownManager:
         self.cached[key] = CooldownInfo.from_record(new)
 
 
-class CropInfo(NamedTuple):
-    x: int
-    y: int
-    crop: Item[CropMetadata]
-    exp: int
-    last_harvest: datetime.datetime | None
-    created_at: datetime.datetime
+class CropInfo:
+    __slots__ = ('x', 'y', 'crop', 'exp', 'last_harvest', 'created_at')
+
+    def __init__(
+        self,
+        x: int,
+        y: int,
+        crop: Item[CropMetadata] | None,
+        exp: int,
+        last_harvest: datetime.datetime | None,
+        created_at: datetime.datetime,
+    ) -> None:
+        self.x: int = x
+        self.y: int = y
+        self.crop: Item[CropMetadata] | None = crop
+        self.exp: int = exp
+        self.last_harvest: datetime.datetime | None = last_harvest
+        self.created_at: datetime.datetime = created_at
 
     @staticmethod
     def get_letters(x: int) -> str:
@@ -399,17 +688,40 @@ class CropInfo(NamedTuple):
     def into_coordinates(x: int, y: int) -> str:
         return CropInfo.get_letters(x) + str(y + 1)
 
-    @cached_property
+    @property
     def coordinates(self) -> str:
         return self.into_coordinates(self.x, self.y)
 
+    @property
+    def ready_at(self) -> datetime.datetime | None:
+        """When this crop can next be harvested, or ``None`` if nothing is planted here."""
+        if self.crop is None or self.last_harvest is None:
+            return None
+
+        return self.last_harvest + datetime.timedelta(seconds=self.crop.metadata.time)
+
+    @property
+    def silo_capacity(self) -> int:
+        """The maximum amount of harvests this crop can store in silo mode. This grows with the crop's level."""
+        return CropManager.SILO_BASE_CAPACITY + self.level
+
+    def accrued_harvests(self, now: datetime.datetime | None = None) -> int:
+        """The amount of harvests this crop has produced since it was last harvested, capped by its silo capacity."""
+        now = now or discord.utils.utcnow()
+
+        if (ready_at := self.ready_at) is None or ready_at > now:
+            return 0
+
+        cycles = 1 + int((now - ready_at).total_seconds() // self.crop.metadata.time)
+        return min(cycles, self.silo_capacity)
+
     @property
     def level_data(self) -> tuple[int, int, int]:
-        return calculate_level(self.exp, **CropManager.LEVELING_CURVE)
+        return CropManager.LEVELING.calculate(self.exp)
 
     @property
     def level(self) -> int:
-        return self.level_data[0]
+        return CropManager.LEVELING.level_of(self.exp)
 
     @property
     def xp(self) -> int:
@@ -424,18 +736,166 @@ class CropInfo(NamedTuple):
         return cls(
             x=record['x'],
             y=record['y'],
-            crop=get_by_key(Items, record['crop']),
+            crop=crop if isinstance(crop := REGISTRY.get(record['crop']), Item) else None,
             exp=record['exp'],
             last_harvest=record['last_harvest'],
             created_at=record['created_at'],
         )
 
 
+def _to_timestamp(dt: datetime.datetime | None) -> float:
+    return math.nan if dt is None else dt.timestamp()
+
+
+def _from_timestamp(timestamp: float) -> datetime.datetime | None:
+    return None if math.isnan(timestamp) else datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc)
+
+
+class CropGrid:
+    """Stores the land of a farm in parallel arrays indexed by ``x * size + y``.
+
+    This behaves like a ``dict[tuple[int, int], CropInfo]``, however :class:`CropInfo` objects are built on access.
+    The grid is square and grows to fit the furthest owned coordinate.
+    """
+
+    __slots__ = ('size', '_owned', '_crop', '_exp', '_last_harvest', '_created_at', '_count')
+
+    def __init__(self, size: int = 4) -> None:
+        self.size: int = size
+        self._count: int = 0
+        self._allocate(size)
+
+    @classmethod
+    def from_records(cls, records: Iterable[asyncpg.Record]) -> CropGrid:
+        records = list(records)
+        self = cls(max((max(record['x'], record['y']) + 1 for record in records), default=4))
+
+        for record in records:
+            self[record['x'], record['y']] = CropInfo.from_record(record)
+
+        return self
+
+    def _allocate(self, size: int) -> None:
+        cells = size * size
+
+        self._owned: array[int] = array('b', bytes(cells))
+        self._crop: array[int] = array('h', bytes(2 * cells))  # Registry ID, 0 for no crop
+        self._exp: array[int] = array('q', bytes(8 * cells))
+        self._last_harvest: array[float] = array('d', [math.nan]) * cells
+        self._created_at: array[float] = array('d', [math.nan]) * cells
+
+    def _grow(self, size: int) -> None:
+        old = self.size, self._owned, self._crop, self._exp, self._last_harvest, self._created_at
+        old_size, owned, crop, exp, last_harvest, created_at = old
+
+        self.size = size
+        self._allocate(size)
+
+        for x in range(old_size):
+            for y in range(old_size):
+                i, j = x * old_size + y, x * size + y
+
+                self._owned[j] = owned[i]
+                self._crop[j] = crop[i]
+                self._exp[j] = exp[i]
+                self._last_harvest[j] = last_harvest[i]
+                self._created_at[j] = created_at[i]
+
+    def _index(self, key: tuple[int, int]) -> int | None:
+        x, y = key
+        if 0 <= x < self.size and 0 <= y < self.size and self._owned[index := x * self.size + y]:
+            return index
+
+        return None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: tuple[int, int]) -> bool:
+        return self._index(key) is not None
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return self.keys()
+
+    def __getitem__(self, key: tuple[int, int]) -> CropInfo:
+        if (index := self._index(key)) is None:
+            raise KeyError(key)
+
+        x, y = key
+        crop = REGISTRY.get(self._crop[index]) if self._crop[index] else None
+
+        return CropInfo(
+            x=x,
+            y=y,
+            crop=crop,
+            exp=self._exp[index],
+            last_harvest=_from_timestamp(self._last_harvest[index]),
+            created_at=_from_timestamp(self._created_at[index]),
+        )
+
+    def __setitem__(self, key: tuple[int, int], info: CropInfo) -> None:
+        x, y = key
+        if x < 0 or y < 0:
+            raise ValueError(f'invalid coordinate {key!r}')
+
+        if x >= self.size or y >= self.size:
+            self._grow(max(x, y) + 1)
+
+        index = x * self.size + y
+        if not self._owned[index]:
+            self._owned[index] = 1
+            self._count += 1
+
+        self._crop[index] = REGISTRY.id_of(info.crop) if info.crop is not None else 0
+        self._exp[index] = info.exp
+        self._last_harvest[index] = _to_timestamp(info.last_harvest)
+        self._created_at[index] = _to_timestamp(info.created_at)
+
+    def get(self, key: tuple[int, int], default: Any = None) -> CropInfo | Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key: tuple[int, int], *default: Any) -> CropInfo | Any:
+        try:
+            info = self[key]
+        except KeyError:
+            if default:
+                return default[0]
+            raise
+
+        self._owned[key[0] * self.size + key[1]] = 0
+        self._count -= 1
+        return info
+
+    def keys(self) -> Iterator[tuple[int, int]]:
+        size = self.size
+        return ((index // size, index % size) for index, owned in enumerate(self._owned) if owned)
+
+    def values(self) -> Iterator[CropInfo]:
+        return (self[key] for key in self.keys())
+
+    def items(self) -> Iterator[tuple[tuple[int, int], CropInfo]]:
+        return ((key, self[key]) for key in self.keys())
+
+
 class CropManager:
+    __slots__ = ('cached', 'version', '_record', '_task', '_ready', '_ready_at')
+
     LEVELING_CURVE = dict(base=50, factor=1.15)
+    LEVELING = get_curve(**LEVELING_CURVE)
+    SILO_BASE_CAPACITY = 4
 
     def __init__(self, record: UserRecord) -> None:
-        self.cached: dict[tuple[int, int], CropInfo] = {}
+        self.cached: CropGrid = CropGrid()
+        # Bumped whenever the farm changes, e.g. so renders of it can be cached
+        self.version: int = 0
+
+        # Min-heap of (ready timestamp, x, y). Entries are invalidated lazily:
+        # an entry is only live if its timestamp matches the one in _ready_at for that coordinate.
+        self._ready: list[tuple[float, int, int]] = []
+        self._ready_at: dict[tuple[int, int], float] = {}
 
         self._record: UserRecord = record
         self._task: asyncio.Task = record.db.loop.create_task(self.fetch_crops())
@@ -444,14 +904,90 @@ class CropManager:
         await self._task
         return self
 
+    def _rebuild_ready(self) -> None:
+        self.version += 1
+        self._ready_at = {
+            key: ready_at.timestamp() for key, info in self.cached.items()
+            if (ready_at := info.ready_at) is not None
+        }
+        self._ready = [(timestamp, x, y) for (x, y), timestamp in self._ready_at.items()]
+        heapq.heapify(self._ready)
+
+        self._schedule_notification()
+
+    def _index_ready(self, x: int, y: int) -> None:
+        self.version += 1
+        info = self.cached.get((x, y))
+        ready_at = info.ready_at if info is not None else None
+
+        if ready_at is None:
+            self._ready_at.pop((x, y), None)
+        elif (timestamp := ready_at.timestamp()) != self._ready_at.get((x, y)):
+            self._ready_at[x, y] = timestamp
+            heapq.heappush(self._ready, (timestamp, x, y))
+
+        # Stale entries pile up as tiles are harvested, compact them once they outnumber the live ones
+        if len(self._ready) > 2 * len(self._ready_at) + 16:
+            self._rebuild_ready()
+        else:
+            self._schedule_notification()
+
+    def _schedule_notification(self) -> None:
+        # Only opted-in users are tracked. Records that aren't loaded are left alone, the scheduler
+        # already loaded every opted-in user on startup and this runs again on the next change.
+        if not self._record.data:
+            return
+
+        scheduler = self._record.db.crop_scheduler
+
+        if self._record.crop_notifications:
+            scheduler.schedule(self._record.user_id, self.next_ready_at())
+        else:
+            scheduler.schedule(self._record.user_id, None)
+
+    def _walk_ready(self, now: float, *, ready: bool) -> Iterator[tuple[float, int, int]]:
+        # Descends the heap from its root. Everything below a future entry is also in the future,
+        # so this only visits the ready entries and the future entries directly below them.
+        # A coordinate can have several identical live entries if it went back to an earlier ready time.
+        heap, live = self._ready, self._ready_at
+        stack = [0] if heap else []
+        seen = set()
+
+        while stack:
+            index = stack.pop()
+            entry = timestamp, x, y = heap[index]
+            is_live = live.get((x, y)) == timestamp
+
+            if timestamp > now and is_live:
+                if not ready:
+                    yield entry
+                continue
+
+            if timestamp <= now and is_live and ready and (x, y) not in seen:
+                seen.add((x, y))
+                yield entry
+
+            stack.extend(child for child in (2 * index + 1, 2 * index + 2) if child < len(heap))
+
+    def ready_coordinates(self, now: datetime.datetime | None = None) -> list[tuple[int, int]]:
+        """Returns the coordinates of every crop that can be harvested right now, soonest ready first."""
+        now = (now or discord.utils.utcnow()).timestamp()
+        return [(x, y) for _, x, y in sorted(self._walk_ready(now, ready=True))]
+
+    def next_ready_at(self, now: datetime.datetime | None = None) -> datetime.datetime | None:
+        """Returns when the next crop that is still growing will be ready, or ``None`` if nothing is growing."""
+        now = (now or discord.utils.utcnow()).timestamp()
+        timestamp, _, _ = min(self._walk_ready(now, ready=False), default=(math.nan, 0, 0))
+
+        return _from_timestamp(timestamp)
+
     async def fetch_crops(self) -> None:
         query = 'SELECT * FROM crops WHERE user_id = $1'
 
         async with self._record.db.acquire() as conn:
             records = await conn.fetch(query, self._record.user_id)
-            self.cached = {
-                (record['x'], record['y']): CropInfo.from_record(record) for record in records
-            }
+            self.cached = CropGrid.from_records(records)
+            self._rebuild_ready()
 
             default = [
                 (self._record.user_id, x, y) for x in range(4) for y in range(4)
@@ -463,25 +999,32 @@ class CropManager:
             await conn.executemany('INSERT INTO crops (user_id, x, y) VALUES ($1, $2, $3)', default)
 
             records = await conn.fetch(query, self._record.user_id)
-            self.cached = {
-                (record['x'], record['y']): CropInfo.from_record(record) for record in records
-            }
+            self.cached = CropGrid.from_records(records)
+            self._rebuild_ready()
 
     def get_crop_info(self, x: int, y: int) -> CropInfo:
         return self.cached.get((x, y))
 
-    async def harvest(self, coordinates: list[tuple[int, int]]) -> tuple[dict[tuple[int, int], tuple[Item, int]], dict[Item, int]]:
+    async def harvest(
+        self, coordinates: list[tuple[int, int]] | None = None,
+    ) -> tuple[dict[tuple[int, int], tuple[Item, int]], dict[Item, int]]:
+        """Harvests the crops at the given coordinates, skipping any that aren't ready.
+
+        If no coordinates are given, only the crops that are ready are visited.
+        """
         level_ups = {}
         harvested = defaultdict(int)
 
         await self.wait()
+        now = discord.utils.utcnow()
+
+        if coordinates is None:
+            coordinates = self.ready_coordinates(now)
 
         async with self._record.db.acquire() as conn:
             for x, y in coordinates:
                 info = self.get_crop_info(x, y)
-                if info is None or info.crop is None or (
-                    info.last_harvest + datetime.timedelta(seconds=info.crop.metadata.time) > discord.utils.utcnow()
-                ):
+                if info is None or info.crop is None or info.ready_at > now:
                     continue
 
                 old_level = info.level
@@ -492,6 +1035,7 @@ class CropManager:
                         """
                 new = await conn.fetchrow(query, self._record.user_id, x, y, random.randint(5, 10))
                 self.cached[x, y] = new = CropInfo.from_record(new)
+                self._index_ready(x, y)
 
                 if new.level > old_level:
                     level_ups[x, y] = info.crop, new.level
@@ -503,6 +1047,81 @@ class CropManager:
 
         return level_ups, harvested
 
+    def accrued_harvests(self, now: datetime.datetime | None = None) -> dict[tuple[int, int], int]:
+        """Returns the amount of stored harvests of every ready crop, for farms in silo mode."""
+        now = now or discord.utils.utcnow()
+        return {(x, y): self.cached[x, y].accrued_harvests(now) for x, y in self.ready_coordinates(now)}
+
+    async def collect(self) -> tuple[dict[tuple[int, int], tuple[Item, int]], dict[Item, int], int]:
+        """Settles every harvest accrued in silo mode in a single statement.
+
+        Each stored harvest yields the same as a manual harvest would. If a crop's silo isn't full, its last harvest
+        only moves forward by the settled cycles, so progress towards the next harvest is kept.
+
+        Returns (level ups, harvested items, amount of harvests settled).
+        """
+        await self.wait()
+        now = discord.utils.utcnow()
+
+        pending = {}
+        for (x, y), cycles in self.accrued_harvests(now).items():
+            info = self.cached[x, y]
+
+            if cycles >= info.silo_capacity:
+                last_harvest = now
+            else:
+                last_harvest = info.last_harvest + datetime.timedelta(seconds=cycles * info.crop.metadata.time)
+
+            exp = sum(random.randint(5, 10) for _ in range(cycles))
+            pending[x, y] = info, cycles, last_harvest, exp
+
+        if not pending:
+            return {}, {}, 0
+
+        # Only rows that weren't settled concurrently (their last harvest is unchanged) are updated
+        query = """
+                UPDATE crops SET last_harvest = pending.last_harvest, exp = crops.exp + pending.exp
+                FROM unnest($2::INTEGER[], $3::INTEGER[], $4::TIMESTAMPTZ[], $5::TIMESTAMPTZ[], $6::BIGINT[])
+                    AS pending (x, y, previous, last_harvest, exp)
+                WHERE crops.user_id = $1 AND crops.x = pending.x AND crops.y = pending.y
+                    AND crops.last_harvest = pending.previous
+                RETURNING crops.*;
+                """
+
+        level_ups = {}
+        harvested = defaultdict(int)
+        settled = 0
+
+        async with self._record.db.acquire() as conn:
+            async with conn.transaction():
+                records = await conn.fetch(
+                    query,
+                    self._record.user_id,
+                    [x for x, _ in pending],
+                    [y for _, y in pending],
+                    [info.last_harvest for info, *_ in pending.values()],
+                    [last_harvest for _, _, last_harvest, _ in pending.values()],
+                    [exp for *_, exp in pending.values()],
+                )
+
+                for record in records:
+                    x, y = record['x'], record['y']
+                    info, cycles, _, _ = pending[x, y]
+
+                    self.cached[x, y] = new = CropInfo.from_record(record)
+                    self._index_ready(x, y)
+
+                    if new.level > info.level:
+                        level_ups[x, y] = info.crop, new.level
+
+                    harvested[info.crop.metadata.item] += sum(random.randint(*info.crop.metadata.count) for _ in range(cycles))
+                    settled += cycles
+
+                for item, quantity in harvested.items():
+                    await self._record.inventory_manager.add_item(item, quantity, connection=conn)
+
+        return level_ups, harvested, settled
+
     async def add_crop_exp(self, x: int, y: int, exp: int) -> bool:
         await self.wait()
 
@@ -516,6 +1135,7 @@ class CropManager:
 
         new = await self._record.db.fetchrow(query, self._record.user_id, x, y, exp)
         self.cached[x, y] = new = CropInfo.from_record(new)
+        self._index_ready(x, y)
 
         return new.level > old
 
@@ -530,10 +1150,11 @@ class CropManager:
 
         new = await self._record.db.fetchrow(query, self._record.user_id, x, y)
         self.cached[x, y] = CropInfo.from_record(new)
+        self._index_ready(x, y)
 
     async def plant_crop(self, x: int, y: int, crop: Item | str) -> None:
-        if isinstance(crop, Item):
-            crop = crop.key
+        if isinstance(crop, str):
+            crop = get_by_key(Items, crop)
 
         await self.wait()
 
@@ -543,8 +1164,9 @@ class CropManager:
                 RETURNING *;
                 """
 
-        new = await self._record.db.fetchrow(query, self._record.user_id, crop, x, y)
+        new = await self._record.db.fetchrow(query, self._record.user_id, REGISTRY.id_of(crop), x, y)
         self.cached[x, y] = CropInfo.from_record(new)
+        self._index_ready(x, y)
 
     async def add_land(self, x: int, y: int) -> None:
         await self.wait()
@@ -557,6 +1179,7 @@ class CropManager:
 
         new = await self._record.db.fetchrow(query, self._record.user_id, x, y)
         self.cached[x, y] = CropInfo.from_record(new)
+        self._index_ready(x, y)
 
     async def remove_land(self, x: int, y: int) -> None:
         await self.wait()
@@ -568,17 +1191,214 @@ class CropManager:
 
         await self._record.db.execute(query, self._record.user_id, x, y)
         self.cached.pop((x, y), None)
+        self._index_ready(x, y)
+
+
+class CropReadinessScheduler:
+    """Sends the opt-in "your crops are ready" notifications.
+
+    Crop managers of opted-in users push the time their next growing crop will be ready whenever they change,
+    so this never has to poll the crops table. Each user is notified at most once per push.
+    """
+
+    def __init__(self, db: Database) -> None:
+        self.db: Database = db
+
+        # Min-heap of (ready timestamp, user ID), invalidated lazily against _due like CropManager._ready
+        self._heap: list[tuple[float, int]] = []
+        self._due: dict[int, float] = {}
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def schedule(self, user_id: int, when: datetime.datetime | None) -> None:
+        if when is None:
+            self._due.pop(user_id, None)
+            return
+
+        timestamp = when.timestamp()
+        if self._due.get(user_id) == timestamp:
+            return
+
+        self._due[user_id] = timestamp
+        heapq.heappush(self._heap, (timestamp, user_id))
+
+        if self._heap[0] == (timestamp, user_id):
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        """Loads the next ready time of every opted-in user's farm, then starts dispatching notifications."""
+        query = """
+                SELECT crops.user_id, crops.crop, crops.last_harvest FROM crops
+                INNER JOIN users ON users.user_id = crops.user_id
+                WHERE users.crop_notifications AND crops.crop IS NOT NULL;
+                """
+
+        now = discord.utils.utcnow()
+        next_ready = {}
+
+        for record in await self.db.fetch(query):
+            info = CropInfo(0, 0, REGISTRY.get(record['crop']), 0, record['last_harvest'], now)
+            if not isinstance(info.crop, Item) or (ready_at := info.ready_at) is None:
+                continue
+
+            # Crops that became ready while the bot was down are notified about right away
+            ready_at = max(ready_at, now)
+
+            user_id = record['user_id']
+            if user_id not in next_ready or ready_at < next_ready[user_id]:
+                next_ready[user_id] = ready_at
+
+        for user_id, ready_at in next_ready.items():
+            self.schedule(user_id, ready_at)
+
+        if self._task is None:
+            self._task = self.db.loop.create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        await self.db.bot.wait_until_ready()
+
+        while True:
+            self._wakeup.clear()
+
+            while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, user_id = heapq.heappop(self._heap)
+            del self._due[user_id]
+
+            self.db.loop.create_task(self._notify(user_id))
+
+    async def _notify(self, user_id: int) -> None:
+        record = await self.db.get_user_record(user_id)
+        if not record.crop_notifications:
+            return
+
+        await record.notifications_manager.add_notification(
+            'Your crops are ready!',
+            'Some of your crops are ready to be harvested. Harvest them using the `harvest` command.',
+        )
+
+
+class UserData:
+    """Slot-based storage for a row of the users table.
+
+    This supports the parts of the mapping API used on :attr:`UserRecord.data`.
+    Columns that aren't listed in ``COLUMNS`` (e.g. ones added by a newer migration) are kept in a fallback dict.
+    """
+
+    COLUMNS: tuple[str, ...] = (
+        'user_id',
+        'wallet',
+        'bank',
+        'max_bank',
+        'exp',
+        'exp_multiplier',
+        'net_worth',
+        'daily_streak',
+        'weekly_streak',
+        'unread_notifications',
+        'discovered_recipes',
+        'padlock_active',
+        'dm_notifications',
+        'plain_text_errors',
+        'crop_notifications',
+        'silo_mode',
+    )
+
+    __slots__ = (*COLUMNS, '_extra', '_loaded')
+
+    _COLUMN_SET: frozenset[str] = frozenset(COLUMNS)
+
+    def __init__(self) -> None:
+        self._extra: dict[str, Any] | None = None
+        self._loaded: bool = False
+
+    def __bool__(self) -> bool:
+        return self._loaded
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+
+        return True
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._COLUMN_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+
+        if self._extra is None:
+            raise KeyError(key)
+
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._COLUMN_SET:
+            return setattr(self, key, value)
+
+        if self._extra is None:
+            self._extra = {}
+
+        self._extra[key] = value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def update(self, values: asyncpg.Record | dict[str, Any]) -> None:
+        for key, value in values.items():
+            self[key] = value
+
+    def load(self, row: asyncpg.Record | dict[str, Any]) -> None:
+        """Copies in a full row. Only this marks the data as loaded, partial writes never do."""
+        self.update(row)
+        self._loaded = True
 
 
 class UserRecord:
     """Stores data about a user."""
 
+    __slots__ = (
+        'db',
+        'user_id',
+        'data',
+        '__inventory_manager',
+        '__notifications_manager',
+        '__cooldown_manager',
+        '__skill_manager',
+        '__crop_manager',
+    )
+
     LEVELING_CURVE = dict(base=100, factor=1.26)
+    LEVELING = get_curve(**LEVELING_CURVE)
+
+    MANAGERS: tuple[str, ...] = ('inventory', 'notifications', 'cooldowns', 'skills', 'crops')
 
     def __init__(self, user_id: int, *, db: Database) -> None:
         self.db: Database = db
         self.user_id: int = user_id
-        self.data: dict[str, Any] = {}
+        self.data: UserData = UserData()
 
         self.__inventory_manager: InventoryManager | None = None
         self.__notifications_manager: NotificationsManager | None = None
@@ -589,6 +1409,20 @@ class UserRecord:
     def __repr__(self) -> str:
         return f'<UserRecord wallet={self.wallet} bank={self.bank} level_data={self.level_data}>'
 
+    def loaded_managers(self) -> Iterator[tuple[str, Any]]:
+        """Yields the managers of this record that were already created, by name."""
+        managers = (
+            self.__inventory_manager,
+            self.__notifications_manager,
+            self.__cooldown_manager,
+            self.__skill_manager,
+            self.__crop_manager,
+        )
+
+        for name, manager in zip(self.MANAGERS, managers):
+            if manager is not None:
+                yield name, manager
+
     async def fetch(self) -> UserRecord:
         query = """
                 INSERT INTO users (user_id) VALUES ($1) 
@@ -596,11 +1430,11 @@ class UserRecord:
                 RETURNING *;
                 """
 
-        self.data.update(await self.db.fetchrow(query, self.user_id))  # TODO: Welcome user if new
+        self.data.load(await self.db.fetchrow(query, self.user_id))  # TODO: Welcome user if new
         return self
 
     async def fetch_if_necessary(self) -> UserRecord:
-        if not len(self.data):
+        if not self.data:
             await self.fetch()
 
         return self
@@ -608,19 +1442,38 @@ class UserRecord:
     async def _update(self, key: Callable[[tuple[int, str]], str], values: dict[str, Any], *, connection: asyncpg.Connection | None = None) -> UserRecord:
         query = """
                 UPDATE users SET {} WHERE user_id = $1
-                RETURNING *;
+                RETURNING {};
                 """
 
+        # Only the updated columns are returned and copied into the cache, nothing else in the row changes here.
+        # If the record was never fetched, return the whole row instead so that it ends up fully loaded.
+        loaded = bool(self.data)
+        returning = ', '.join(f'"{column}"' for column in values) if loaded else '*'
+
         # noinspection PyTypeChecker
-        self.data.update(
-            await (connection or self.db).fetchrow(
-                query.format(', '.join(map(key, enumerate(values.keys(), start=2)))),
-                self.user_id,
-                *values.values(),
-            ),
+        row = await (connection or self.db).fetchrow(
+            query.format(', '.join(map(key, enumerate(values.keys(), start=2))), returning),
+            self.user_id,
+            *values.values(),
         )
+
+        if loaded:
+            self.data.update(row)
+        elif row is not None:
+            self.data.load(row)
+
+        if 'crop_notifications' in values and self.data:
+            self._reschedule_crop_notification()
+
         return self
 
+    def _reschedule_crop_notification(self) -> None:
+        if self.crop_notifications:
+            # A new crop manager schedules again once its crops are fetched
+            self.crop_manager._schedule_notification()
+        else:
+            self.db.crop_scheduler.schedule(self.user_id, None)
+
     def update(self, *, connection: asyncpg.Connection | None = None, **values: Any) -> Awaitable[UserRecord]:
         return self._update(lambda o: f'"{o[1]}" = ${o[0]}', values, connection=connection)
 
@@ -720,17 +1573,22 @@ class UserRecord:
     def total_coins(self) -> int:
         return self.wallet + self.bank
 
+    @property
+    def net_worth(self) -> int:
+        """The total value of this user's inventory. This is maintained by a trigger on the items table."""
+        return self.data['net_worth']
+
     @property
     def total_exp(self) -> int:
         return self.data['exp']
 
     @property
     def level_data(self) -> tuple[int, int, int]:
-        return calculate_level(self.total_exp, **self.LEVELING_CURVE)
+        return self.LEVELING.calculate(self.total_exp)
 
     @property
     def level(self) -> int:
-        return self.level_data[0]
+        return self.LEVELING.level_of(self.total_exp)
 
     @property
     def exp(self) -> int:
@@ -768,6 +1626,18 @@ class UserRecord:
     def dm_notifications(self) -> bool:
         return self.data['dm_notifications']
 
+    @property
+    def plain_text_errors(self) -> bool:
+        return self.data['plain_text_errors']
+
+    @property
+    def crop_notifications(self) -> bool:
+        return self.data['crop_notifications']
+
+    @property
+    def silo_mode(self) -> bool:
+        return self.data['silo_mode']
+
     @property
     def inventory_manager(self) -> InventoryManager:
         if not self.__inventory_manager:
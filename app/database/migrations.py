@@ -45,6 +45,14 @@ class Migrator:
 
         return filename
 
+    @staticmethod
+    def _timestamp_of(file: str) -> int:
+        # name-<timestamp>.migration.sql
+        try:
+            return int(file.rsplit('-', 1)[1].split('.', 1)[0])
+        except (IndexError, ValueError):
+            return 0
+
     # noinspection PyUnboundLocalVariable
     async def run_migrations(self, *, debug: bool = False) -> None:
         """Runs all migrations.
@@ -67,7 +75,8 @@ class Migrator:
             # This ensures we are on a newline
             fp.seek(0, io.SEEK_END)
 
-            for file in os.listdir('./migrations'):
+            # Migrations can depend on each other, so they are ran in the order they were created
+            for file in sorted(os.listdir('./migrations'), key=self._timestamp_of):
                 if file in migrated or not file.endswith('.sql'):
                     continue
                     
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Any, Iterator
+
+__all__ = (
+    'SlowQuery',
+    'SlowQueryLog',
+    'normalize_query',
+    'render_plan',
+)
+
+STRING_LITERAL_REGEX: re.Pattern[str] = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL_REGEX: re.Pattern[str] = re.compile(r'(?<![$\w.])\d+(?:\.\d+)?\b')
+
+
+def normalize_query(query: str) -> str:
+    """Collapses whitespace and replaces inline literals with ``?``, so that equivalent statements aggregate together.
+
+    Bound parameters (``$1``, ``$2``, ...) are kept as-is. Their values are never recorded.
+    """
+    query = STRING_LITERAL_REGEX.sub('?', query)
+    query = NUMBER_LITERAL_REGEX.sub('?', query)
+    return ' '.join(query.split())
+
+
+class SlowQuery:
+    """Aggregated timings of one normalized statement."""
+
+    __slots__ = ('query', 'count', 'total', 'max', 'errors', 'samples')
+
+    def __init__(self, query: str, *, samples: int = 256) -> None:
+        self.query: str = query
+        self.count: int = 0
+        self.total: float = 0
+        self.max: float = 0
+        self.errors: int = 0
+        self.samples: deque[float] = deque(maxlen=samples)  # The most recent timings, used for percentiles
+
+    def add(self, elapsed: float, *, failed: bool = False) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.errors += failed
+        self.samples.append(elapsed)
+
+    def percentile(self, percentile: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(int(len(ordered) * percentile), len(ordered) - 1)]
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(0.5)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(0.99)
+
+
+class SlowQueryLog:
+    """Records statements that took longer than ``threshold`` seconds, aggregated by normalized query text.
+
+    At most ``max_entries`` distinct statements are tracked, anything new past that is only counted in ``dropped``.
+    """
+
+    def __init__(self, threshold: float = 0.25, *, max_entries: int = 500) -> None:
+        self.threshold: float = threshold
+        self.max_entries: int = max_entries
+        self.dropped: int = 0
+        self.entries: dict[str, SlowQuery] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def record(self, query: str, elapsed: float, *, failed: bool = False) -> None:
+        if elapsed < self.threshold:
+            return
+
+        key = normalize_query(query)
+        try:
+            entry = self.entries[key]
+        except KeyError:
+            if len(self.entries) >= self.max_entries:
+                self.dropped += 1
+                return
+
+            entry = self.entries[key] = SlowQuery(key)
+
+        entry.add(elapsed, failed=failed)
+
+    def top(self, limit: int = 10) -> list[SlowQuery]:
+        """Returns the statements that spent the most time above the threshold."""
+        return sorted(self.entries.values(), key=lambda entry: entry.total, reverse=True)[:limit]
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.dropped = 0
+
+
+def _describe_node(node: dict[str, Any]) -> str:
+    parts = [node['Node Type']]
+
+    if relation := node.get('Relation Name'):
+        parts.append(f'on {relation}')
+    if index := node.get('Index Name'):
+        parts.append(f'using {index}')
+
+    description = ' '.join(parts)
+
+    if 'Actual Total Time' in node:
+        description += (
+            f' (time={node["Actual Total Time"]:.3f}ms rows={node["Actual Rows"]:,} loops={node["Actual Loops"]:,})'
+        )
+
+    hit, read = node.get('Shared Hit Blocks', 0), node.get('Shared Read Blocks', 0)
+    if hit or read:
+        description += f' [buffers hit={hit:,} read={read:,}]'
+
+    return description
+
+
+def _walk_plan(node: dict[str, Any], prefix: str = '', last: bool = True, root: bool = True) -> Iterator[str]:
+    branch = '' if root else ('└── ' if last else '├── ')
+    yield prefix + branch + _describe_node(node)
+
+    if filter_ := node.get('Filter'):
+        yield prefix + ('' if root else ('    ' if last else '│   ')) + f'  filter: {filter_}'
+
+    children = node.get('Plans', ())
+    prefix += '' if root else ('    ' if last else '│   ')
+
+    for i, child in enumerate(children):
+        yield from _walk_plan(child, prefix, i == len(children) - 1, False)
+
+
+def render_plan(explained: list[dict[str, Any]]) -> str:
+    """Renders the output of ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` as a plan tree."""
+    result = explained[0]
+    lines = list(_walk_plan(result['Plan']))
+
+    if (planning := result.get('Planning Time')) is not None:
+        lines.append(f'\nPlanning time: {planning:.3f}ms')
+    if (execution := result.get('Execution Time')) is not None:
+        lines.append(f'Execution time: {execution:.3f}ms')
+
+    return '\n'.join(lines)
@@ -1,24 +1,120 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
+import json
+import sys
 from asyncio import subprocess
-from io import StringIO
+from io import BytesIO, StringIO
 from typing import Any, TYPE_CHECKING, Type, TypeAlias
 
 import discord
 import tabulate
 from jishaku.codeblocks import codeblock_converter
 
-from app.core import Cog, Context, REPLY, group
+from app.core import Cog, Context, REPLY, command, group
 from app.database import Migrator
+from app.database.profiling import render_plan
+from app.util.catalog import catalogs
 from app.util.common import humanize_small_duration, pluralize
+from app.util.metrics import metrics
 from app.util.structures import Timer
+from app.util.tracing import tracer
 
 if TYPE_CHECKING:
+    import asyncpg
     from jishaku.codeblocks import Codeblock
 
     codeblock_converter: TypeAlias = Type[Codeblock]
 
+# Caps for query results, so that a careless query can't stall the bot or exhaust memory
+QUERY_MAX_ROWS = 2000
+QUERY_MAX_BYTES = 2 * 1024 * 1024  # Approximate, measured from the in-memory size of the values
+QUERY_PREFETCH = 200
+EXPORT_MAX_BYTES = 8 * 1024 * 1024  # The default attachment size limit
+
+
+async def stream_query(
+    connection: asyncpg.Connection,
+    query: str,
+    *,
+    max_rows: int = QUERY_MAX_ROWS,
+    max_bytes: int = QUERY_MAX_BYTES,
+) -> tuple[list[str], list[tuple[Any, ...]], bool]:
+    """Streams the results of a query through a server-side cursor, stopping once either cap is reached.
+
+    Returns the column names, the rows as tuples, and whether the results were truncated.
+    """
+    headers = []
+    rows = []
+    size = 0
+
+    async with connection.transaction():
+        async for record in connection.cursor(query, prefetch=QUERY_PREFETCH):
+            if len(rows) >= max_rows or size >= max_bytes:
+                return headers, rows, True
+
+            if not headers:
+                headers = list(record.keys())
+
+            row = tuple(record.values())
+            size += sum(map(sys.getsizeof, row))
+            rows.append(row)
+
+    return headers, rows, False
+
+
+class ExportLimitReached(Exception):
+    """Raised by :class:`CappedBuffer` to abort the COPY once its limit is reached."""
+
+
+class CappedBuffer:
+    """An in-memory sink for ``copy_from_query`` that aborts the COPY once ``limit`` bytes have been written.
+
+    Output is only ever cut at the end of a row, so a truncated export is still valid. Rows end at newlines outside
+    of ``quote``-quoted fields, so CSV fields that contain newlines are neither split nor counted as several rows.
+    """
+
+    def __init__(self, limit: int = EXPORT_MAX_BYTES, *, quote: bytes | None = b'"') -> None:
+        self.limit: int = limit
+        self.quote: bytes | None = quote
+        self.truncated: bool = False
+        self.rows: int = 0
+        self._buffer: BytesIO = BytesIO()
+        self._quoted: bool = False
+        self._row_end: int = 0  # The offset just past the last complete row that fits within the limit
+
+    async def write(self, chunk: bytes) -> None:
+        end = self._buffer.tell()
+
+        # The last segment is the start of a line that has not ended yet
+        *lines, rest = chunk.split(b'\n')
+
+        for line in lines:
+            end += len(line) + 1
+            self._scan(line)
+
+            if not self._quoted and end <= self.limit:
+                self._row_end = end
+                self.rows += 1
+
+        self._scan(rest)
+        self._buffer.write(chunk)
+
+        if self._buffer.tell() > self.limit:
+            self._buffer.truncate(self._row_end)
+            self.truncated = True
+            raise ExportLimitReached
+
+    def _scan(self, data: bytes) -> None:
+        # Doubled (escaped) quotes flip this twice, so only the parity matters
+        if self.quote is not None and data.count(self.quote) % 2:
+            self._quoted = not self._quoted
+
+    def getvalue(self) -> BytesIO:
+        self._buffer.seek(0)
+        return self._buffer
+
 
 class Admin(Cog):
     """Administrator/owner-only commands."""
@@ -35,11 +131,15 @@ class Admin(Cog):
 
     @database.command(aliases={'run', 'query', 'fetch', 'q'})
     async def sql(self, ctx: Context, *, sql: codeblock_converter) -> Any:
-        """Fetches the results of a SQL query."""
+        """Fetches the results of a SQL query.
+
+        Results are capped, use `db export` for large results.
+        """
         async with ctx.typing():
             with Timer() as timer:
                 try:
-                    result = await ctx.db.fetch(sql.content)
+                    async with ctx.db.acquire() as conn:
+                        headers, result, truncated = await stream_query(conn, sql.content)
                 except Exception as exc:
                     return f"Error!\n```sql\n{exc}```", REPLY
 
@@ -48,9 +148,13 @@ class Admin(Cog):
             if not result:
                 return f"{time} No results.", REPLY
 
-            table_raw = tabulate.tabulate(result, headers="keys", tablefmt="fancy_grid")
+            # Rendering large tables takes a while, so this is done off of the event loop
+            table_raw = await asyncio.to_thread(tabulate.tabulate, result, headers=headers, tablefmt="fancy_grid")
             time = pluralize(f'{len(result):,} result(s) in {time}')
 
+            if truncated:
+                time += ' (truncated, use `db export` for the full result)'
+
             message = f"{time}\n```sql\n{table_raw}```"
 
             if len(message) <= 2000 and all(len(line) < 140 for line in message.split('\n')):
@@ -60,6 +164,121 @@ class Admin(Cog):
             file = discord.File(StringIO(table_raw), filename='response.txt')
             return time, file, REPLY
 
+    @database.command('export', aliases={'dump', 'copy'})
+    async def db_export(self, ctx: Context, format: str.lower, *, sql: codeblock_converter) -> Any:
+        """Exports the results of a SQL query as a CSV or JSONL attachment, streamed with COPY."""
+        if format not in ('csv', 'jsonl'):
+            return 'The format must be either `csv` or `jsonl`.', REPLY
+
+        query = sql.content.strip().rstrip(';')
+
+        if format == 'csv':
+            buffer = CappedBuffer()
+            options = dict(format='csv', header=True)
+        else:
+            # Quote and delimiter characters that can't appear in JSON output, so that each row is emitted verbatim.
+            # JSON escapes newlines within strings, so every newline ends a row.
+            buffer = CappedBuffer(quote=None)
+            query = f'SELECT row_to_json(export)::TEXT FROM ({query}) AS export'
+            options = dict(format='csv', quote='\x01', delimiter='\x02')
+
+        async with ctx.typing():
+            with Timer() as timer:
+                try:
+                    async with ctx.db.acquire() as conn:
+                        await conn.copy_from_query(query, output=buffer.write, **options)
+                except ExportLimitReached:
+                    pass
+                except Exception as exc:
+                    return f"Error!\n```sql\n{exc}```", REPLY
+
+        rows = buffer.rows - (format == 'csv')  # The CSV header is not a row
+        message = pluralize(f'Exported {rows:,} row(s) in {humanize_small_duration(timer.time)}')
+
+        if buffer.truncated:
+            message += f' (truncated to {buffer.limit // 1024 // 1024} MB)'
+
+        # noinspection PyTypeChecker
+        return message, discord.File(buffer.getvalue(), filename=f'export.{format}'), REPLY
+
+    @database.command('networth', aliases={'nw', 'worth'})
+    async def db_networth(self, ctx: Context, repair: bool = False) -> Any:
+        """Recomputes every user's net worth and reports (and optionally repairs) any drift."""
+        async with ctx.typing():
+            drift = await ctx.db.check_net_worth(repair=repair)
+
+        if not drift:
+            return 'No drift found, all net worths are consistent.', REPLY
+
+        table = tabulate.tabulate(
+            [(user_id, f'{stored:,}', f'{expected:,}', f'{expected - stored:+,}') for user_id, stored, expected in drift],
+            headers=('User', 'Stored', 'Expected', 'Drift'),
+        )
+        message = pluralize(f'Found drift for {len(drift):,} user(s){" (repaired)" if repair else ""}.')
+
+        if len(table) < 1900:
+            return f'{message}\n```\n{table}```', REPLY
+
+        # noinspection PyTypeChecker
+        return message, discord.File(StringIO(table), filename='drift.txt'), REPLY
+
+    @database.command('slow', aliases={'slowlog', 'slowest'})
+    async def db_slow(self, ctx: Context, reset: bool = False) -> Any:
+        """Views the slowest queries ran by the bot since startup, optionally resetting the log."""
+        log = ctx.db.slow_queries
+
+        if reset:
+            log.clear()
+            return 'Cleared the slow query log.', REPLY
+
+        threshold = f'{log.threshold * 1000:,.0f}ms'
+        if not log.entries:
+            return f'No queries took longer than {threshold} so far.', REPLY
+
+        def ms(seconds: float) -> str:
+            return f'{seconds * 1000:,.1f}'
+
+        table = tabulate.tabulate(
+            [
+                (f'{entry.count:,}', ms(entry.p50), ms(entry.p99), ms(entry.max), f'{entry.errors:,}', entry.query)
+                for entry in log.top(15)
+            ],
+            headers=('Calls', 'p50 (ms)', 'p99 (ms)', 'Max (ms)', 'Errors', 'Query'),
+            maxcolwidths=[None, None, None, None, None, 60],
+        )
+        message = pluralize(f'{len(log):,} distinct statement(s) took longer than {threshold}')
+        if log.dropped:
+            message += pluralize(f', {log.dropped:,} more were not tracked as the log is full')
+
+        if len(table) < 1900:
+            return f'{message}:\n```\n{table}```', REPLY
+
+        # noinspection PyTypeChecker
+        return f'{message}:', discord.File(StringIO(table), filename='slow_queries.txt'), REPLY
+
+    @database.command('explain', aliases={'analyze', 'plan'})
+    async def db_explain(self, ctx: Context, *, sql: codeblock_converter) -> Any:
+        """Runs EXPLAIN ANALYZE on a query and renders its plan. The query is always rolled back."""
+        async with ctx.typing():
+            async with ctx.db.acquire() as conn:
+                transaction = conn.transaction()
+                await transaction.start()
+
+                try:
+                    result = await conn.fetchval(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql.content}')
+                except Exception as exc:
+                    return f"Error!\n```sql\n{exc}```", REPLY
+                finally:
+                    await transaction.rollback()
+
+        plan = render_plan(json.loads(result) if isinstance(result, str) else result)
+
+        if len(plan) < 1900:
+            return f'```\n{plan}```', REPLY
+
+        # noinspection PyTypeChecker
+        return discord.File(StringIO(plan), filename='plan.txt'), REPLY
+
     @database.group(aliases={'mig', 'm', 'migrate', 'migration'})
     async def migrations(self, ctx: Context):
         """Manages database migrations."""
@@ -106,5 +325,76 @@ class Admin(Cog):
         ctx.bot.loop.create_task(ctx.thumbs())
         return f'```{out.read()}```'
 
+    @command(aliases={'catalogcache', 'catalogs'})
+    async def catalog(self, ctx: Context, invalidate: bool = False) -> Any:
+        """Views the approximate memory usage of the catalog cache, optionally invalidating it."""
+        if invalidate:
+            catalogs.invalidate()
+            return 'Invalidated the catalog cache.', REPLY
+
+        usage = catalogs.memory_usage()
+        if not usage:
+            return f'The catalog cache (version {catalogs.version}) is empty.', REPLY
+
+        table = tabulate.tabulate(
+            [(str(key), f'{size:,}') for key, size in sorted(usage.items(), key=lambda pair: -pair[1])],
+            headers=('Entry', 'Bytes'),
+        )
+        total = sum(usage.values())
+        return f'Catalog cache (version {catalogs.version}), {total:,} bytes total:\n```\n{table}```', REPLY
+
+    @group(aliases={'dbg'})
+    async def debug(self, ctx: Context):
+        """Commands for debugging the bot at runtime."""
+        await ctx.send_help(ctx.command)
+
+    @debug.command('tracing')
+    async def debug_tracing(self, ctx: Context, enabled: bool = None) -> str:
+        """Toggles per-command tracing, or views whether it is enabled."""
+        if enabled is not None:
+            tracer.enabled = enabled
+
+        state = 'enabled' if tracer.enabled else 'disabled'
+        return pluralize(f'Tracing is {state}, {len(tracer.traces):,} trace(s) recorded.'), REPLY
+
+    @debug.command('trace', aliases={'waterfall'})
+    async def debug_trace(self, ctx: Context, *, command: str = None) -> Any:
+        """Views the most recent trace, optionally of the given command, as a waterfall."""
+        if command is not None and (resolved := ctx.bot.get_command(command)) is not None:
+            command = resolved.qualified_name
+
+        trace = tracer.find(command)
+        if trace is None:
+            hint = '' if tracer.enabled else ' Tracing is disabled, enable it with `debug tracing on`.'
+            return f'No traces found.{hint}', REPLY
+
+        header = f'Trace of `{trace.command}` by {trace.user_id}:'
+        waterfall = trace.waterfall()
+
+        if len(waterfall) < 1900:
+            return f'{header}\n```\n{waterfall}```', REPLY
+
+        # noinspection PyTypeChecker
+        return header, discord.File(StringIO(waterfall), filename='trace.txt'), REPLY
+
+    @debug.command('slash', aliases={'interactions'})
+    async def debug_slash(self, ctx: Context) -> Any:
+        """Views the time from receiving a slash command to its first response, for both dispatch methods."""
+        histograms = metrics.slash_first_response.children
+        if not histograms:
+            return 'No slash commands have responded yet.', REPLY
+
+        def ms(seconds: float) -> str:
+            return f'{seconds * 1000:,.1f}' if seconds != float('inf') else 'inf'
+
+        table = tabulate.tabulate(
+            [
+                (method, f'{h.count:,}', ms(h.sum / h.count), f'<= {ms(h.quantile(0.5))}', f'<= {ms(h.quantile(0.99))}')
+                for method, h in sorted(histograms.items())
+            ],
+            headers=('Dispatch', 'Count', 'Mean (ms)', 'p50 (ms)', 'p99 (ms)'),
+        )
+        return f'Slash command time to first response:\n```\n{table}```', REPLY
+
 
 setup = Admin.simple_setup
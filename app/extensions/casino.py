@@ -1,7 +1,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import random
 from collections import defaultdict
 from enum import Enum
@@ -11,6 +10,8 @@ from typing import Any, ClassVar, Final, NamedTuple, TYPE_CHECKING
 import discord
 
 from app.core import Cog, Context, EDIT, REPLY, command, group, lock_transactions, simple_cooldown, user_max_concurrency
+from app.util import tracing
+from app.util.catalog import catalogs
 from app.util.common import pluralize
 from app.util.converters import CasinoBet
 from app.util.views import UserView
@@ -190,7 +191,7 @@ class Casino(Cog):
         record = await ctx.db.get_user_record(ctx.author.id)
 
         yield f'{Emojis.loading} Rolling...', REPLY
-        await asyncio.sleep(random.uniform(2, 4))
+        await tracing.sleep(random.uniform(2, 4))
 
         async with ctx.db.acquire() as conn:
             await record.add_random_exp(10, 15, chance=0.5, connection=conn)
@@ -255,12 +256,16 @@ class Casino(Cog):
     @simple_cooldown(2, 4)
     async def scratch_key(self, ctx: Context) -> None:
         """View what emojis correspond to what in scratch-off tickets."""
+        await ctx.send(catalogs.get('scratch:key', self._build_scratch_key))
+
+    @staticmethod
+    def _build_scratch_key() -> str:
         cells = ScratchView.SCRATCH_CELLS
 
         def emoji_of(cell: ScratchCell) -> str:
             return cells[cell].emoji
 
-        await ctx.send(dedent(f"""
+        return dedent(f"""
             {emoji_of(ScratchCell.lose)} = Automatic loss
             {emoji_of(ScratchCell.coin)} = +30% of bet
             {emoji_of(ScratchCell.medal)} = +50% of bet
@@ -268,7 +273,7 @@ class Casino(Cog):
             {emoji_of(ScratchCell.crown)} = +120% of bet
             {emoji_of(ScratchCell.star)} = +200% (2x) of bet
             {emoji_of(ScratchCell.spinning_coin)} = +400% (4x) of bet
-        """))
+        """)
 
 
 setup = Casino.simple_setup
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import random
+from collections import OrderedDict
 from datetime import timedelta
 from string import ascii_letters
 from textwrap import dedent
@@ -53,7 +54,7 @@ def parse_coordinate(argument: str) -> tuple[int, int]:
         if len(x) > 1:
             unit += 26 * (letters.index(x[0]) + 1)
 
-        if not 0 <= unit <= 64 or not 0 <= y <= 64:
+        if not 0 <= unit <= 64 or not 1 <= y <= 64:
             raise BadArgument("Coordinate must be between `A1` and `BL64`.")
 
         return unit, y - 1
@@ -62,11 +63,59 @@ def parse_coordinate(argument: str) -> tuple[int, int]:
         raise BadArgument(f"{argument!r} is not a valid coordinate. Try something such as `A1`, `D3`, or `BD13`.")
 
 
+class LandRenderCache:
+    """Caches the rendered viewports of a single farm.
+
+    This is tied to the farm's version, which its :class:`CropManager` bumps on every change,
+    so panning around an unchanged farm never re-renders anything.
+    """
+
+    __slots__ = ('manager', 'version', 'viewports')
+
+    MAX_FARMS: Final[ClassVar[int]] = 1000
+    MAX_ENTRIES: Final[ClassVar[int]] = 1024
+
+    _caches: ClassVar[OrderedDict[int, LandRenderCache]] = OrderedDict()
+
+    def __init__(self, manager: CropManager) -> None:
+        self.manager: CropManager = manager
+        self.version: int = manager.version
+
+        self.viewports: dict[tuple[int, int, int | None], str] = {}
+
+    @classmethod
+    def get(cls, user_id: int, manager: CropManager) -> LandRenderCache:
+        cache = cls._caches.get(user_id)
+
+        if cache is None or cache.manager is not manager or cache.version != manager.version:
+            cache = cls._caches[user_id] = cls(manager)
+
+        cls._caches.move_to_end(user_id)
+        if len(cls._caches) > cls.MAX_FARMS:
+            cls._caches.popitem(last=False)
+
+        return cache
+
+    def store(self, key: tuple[int, int, int | None], value: str) -> str:
+        if len(self.viewports) >= self.MAX_ENTRIES:
+            self.viewports.clear()
+
+        self.viewports[key] = value
+        return value
+
+
 class LandView(UserView):
     _placeholder = discord.ui.button(label='\u200b', style=discord.ButtonStyle.secondary, disabled=True)
 
     LAND_EMOJI: Final[ClassVar[str]] = '<:land:940766001266577449>'
     LAND_LOCKED_EMOJI: Final[ClassVar[str]] = '<:landl:940767617201893396>'
+    GROWING_EMOJI: Final[ClassVar[str]] = '\u23f3'
+
+    # The column header for every horizontal offset
+    HEADERS: Final[ClassVar[tuple[str, ...]]] = tuple(
+        f'{Emojis.space}`{" ".join(format(CropInfo.get_letters(i), " <2") for i in range(x, x + 8))}`'
+        for x in range(57)
+    )
 
     def __init__(self, ctx: Context, record: UserRecord):
         super().__init__(ctx.author)
@@ -74,16 +123,19 @@ class LandView(UserView):
         self.record: UserRecord = record
         self.boundary_x: int = 0
         self.boundary_y: int = 0
+        self.show_readiness: bool = False
 
         self.embed: discord.Embed = discord.Embed(color=Colors.primary, timestamp=ctx.now)
         self.embed.set_author(name=f'{ctx.author.name}\'s Farm', icon_url=ctx.author.avatar.url)
-        self.embed.set_footer(text='Use the arrow buttons below to move around!')
 
         self.embed.add_field(name='Information', value=f'Use `{ctx.prefix}land buy <coordinate>` to buy a patch of land.')
 
         self.message: str
         self.update()
 
+        # This is sent along with the initial message
+        self._footer: str | None = self.embed.footer.text
+
     @property
     def crop_manager(self) -> CropManager:
         return self.record.crop_manager
@@ -94,33 +146,76 @@ class LandView(UserView):
         self.up.disabled = self.boundary_y <= 0
         self.down.disabled = self.boundary_y >= 56
 
-    def update_embed(self) -> None:
-        lines = [
-            f'{Emojis.space}`{" ".join(format(CropInfo.get_letters(i), " <2") for i in range(self.boundary_x, self.boundary_x + 8))}`'
-        ]
+    def update_footer(self) -> None:
+        now = discord.utils.utcnow()
+        chunks = []
+
+        if self.record.silo_mode:
+            if stored := sum(self.crop_manager.accrued_harvests(now).values()):
+                chunks.append(f'{stored:,} harvest{"s" if stored != 1 else ""} stored in your silo')
+
+        elif ready := len(self.crop_manager.ready_coordinates(now)):
+            chunks.append(f'{ready:,} crop{"s" if ready != 1 else ""} ready to harvest')
+
+        if next_ready := self.crop_manager.next_ready_at(now):
+            chunks.append(f'Next crop ready in {humanize_duration((next_ready - now).total_seconds(), depth=2)}')
 
-        for y in range(self.boundary_y, self.boundary_y + 8):
-            chunks = [f'`{y + 1: >2}`']
+        chunks.append('Use the arrow buttons below to move around!')
+        self.embed.set_footer(text=' \u2022 '.join(chunks))
 
-            for x in range(self.boundary_x, self.boundary_x + 8):
-                crop = self.crop_manager.get_crop_info(x, y)
+    async def edit(self, interaction: TypedInteraction) -> None:
+        # The embed only changes with the footer, so it is only resent when the footer changed
+        kwargs = {}
+        if (footer := self.embed.footer.text) != self._footer:
+            self._footer = footer
+            kwargs['embed'] = self.embed
 
-                if crop is None:
-                    chunks.append(self.LAND_LOCKED_EMOJI)
-                    continue
+        await interaction.response.edit_message(content=self.message, view=self, **kwargs)
 
-                if crop.crop is None:
-                    chunks.append(self.LAND_EMOJI)
-                    continue
+    def render_row(self, y: int, ready: set[tuple[int, int]] | None) -> str:
+        chunks = [f'`{y + 1: >2}`']
 
-                chunks.append(crop.crop.emoji)
+        for x in range(self.boundary_x, self.boundary_x + 8):
+            crop = self.crop_manager.get_crop_info(x, y)
 
-            lines.append(''.join(chunks))
+            if crop is None:
+                chunks.append(self.LAND_LOCKED_EMOJI)
+                continue
+
+            if crop.crop is None:
+                chunks.append(self.LAND_EMOJI)
+                continue
+
+            if ready is not None and (x, y) not in ready:
+                chunks.append(self.GROWING_EMOJI)
+                continue
+
+            chunks.append(crop.crop.emoji)
+
+        return ''.join(chunks)
+
+    def update_embed(self) -> None:
+        cache = LandRenderCache.get(self.record.user_id, self.crop_manager)
+
+        ready = set(self.crop_manager.ready_coordinates()) if self.show_readiness else None
+        # Until the farm changes again, crops can only become ready, so the amount of ready crops identifies the overlay
+        overlay = len(ready) if ready is not None else None
+
+        key = self.boundary_x, self.boundary_y, overlay
+        try:
+            self.message = cache.viewports[key]
+            return
+        except KeyError:
+            pass
+
+        lines = [self.HEADERS[self.boundary_x]]
+        lines.extend(self.render_row(y, ready) for y in range(self.boundary_y, self.boundary_y + 8))
 
-        self.message = '\n'.join(lines)
+        self.message = cache.store(key, '\n'.join(lines))
 
     def update(self) -> None:
         self.update_embed()
+        self.update_footer()
         self.update_buttons()
 
     @_placeholder
@@ -135,12 +230,20 @@ class LandView(UserView):
         self.boundary_y -= 8
         self.update()
 
-        await interaction.response.edit_message(content=self.message, view=self)
+        await self.edit(interaction)
 
     @_placeholder
     async def right_placeholder(self, _b, _i):
         pass
 
+    @discord.ui.button(label='Readiness', style=discord.ButtonStyle.secondary)
+    async def readiness(self, button: discord.ui.Button, interaction: TypedInteraction) -> None:
+        self.show_readiness = not self.show_readiness
+        button.style = discord.ButtonStyle.success if self.show_readiness else discord.ButtonStyle.secondary
+        self.update()
+
+        await self.edit(interaction)
+
     @discord.ui.button(emoji='\u2b05', style=discord.ButtonStyle.primary, row=1)
     async def left(self, _, interaction: TypedInteraction) -> None:
         if self.boundary_x <= 0:
@@ -149,7 +252,7 @@ class LandView(UserView):
         self.boundary_x -= 8
         self.update()
 
-        await interaction.response.edit_message(content=self.message, view=self)
+        await self.edit(interaction)
 
     @discord.ui.button(emoji='\u2b07', style=discord.ButtonStyle.primary, row=1)
     async def down(self, _, interaction: TypedInteraction) -> None:
@@ -159,7 +262,7 @@ class LandView(UserView):
         self.boundary_y += 8
         self.update()
 
-        await interaction.response.edit_message(content=self.message, view=self)
+        await self.edit(interaction)
 
     @discord.ui.button(emoji='\u27a1', style=discord.ButtonStyle.primary, row=1)
     async def right(self, _, interaction: TypedInteraction) -> None:
@@ -169,7 +272,7 @@ class LandView(UserView):
         self.boundary_x += 8
         self.update()
 
-        await interaction.response.edit_message(content=self.message, view=self)
+        await self.edit(interaction)
 
 
 class Farming(Cog):
@@ -329,6 +432,9 @@ class Farming(Cog):
             level, xp, max_xp = info.level_data
             next_harvest = info.last_harvest + timedelta(seconds=crop.metadata.time)
 
+            if record.silo_mode:
+                embed.add_field(name='Silo', value=f'**Stored Harvests:** {info.accrued_harvests(ctx.now):,} / {info.silo_capacity:,}')
+
             embed.add_field(name='Specific Information', value=dedent(f"""
                 **Level:** {level:,} ({xp:,} / {max_xp:,} XP)
                 **Planted At:** {discord.utils.format_dt(info.created_at)}
@@ -373,12 +479,41 @@ class Farming(Cog):
         ctx.bot.loop.create_task(ctx.thumbs())
         return f'Planted {crop.get_sentence_chunk(1)} at coordinate **{CropInfo.into_coordinates(*coordinate)}**.', REPLY
 
-    @command(aliases={'har', 'ha', 'hv', 'gather', 'collect'})
+    @staticmethod
+    def _harvest_embed(
+        ctx: Context,
+        level_ups: dict[tuple[int, int], tuple[Item, int]],
+        harvested: dict[Item, int],
+        *,
+        title: str = 'Successful Harvest',
+    ) -> discord.Embed:
+        embed = discord.Embed(color=Colors.success, timestamp=ctx.now)
+        embed.set_author(name=title, icon_url=ctx.author.avatar.url)
+
+        embed.add_field(name='Harvested:', value='\n'.join(
+            f'{item.get_display_name()} x{quantity:,}' for item, quantity in harvested.items()
+        ), inline=False)
+
+        if len(level_ups):
+            message = '\n'.join(
+                f'{item.get_display_name()} at {CropInfo.into_coordinates(x, y)}: Now level {new:,}!'
+                for _, ((x, y), (item, new)) in zip(range(10), level_ups.items())
+            )
+            if len(level_ups) > 10:
+                message += f'\n*{len(level_ups) - 10:,} more...*'
+
+            embed.add_field(name='Leveled up crops:', value=message)
+
+        return embed
+
+    @command(aliases={'har', 'ha', 'hv', 'gather'})
     @simple_cooldown(1, 15)
     @user_max_concurrency(1)
     async def harvest(self, ctx: Context, *crops: Union[parse_coordinate, query_crop]):  # Must use Union here as | operator does not work for functions
         """Harvest crops from your farm.
 
+        If you have silo mode enabled, this collects your silo instead.
+
         **Examples:**
         `.harvest` - Harvest all crops from your farm.
         `.harvest tomato` - Harvest only tomatoes from your farm.
@@ -388,6 +523,12 @@ class Farming(Cog):
         `.harvest A1 tomato` - Harvest the crop from A1 and all tomatoes.
         """
         record = await ctx.db.get_user_record(ctx.author.id)
+        if record.silo_mode:
+            if crops:
+                return f'Your farm is in silo mode, use `{ctx.clean_prefix}collect` to collect all of your crops at once.', BAD_ARGUMENT
+
+            return await self._collect(ctx, record)
+
         manager = await record.crop_manager.wait()
 
         crops: list[tuple[int, int] | Item] = list(set(crops))
@@ -397,33 +538,42 @@ class Farming(Cog):
                 crops.pop(i)
                 crops.extend(k for k, v in manager.cached.items() if v.crop == crop)
 
-        if not len(crops):
-            crops = list(manager.cached.keys())
-
-        level_ups, harvested = await manager.harvest(crops)
+        # With no arguments, only the crops that are ready are visited
+        level_ups, harvested = await manager.harvest(crops or None)
 
         if not harvested:
             return 'Could not harvest anything.', REPLY
 
-        embed = discord.Embed(color=Colors.success, timestamp=ctx.now)
-        embed.set_author(name='Successful Harvest', icon_url=ctx.author.avatar.url)
+        return self._harvest_embed(ctx, level_ups, harvested), REPLY
 
-        embed.add_field(name='Harvested:', value='\n'.join(
-            f'{item.get_display_name()} x{quantity:,}' for item, quantity in harvested.items()
-        ), inline=False)
+    async def _collect(self, ctx: Context, record: UserRecord) -> tuple[str | discord.Embed, Any]:
+        manager = await record.crop_manager.wait()
+        level_ups, harvested, settled = await manager.collect()
 
-        if len(level_ups):
-            message = '\n'.join(
-                f'{item.get_display_name()} at {CropInfo.into_coordinates(x, y)}: Now level {new:,}!'
-                for _, ((x, y), (item, new)) in zip(range(10), level_ups.items())
-            )
-            if len(level_ups) > 10:
-                message += f'\n*{len(level_ups) - 10:,} more...*'
+        if not harvested:
+            return 'Your silo is empty. Check back later!', REPLY
 
-            embed.add_field(name='Leveled up crops:', value=message)
+        embed = self._harvest_embed(ctx, level_ups, harvested, title='Silo Collected')
+        embed.description = f'Collected **{settled:,}** stored harvest{"s" if settled != 1 else ""} from your silo.'
 
         return embed, REPLY
 
+    @command(aliases={'silo', 'col'})
+    @simple_cooldown(1, 15)
+    @user_max_concurrency(1)
+    async def collect(self, ctx: Context):
+        """Collect every harvest stored in your silo at once.
+
+        Your farm must be in silo mode. In silo mode, each crop keeps producing while you are away,
+        storing up to a few harvests (more as it levels up) until you collect them.
+        Enable it using `settings silo_mode enabled`.
+        """
+        record = await ctx.db.get_user_record(ctx.author.id)
+        if not record.silo_mode:
+            return f'Your farm is not in silo mode. Enable it using `{ctx.clean_prefix}settings silo_mode enabled`, or use `{ctx.clean_prefix}harvest` instead.', BAD_ARGUMENT
+
+        return await self._collect(ctx, record)
+
     @command(aliases={'wat', 'flourish'})
     @simple_cooldown(2, 4)
     @user_max_concurrency(1)
@@ -6,7 +6,7 @@ from typing import Any, TYPE_CHECKING
 import discord
 from discord.utils import format_dt, oauth_url
 
-from app.core import BAD_ARGUMENT, Cog, Context, EDIT, REPLY, command, simple_cooldown
+from app.core import BAD_ARGUMENT, Cog, Context, EDIT, REPLY, command, group, simple_cooldown
 from app.data.settings import Setting, Settings
 from app.util.common import walk_collection
 from app.util.converters import better_bool, query_setting
@@ -30,6 +30,9 @@ class Miscellaneous(Cog):
 
     SUPPORT_SERVER = 'https://discord.gg/bpnedYgFVd'
 
+    MAX_PREFIXES = 10
+    MAX_PREFIX_LENGTH = 16
+
     @command(alias="pong")
     @simple_cooldown(2, 2)
     async def ping(self, ctx: Context) -> tuple[str, Any]:
@@ -112,5 +115,69 @@ class Miscellaneous(Cog):
 
         await setting.set(ctx, value)
 
+    @group(aliases={'prefixes'})
+    @simple_cooldown(2, 2)
+    async def prefix(self, ctx: Context) -> tuple[str, Any]:
+        """View the prefixes of this server."""
+        prefixes = ctx.bot.get_prefixes(ctx.guild)
+        readable = '\n'.join(f'- `{prefix}`' for prefix in prefixes)
+
+        return f'My prefixes here are:\n{readable}\n\nYou can also mention me instead of using a prefix.', REPLY
+
+    @staticmethod
+    def _check_prefix_permissions(ctx: Context) -> str | None:
+        if ctx.guild is None:
+            return 'You can only change prefixes in a server.'
+
+        if not ctx.author.guild_permissions.manage_guild:
+            return 'You need the **Manage Server** permission in order to change prefixes.'
+
+    @prefix.command('add', aliases={'+', 'new', 'create'})
+    @simple_cooldown(1, 5)
+    async def prefix_add(self, ctx: Context, *, prefix: str) -> tuple[str, Any]:
+        """Add a prefix to this server."""
+        if error := self._check_prefix_permissions(ctx):
+            return error, BAD_ARGUMENT
+
+        if len(prefix) > self.MAX_PREFIX_LENGTH:
+            return f'Prefixes can be at most {self.MAX_PREFIX_LENGTH} characters long.', BAD_ARGUMENT
+
+        prefixes = ctx.bot.get_prefixes(ctx.guild)
+        if prefix in prefixes:
+            return 'That is already a prefix in this server.', BAD_ARGUMENT
+
+        if len(prefixes) >= self.MAX_PREFIXES:
+            return f'This server can only have up to {self.MAX_PREFIXES} prefixes.', BAD_ARGUMENT
+
+        await ctx.db.set_guild_prefixes(ctx.guild.id, (*prefixes, prefix))
+        return f'Added `{prefix}` as a prefix.', REPLY
+
+    @prefix.command('remove', aliases={'-', 'rm', 'delete', 'del'})
+    @simple_cooldown(1, 5)
+    async def prefix_remove(self, ctx: Context, *, prefix: str) -> tuple[str, Any]:
+        """Remove a prefix from this server."""
+        if error := self._check_prefix_permissions(ctx):
+            return error, BAD_ARGUMENT
+
+        prefixes = ctx.bot.get_prefixes(ctx.guild)
+        if prefix not in prefixes:
+            return 'That is not a prefix in this server.', BAD_ARGUMENT
+
+        if len(prefixes) <= 1:
+            return f'This server must have at least one prefix. Use `{ctx.clean_prefix}prefix reset` to reset to the default prefix.', BAD_ARGUMENT
+
+        await ctx.db.set_guild_prefixes(ctx.guild.id, (p for p in prefixes if p != prefix))
+        return f'Removed `{prefix}` as a prefix.', REPLY
+
+    @prefix.command('reset', aliases={'clear', 'default'})
+    @simple_cooldown(1, 5)
+    async def prefix_reset(self, ctx: Context) -> tuple[str, Any]:
+        """Reset the prefixes of this server to the default prefix."""
+        if error := self._check_prefix_permissions(ctx):
+            return error, BAD_ARGUMENT
+
+        await ctx.db.reset_guild_prefixes(ctx.guild.id)
+        return f'Reset the prefixes of this server to `{ctx.bot.get_prefixes(None)[0]}`.', REPLY
+
 
 setup = Miscellaneous.simple_setup
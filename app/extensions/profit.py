@@ -3,14 +3,11 @@ from __future__ import annotations
 import asyncio
 import datetime
 import random
-from collections import deque
 from datetime import timedelta
-from html import unescape
 from textwrap import dedent
 from typing import Any, Generic, Literal, NamedTuple, TypeVar
 
 import discord
-import requests
 
 from app.core import (
     BAD_ARGUMENT,
@@ -27,9 +24,11 @@ from app.core import (
 from app.core.helpers import cooldown_message
 from app.data.items import Item, Items
 from app.data.skills import RobberyTrainingButton
+from app.util import tracing
 from app.util.common import humanize_list, insert_random_u200b
 from app.util.converters import CaseInsensitiveMemberConverter, Investment
-from app.util.structures import LockWithReason
+from app.util.structures import TTLDict
+from app.util.trivia import TriviaPrefetcher, TriviaQuestion, TriviaStore
 from app.util.views import AnyUser, UserView
 from config import Colors, Emojis
 
@@ -103,39 +102,15 @@ class RobData(NamedTuple):
     amount: int
 
 
-class TriviaQuestion(NamedTuple):
-    category: str
-    type: Literal['multiple', 'boolean']
-    difficulty: Literal['easy', 'medium', 'hard']
-    question: str
-    correct_answer: str
-    incorrect_answers: list[str]
-
-    @property
-    def answers(self) -> list[str]:
-        if self.type == 'multiple':
-            entities = [self.correct_answer] + self.incorrect_answers
-            random.shuffle(entities)
-            return entities
-
-        return ['True', 'False']
-
-    @classmethod
-    def from_data(cls, data: dict[str, Any]) -> TriviaQuestion:
-        data['question'] = unescape(data['question'])
-        data['correct_answer'] = unescape(data['correct_answer'])
-        data['incorrect_answers'] = [unescape(answer) for answer in data['incorrect_answers']]
-
-        return cls(**data)
-
-
 class Profit(Cog):
     """Commands you use to grind for profit."""
 
-    def __setup__(self) -> None:
-        self._recent_robs: dict[int, RobData] = {}
-        self._trivia_questions: deque[TriviaQuestion] = deque(maxlen=50)
-        self._trivia_questions_fetch_lock: asyncio.Lock = asyncio.Lock()
+    async def __setup__(self) -> None:
+        # Users can only be robbed once every 3 minutes, entries past that are useless
+        self._recent_robs: TTLDict[int, RobData] = TTLDict(ttl=180)
+
+        self.trivia_questions: TriviaPrefetcher = TriviaPrefetcher(self.bot.session, TriviaStore())
+        await self.trivia_questions.start()
 
     BEG_INITIAL_MESSAGES = (
         "Alright, begging...",
@@ -221,7 +196,7 @@ class Profit(Cog):
         embed = discord.Embed(timestamp=ctx.now)
         embed.set_author(name=f"Beg: {ctx.author}", icon_url=ctx.author.avatar)
 
-        await asyncio.sleep(random.uniform(2, 4))
+        await tracing.sleep(random.uniform(2, 4))
 
         record = await ctx.db.get_user_record(ctx.author.id)
         await record.add_random_exp(4, 7)
@@ -303,7 +278,7 @@ class Profit(Cog):
                 yield "", embed, EDIT
                 return
 
-            await asyncio.sleep(2)
+            await tracing.sleep(2)
 
         profit = await record.add_coins(round(amount * (1 + multiplier)))
 
@@ -765,7 +740,7 @@ class Profit(Cog):
         fish = {item: fish.count(item) for item in set(fish) if item is not None}
 
         yield f'{Emojis.loading} Casting your fishing pole...', REPLY
-        await asyncio.sleep(random.uniform(2., 4.))
+        await tracing.sleep(random.uniform(2., 4.))
 
         if not len(fish):
             yield 'You caught absolutely nothing. Lmao.', EDIT
@@ -780,7 +755,7 @@ class Profit(Cog):
             )
 
             try:
-                response = await ctx.bot.wait_for('message', check=lambda m: m.author == ctx.author and m.channel == ctx.channel, timeout=10)
+                response = await ctx.bot.prompts.wait_for(ctx.author.id, ctx.channel.id, timeout=10)
                 initial = "You failed to wind up your fishing pole"
 
             except asyncio.TimeoutError:
@@ -849,7 +824,7 @@ class Profit(Cog):
         await record.add_random_bank_space(10, 15, chance=0.6)
 
         yield f'{Emojis.loading} Digging through the ground using your {shovel.name}...', REPLY
-        await asyncio.sleep(random.uniform(2., 4.))
+        await tracing.sleep(random.uniform(2., 4.))
 
         if not len(items):
             yield 'You dug up absolutely nothing. Lmao.', EDIT
@@ -864,7 +839,7 @@ class Profit(Cog):
             )
 
             try:
-                response = await ctx.bot.wait_for('message', check=lambda m: m.author == ctx.author and m.channel == ctx.channel, timeout=10)
+                response = await ctx.bot.prompts.wait_for(ctx.author.id, ctx.channel.id, timeout=10)
                 initial = "You failed dig up the item"
 
             except asyncio.TimeoutError:
@@ -935,7 +910,7 @@ class Profit(Cog):
         await record.add_random_bank_space(10, 15, chance=0.6)
 
         yield f'{Emojis.loading} Mining using your {pickaxe.name}...', REPLY
-        await asyncio.sleep(random.uniform(2., 4.))
+        await tracing.sleep(random.uniform(2., 4.))
 
         if not len(items):
             yield 'You mined absolutely nothing. Lmao.', EDIT
@@ -950,7 +925,7 @@ class Profit(Cog):
             )
 
             try:
-                response = await ctx.bot.wait_for('message', check=lambda m: m.author == ctx.author and m.channel == ctx.channel, timeout=10)
+                response = await ctx.bot.prompts.wait_for(ctx.author.id, ctx.channel.id, timeout=10)
                 initial = "You failed mine the ore"
 
             except asyncio.TimeoutError:
@@ -1031,7 +1006,7 @@ class Profit(Cog):
         await record.add_random_bank_space(10, 15, chance=0.6)
 
         yield f'{Emojis.loading} Chopping down some trees...', REPLY
-        await asyncio.sleep(random.uniform(2., 4.))
+        await tracing.sleep(random.uniform(2., 4.))
 
         if not len(wood):
             yield 'You couldn\'t chop down any trees, lol.', EDIT
@@ -1054,32 +1029,6 @@ class Profit(Cog):
 
         yield '', embed, EDIT
 
-    async def pop_trivia_question(self) -> TriviaQuestion:
-        try:
-            return self._trivia_questions.popleft()
-        except IndexError:
-            pass
-
-        async with self._trivia_questions_fetch_lock:
-            # async with self.bot.session.get('https://opentdb.com/api.php?amount=50') as response:
-            #     if not response.ok:
-            #         raise RuntimeError('failed to retrieve trivia question')
-            #
-            #     data = await response.json(encoding='utf-8')
-
-            # aiohttp does not work with this on windows due to the fact that aiohttp utilizes OS certs
-            response = await asyncio.to_thread(requests.get, 'https://opentdb.com/api.php?amount=50')
-            if not response.ok:
-                raise RuntimeError('failed to retrieve trivia question')
-
-            data = await asyncio.to_thread(response.json)
-
-            if data['response_code'] != 0:
-                raise RuntimeError('failed to retrieve trivia question')
-
-            self._trivia_questions.extend(TriviaQuestion.from_data(q) for q in data['results'])
-            return self._trivia_questions.popleft()
-
     TRIVIA_PRIZE_MAPPING = {
         'easy': (100, 150),
         'medium': (200, 325),
@@ -1091,7 +1040,11 @@ class Profit(Cog):
     @user_max_concurrency(1)
     async def trivia(self, ctx: Context):
         """Answer trivia questions for coins!"""
-        question = await self.pop_trivia_question()
+        question = self.trivia_questions.pop()
+        if question is None:
+            yield 'Trivia is unavailable right now, try again in a bit.', BAD_ARGUMENT
+            return
+
         prize = random.randint(*self.TRIVIA_PRIZE_MAPPING[question.difficulty])
 
         embed = discord.Embed(color=Colors.primary, description=question.question, timestamp=ctx.now)
@@ -1211,7 +1164,7 @@ class Profit(Cog):
                 yield 'That user has recently been robbed, let\'s give them a break.', BAD_ARGUMENT
                 return
 
-        lock = ctx.bot.transaction_locks.setdefault(user.id, LockWithReason())
+        lock = ctx.bot.transaction_locks.get(user.id)
 
         if lock.locked():
             yield f'{user.name} is currently being robbed, lmao', BAD_ARGUMENT
@@ -1252,7 +1205,7 @@ class Profit(Cog):
                 await record.add_random_exp(12, 17, chance=0.7, connection=conn)
 
             yield f'{Emojis.loading} Robbing {user.name}...', REPLY
-            await asyncio.sleep(random.uniform(1.5, 3.5))
+            await tracing.sleep(random.uniform(1.5, 3.5))
 
             padlock_worked = False
 
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import datetime
 import random
 from textwrap import dedent
@@ -11,6 +10,8 @@ import discord
 from app.core import BAD_ARGUMENT, Cog, Context, REPLY, command, group, lock_transactions, simple_cooldown, \
     user_max_concurrency
 from app.data.skills import Skill as SkillObject, Skills, TrainingFailure
+from app.util import tracing
+from app.util.catalog import catalogs
 from app.util.common import humanize_duration, walk_collection
 from app.util.converters import query_skill
 from app.util.pagination import FieldBasedFormatter, Paginator
@@ -37,7 +38,7 @@ class Skill(Cog):
 
         fields = []
 
-        for skill in walk_collection(Skills, SkillObject):
+        for skill, summary in catalogs.get('skills', self._build_skill_catalog):
             if skill_record := skills.get_skill(skill):
                 fields.append({
                     'name': f'{skill.name}',
@@ -53,7 +54,7 @@ class Skill(Cog):
             elif record.level < skill.level_unlocked:
                 fields.append({
                     'name': f'{skill.name} (Unlocked at Level {skill.level_unlocked})',
-                    'value': f'You do not meet the level requirement to unlock this skill.\n\n{skill.description}\n*{skill.benefit_per_point} per point*',
+                    'value': 'You do not meet the level requirement to unlock this skill.' + summary,
                     'inline': False
                 })
             else:
@@ -64,7 +65,7 @@ class Skill(Cog):
 
                 fields.append({
                     'name': f'{skill.name} (Unlock for {Emojis.coin} {skill.price:,})',
-                    'value': value + f'\n\n{skill.description}\n*{skill.benefit_per_point} per point*',
+                    'value': value + summary,
                     'inline': False,
                 })
 
@@ -74,6 +75,13 @@ class Skill(Cog):
 
         return Paginator(ctx, FieldBasedFormatter(embed, fields, per_page=3)), REPLY
 
+    @staticmethod
+    def _build_skill_catalog() -> tuple[tuple[SkillObject, str], ...]:
+        return tuple(
+            (skill, f'\n\n{skill.description}\n*{skill.benefit_per_point} per point*')
+            for skill in walk_collection(Skills, SkillObject)
+        )
+
     @staticmethod
     def get_maximum_skill_points(record: UserRecord, skill_record: SkillInfo) -> int:
         acc = None
@@ -191,7 +199,7 @@ class Skill(Cog):
             return
 
         yield f'{Emojis.loading} Training {skill.name}...', REPLY
-        await asyncio.sleep(random.uniform(2, 4))
+        await tracing.sleep(random.uniform(2, 4))
 
         try:
             await skill.run_training(ctx)
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+from time import perf_counter
 from typing import Any, Callable, Type
 
 import discord
 from discord import Message, PartialMessage
 from discord.application_commands import ApplicationCommand, ApplicationCommandTree, option
+from discord.ext.commands.view import StringView
 
-from app.core import Bot, Context
+from app.core import Bot, Command, Context
 from app.util.common import cutoff
 from app.util.types import TypedInteraction
 
@@ -39,7 +41,24 @@ class MakeshiftMessage(PartialMessage):
         return self
 
 
-async def run_command(interaction: TypedInteraction, command: str) -> None:
+# Set this to False to route all slash commands through the old synthetic message parsing, e.g. to compare latencies.
+# The time to first response of each is recorded in metrics.slash_first_response, see Context.record_first_response.
+DIRECT_DISPATCH: bool = True
+
+
+def _into_content(command: str, arguments: dict[str, Any]) -> str:
+    parts = [command]
+
+    for value in arguments.values():
+        if value is None:
+            continue
+
+        parts.append(str(value.id) if isinstance(value, (discord.User, discord.Member)) else str(value))
+
+    return ' '.join(parts)
+
+
+async def run_command(interaction: TypedInteraction, command: str, *, received_at: float | None = None) -> None:
     bot = interaction.client
 
     message = MakeshiftMessage.from_interaction(interaction, interaction.channel)
@@ -48,13 +67,51 @@ async def run_command(interaction: TypedInteraction, command: str) -> None:
     # noinspection PyTypeChecker
     ctx = await bot.get_context(message, cls=Context)
     ctx.interaction = interaction
+    ctx.slash_dispatch = 'message', received_at or perf_counter()
+
+    await bot.invoke(ctx)
+
+
+async def dispatch_command(
+    interaction: TypedInteraction, command: str, arguments: dict[str, Any], *, received_at: float | None = None,
+) -> None:
+    """Invokes a command directly with the given arguments, without building and parsing a message.
+
+    Falls back to :func:`run_command` for commands that don't support direct arguments (e.g. the help command).
+    """
+    received_at = received_at or perf_counter()
+    bot = interaction.client
+    target = bot.get_command(command)
+
+    if not DIRECT_DISPATCH or not isinstance(target, Command):
+        return await run_command(interaction, _into_content(command, arguments), received_at=received_at)
+
+    prefix = f'{bot.user.mention} '
+    *parents, invoked_with = command.split()
+
+    message = MakeshiftMessage.from_interaction(interaction, interaction.channel)
+    message.content = prefix + command
+
+    ctx = Context(
+        prefix=prefix,
+        view=StringView(''),
+        bot=bot,
+        message=message,
+        command=target,
+        invoked_with=invoked_with,
+        invoked_parents=parents,
+    )
+    ctx.interaction = interaction
+    ctx.direct_arguments = arguments
+    ctx.slash_dispatch = 'direct', received_at
 
     await bot.invoke(ctx)
 
 
-def _make_callback(factory: Callable[[Any], str]) -> Callable[[Any], Any]:
+def _make_callback(command: str, factory: Callable[[Any], dict[str, Any]] | None = None) -> Callable[[Any], Any]:
     async def callback(self: Any, interaction: TypedInteraction) -> None:
-        await run_command(interaction, factory(self))
+        received_at = perf_counter()
+        await dispatch_command(interaction, command, factory(self) if factory else {}, received_at=received_at)
 
     return callback
 
@@ -64,7 +121,7 @@ def _declare_simple_command(command: str, **kwargs) -> Type[ApplicationCommand]:
         kwargs['name'] = command
 
     class Wrapper(ApplicationCommand, description=command, tree=TREE, **kwargs):
-        callback = _make_callback(lambda _: command)
+        callback = _make_callback(command)
 
     return Wrapper
 
@@ -73,7 +130,7 @@ class Help(ApplicationCommand, tree=TREE):
     """help"""
     entity: str = option(description='The specific command to get help for.')
 
-    callback = _make_callback(lambda self: f'help {self.entity or ""}')
+    callback = _make_callback('help', lambda self: {'command': self.entity})
 
 
 Ping = _declare_simple_command('ping')
@@ -83,21 +140,21 @@ class Balance(ApplicationCommand, tree=TREE):
     """balance"""
     user: discord.Member = option(description='The user to check the balance of.')
 
-    callback = _make_callback(lambda self: f'balance {self.user.id if self.user else ""}')
+    callback = _make_callback('balance', lambda self: {'user': self.user})
 
 
 class Level(ApplicationCommand, tree=TREE):
     """level"""
     user: discord.Member = option(description='The user to check the level of.')
 
-    callback = _make_callback(lambda self: f'level {self.user.id if self.user else ""}')
+    callback = _make_callback('level', lambda self: {'user': self.user})
 
 
 class Inventory(ApplicationCommand, tree=TREE):
     """inventory"""
     user: discord.Member = option(description='The user to check the inventory of.')
 
-    callback = _make_callback(lambda self: f'inventory {self.user.id if self.user else ""}')
+    callback = _make_callback('inventory', lambda self: {'user': self.user})
 
 
 Leaderboard = _declare_simple_command('leaderboard')
@@ -112,6 +169,8 @@ class Notifications(ApplicationCommand, tree=TREE):
         """notifications view"""
         index: int = option(description='The index of the notification to view.', required=True)
 
+        callback = _make_callback('notifications view', lambda self: {'index': self.index})
+
 
 Beg = _declare_simple_command('beg')
 Search = _declare_simple_command('search')
@@ -123,14 +182,14 @@ class Withdraw(ApplicationCommand, tree=TREE):
     """withdraw"""
     amount: str = option(description='The amount of coins to withdraw.', required=True)
 
-    callback = _make_callback(lambda self: f'withdraw {self.amount}')
+    callback = _make_callback('withdraw', lambda self: {'amount': self.amount})
 
 
 class Deposit(ApplicationCommand, tree=TREE):
     """deposit"""
     amount: str = option(description='The amount of coins to deposit.', required=True)
 
-    callback = _make_callback(lambda self: f'deposit {self.amount}')
+    callback = _make_callback('deposit', lambda self: {'amount': self.amount})
 
 
 Shop = _declare_simple_command('shop')
@@ -140,7 +199,7 @@ class ItemInfo(ApplicationCommand, name='item-info', tree=TREE):
     """ii"""
     item: str = option(description='The item to get info on.', required=True)
 
-    callback = _make_callback(lambda self: f'ii {self.item}')
+    callback = _make_callback('shop', lambda self: {'item': self.item})
 
 
 class Buy(ApplicationCommand, tree=TREE):
@@ -148,7 +207,7 @@ class Buy(ApplicationCommand, tree=TREE):
     item: str = option(description='The item to buy.', required=True)
     quantity: str = option(description='The quantity of that item to buy.', default='1')
 
-    callback = _make_callback(lambda self: f'buy {self.item} {self.quantity}')
+    callback = _make_callback('buy', lambda self: {'item_and_quantity': f'{self.item} {self.quantity}'})
 
 
 class Sell(ApplicationCommand, tree=TREE):
@@ -156,7 +215,7 @@ class Sell(ApplicationCommand, tree=TREE):
     item: str = option(description='The item to sell.', required=True)
     quantity: str = option(description='The quantity of that item to sell.', default='1')
 
-    callback = _make_callback(lambda self: f'sell {self.item} {self.quantity}')
+    callback = _make_callback('sell', lambda self: {'item_and_quantity': f'{self.item} {self.quantity}'})
 
 
 class Use(ApplicationCommand, tree=TREE):
@@ -164,14 +223,14 @@ class Use(ApplicationCommand, tree=TREE):
     item: str = option(description='The item to use.', required=True)
     quantity: str = option(description='The quantity of that item to use, if applicable.', default='1')
 
-    callback = _make_callback(lambda self: f'use {self.item} {self.quantity}')
+    callback = _make_callback('use', lambda self: {'item_and_quantity': f'{self.item} {self.quantity}'})
 
 
 class Drop(ApplicationCommand, tree=TREE):
     """drop"""
     entity: str = option(description='The amount of coins or items to drop.', required=True)
 
-    callback = _make_callback(lambda self: f'drop {self.entity}')
+    callback = _make_callback('drop', lambda self: {'entity': self.entity})
 
 
 Skills = _declare_simple_command('skills')
@@ -181,14 +240,14 @@ class SkillInfo(ApplicationCommand, name='skill-info', tree=TREE):
     """skills view"""
     skill: str = option(description='The skill to get info on.', required=True)
 
-    callback = _make_callback(lambda self: f'skills view {self.skill}')
+    callback = _make_callback('skills view', lambda self: {'skill': self.skill})
 
 
 class BuySkill(ApplicationCommand, name='buy-skill', tree=TREE):
     """skills buy"""
     skill: str = option(description='The skill to buy.', required=True)
 
-    callback = _make_callback(lambda self: f'skills buy {self.skill}')
+    callback = _make_callback('skills buy', lambda self: {'skill': self.skill})
 
 
 def setup(bot: Bot) -> None:
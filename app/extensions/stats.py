@@ -6,11 +6,12 @@ from typing import Any, Literal, TYPE_CHECKING
 import discord
 
 from app.core import BAD_ARGUMENT, Cog, Context, NO_EXTRA, REPLY, command, group, simple_cooldown
-from app.data.items import Items
+from app.data.items import Item, ItemRarity, Items
 from app.database import UserRecord
+from app.util.catalog import catalogs
 from app.util.common import cutoff, progress_bar
 from app.util.converters import CaseInsensitiveMemberConverter
-from app.util.pagination import FieldBasedFormatter, Formatter, LineBasedFormatter, Paginator
+from app.util.pagination import FieldBasedFormatter, Formatter, IteratorPageSource, LineBasedFormatter, Paginator
 from config import Colors, Emojis
 
 if TYPE_CHECKING:
@@ -37,7 +38,7 @@ class LeaderboardFormatter(Formatter[tuple[UserRecord, discord.Member]]):
         embed = discord.Embed(color=Colors.primary, description='\n'.join(result), timestamp=paginator.ctx.now)
         # noinspection PyTypeChecker
         embed.set_author(name=f'Leaderboard: {paginator.ctx.guild.name}', icon_url=paginator.ctx.guild.icon)
-        embed.set_footer(text=f'Page {paginator.current_page + 1}/{paginator.max_pages}')
+        embed.set_footer(text=f'Page {paginator.page_label}')
 
         return embed
 
@@ -94,22 +95,23 @@ class Stats(Cog):
 
         This is prone to change in the future when flags are implemented. For now, there are limitations.
         """
+        await ctx.bot.chunker.ensure_chunked(ctx.guild)
         members = ctx.guild._members
 
         records = sorted(
-            (
-                (record, ctx.guild.get_member(key))
-                for key, record in ctx.db.user_records.items()
-                if key in members and record.wallet
-            ),
-            key=lambda r: r[0].wallet,
+            (record for key, record in ctx.db.user_records.items() if key in members and record.wallet),
+            key=lambda r: r.wallet,
             reverse=True,
         )
 
         if not records:
             return "I don't see anyone in the cache that's in this server."
 
-        return Paginator(ctx, LeaderboardFormatter(records, per_page=10), timeout=120), REPLY
+        # Members are only resolved for the pages that are actually viewed
+        source = IteratorPageSource(
+            ((record, ctx.guild.get_member(record.user_id)) for record in records), per_page=10, total=len(records),
+        )
+        return Paginator(ctx, LeaderboardFormatter(source), timeout=120), REPLY
 
     @command(aliases={"inv", "backpack", "items"})
     @simple_cooldown(1, 6)
@@ -120,25 +122,47 @@ class Stats(Cog):
         record = await ctx.db.get_user_record(user.id)
         inventory = await record.inventory_manager.wait()
 
-        fields = [{
-            'name': f'{item.display_name} — **{quantity:,}**',
-            'value': f'Worth {Emojis.coin} **{item.price * quantity:,}**',
-            'inline': False,
-        } for item, quantity in inventory.cached.items() if quantity]
-
-        worth = sum(item.price * quantity for item, quantity in inventory.cached.items())
+        # Only formatted lazily, but snapshotted as the inventory may change while paginating
+        owned = [(item, quantity) for item, quantity in inventory.cached.items() if quantity]
+        worth = inventory.cached.net_worth
 
-        if not len(fields):
+        if not owned:
             return f'{"You currently do" if user == ctx.author else f"{user.name} currently does"} not own any items.', REPLY
 
+        unique = len(catalogs.get('book', self._build_book_catalog)['all'])
+
         embed = discord.Embed(color=Colors.primary, timestamp=ctx.now)
         embed.description = dedent(f"""
             {'Your' if user == ctx.author else f"{user.name}'s"} inventory is worth {Emojis.coin} **{worth:,}**.
-            Additionally, you own **{len(fields):,}** out of {len(list(Items.all())):,} unique items.
+            Additionally, you own **{len(owned):,}** out of {unique:,} unique items.
         """)
         embed.set_author(name=f'{user.name}\'s Inventory', icon_url=user.avatar.url)
 
-        return Paginator(ctx, FieldBasedFormatter(embed, fields, per_page=5), timeout=120), REPLY, NO_EXTRA if ctx.author != user else None
+        fields = IteratorPageSource((
+            {
+                'name': f'{item.display_name} — **{quantity:,}**',
+                'value': f'Worth {Emojis.coin} **{item.price * quantity:,}**',
+                'inline': False,
+            }
+            for item, quantity in owned
+        ), per_page=5, total=len(owned))
+
+        return Paginator(ctx, FieldBasedFormatter(embed, fields), timeout=120), REPLY, NO_EXTRA if ctx.author != user else None
+
+    @staticmethod
+    def _build_book_catalog() -> dict[str, tuple[tuple[Item, str, str, str], ...]]:
+        entries = [
+            (item, item.get_display_name(bold=True), item.get_display_name(), f' ({item.rarity.name.title()}) x')
+            for item in Items.all()
+        ]
+
+        book = {'all': tuple(entries)}
+        for item, *_ in entries:
+            key = item.rarity.name.lower()
+            if key not in book:
+                book[key] = tuple(entry for entry in entries if entry[0].rarity is item.rarity)
+
+        return book
 
     @command(aliases={"itembook", "uniqueitems", "discovered"})
     @simple_cooldown(2, 6)
@@ -149,20 +173,21 @@ class Stats(Cog):
         quantity = inventory.cached.quantity_of
 
         rarity = rarity.lower()
+        book = catalogs.get('book', self._build_book_catalog)
 
-        lines = [
-            f'{item.get_display_name(bold=quantity(item) > 0)} ({item.rarity.name.title()}) x{quantity(item):,}'
-            for item in Items.all() if rarity in ('all', item.rarity.name.lower())
-        ]
+        lines = []
+        for item, bold, plain, suffix in book.get(rarity, ()):
+            owned = quantity(item)
+            lines.append(f'{bold if owned > 0 else plain}{suffix}{owned:,}')
 
-        count = sum(quantity > 0 for quantity in inventory.cached.values())
+        count = inventory.cached.discovered
 
         embed = discord.Embed(color=Colors.primary, timestamp=ctx.now)
         embed.set_author(name=f'{ctx.author.name}\'s Item Book', icon_url=ctx.author.avatar.url)
-        embed.description = f'You own **{count:,}** out of {len(list(Items.all())):,} unique items.'
+        embed.description = f'You own **{count:,}** out of {len(book["all"]):,} unique items.'
 
         if rarity != 'all':
-            count = sum(quantity > 0 for item, quantity in inventory.cached.items() if item.rarity.name.lower() == rarity)
+            count = inventory.cached.discovered_counts[ItemRarity[rarity]]
             embed.description += f'\nYou have also discovered {count:,} out of {len(lines):,} **{rarity.lower()}** items.'
 
         return Paginator(ctx, LineBasedFormatter(embed, lines, field_name='\u200b'), timeout=120), REPLY
@@ -176,15 +201,20 @@ class Stats(Cog):
 
         await record.update(unread_notifications=0)
 
-        fields = [{
-            'name': f'{idx}. {notification.title} ({discord.utils.format_dt(notification.created_at, "R")})',
-            'value': cutoff(notification.content),
-            'inline': False,
-        } for idx, notification in enumerate(notifications.cached, start=1)]
-
-        if not len(fields):
+        if not notifications.cached:
             return 'You currently do not have any notifications.', REPLY
 
+        # Only formatted lazily, but snapshotted as notifications may arrive (e.g. from crop reminders) while paginating
+        cached = list(notifications.cached)
+        fields = IteratorPageSource((
+            {
+                'name': f'{idx}. {notification.title} ({discord.utils.format_dt(notification.created_at, "R")})',
+                'value': cutoff(notification.content),
+                'inline': False,
+            }
+            for idx, notification in enumerate(cached, start=1)
+        ), per_page=5, total=len(cached))
+
         embed = discord.Embed(color=Colors.primary, timestamp=ctx.now)
         embed.description = (
             f'Run `{ctx.clean_prefix}notifications view <index>` to view a specific notification.\n'
@@ -192,7 +222,7 @@ class Stats(Cog):
         )
         embed.set_author(name=f'{ctx.author.name}\'s Notifications', icon_url=ctx.author.avatar.url)
 
-        return Paginator(ctx, FieldBasedFormatter(embed, fields, per_page=5), timeout=120), REPLY
+        return Paginator(ctx, FieldBasedFormatter(embed, fields), timeout=120), REPLY
 
     @notifications.command(name='view', aliases={"v", "read", "info"})
     @simple_cooldown(2, 3)
@@ -22,6 +22,7 @@ from app.core import (
 )
 from app.data.items import Item, Items
 from app.data.recipes import Recipe, Recipes
+from app.util.catalog import catalogs
 from app.util.common import cutoff, get_by_key, image_url_from_emoji, walk_collection
 from app.util.converters import (
     BUY,
@@ -85,23 +86,28 @@ class DropView(discord.ui.View):
         child.disabled = True
 
 
+def _all_recipes() -> tuple[Recipe, ...]:
+    return catalogs.get('recipes', lambda: tuple(walk_collection(Recipes, Recipe)))
+
+
 class RecipeSelect(discord.ui.Select['RecipeView']):
     def __init__(self, default: Recipe | None = None) -> None:
         super().__init__(
             placeholder='Choose a recipe...',
             options=[
-                discord.SelectOption(
-                    label=recipe.name,
-                    value=recipe.key,
-                    emoji=recipe.emoji,
-                    description=cutoff(recipe.description, max_length=50, exact=True),
-                    default=default == recipe,
-                )
-                for recipe in walk_collection(Recipes, Recipe)
+                discord.SelectOption(label=label, value=key, emoji=emoji, description=description, default=default == recipe)
+                for recipe, label, key, emoji, description in catalogs.get('recipes:options', self._build_options)
             ],
             row=0,
         )
 
+    @staticmethod
+    def _build_options() -> tuple[tuple[Recipe, str, str, str, str], ...]:
+        return tuple(
+            (recipe, recipe.name, recipe.key, recipe.emoji, cutoff(recipe.description, max_length=50, exact=True))
+            for recipe in _all_recipes()
+        )
+
     async def callback(self, interaction: discord.Interaction) -> None:
         try:
             recipe = get_by_key(Recipes, self.values[0])
@@ -120,7 +126,7 @@ class RecipeView(UserView):
         self.ctx: Context = ctx
         self.record: UserRecord = record
 
-        self.current: Recipe = default or next(walk_collection(Recipes, Recipe))
+        self.current: Recipe = default or _all_recipes()[0]
         self.input_lock: asyncio.Lock = asyncio.Lock()
 
         super().__init__(ctx.author)
@@ -142,22 +148,29 @@ class RecipeView(UserView):
         if not self.discovered:
             embed.set_footer(text='You have not discovered this recipe yet!')
 
-        embed.add_field(name='General', value=dedent(f"""
-            **Name:**: {self.current.name}
-            **Query Key: `{self.current.key}`**
-            **Price:** {Emojis.coin} {self.current.price:,}
-        """), inline=False)
+        general, ingredients, hidden_ingredients = catalogs.get(('recipe', self.current.key), self._build_recipe_fields)
 
-        embed.add_field(name='Ingredients', value='\n'.join(
-            (f'{item.display_name} x{quantity}' for item, quantity in self.current.ingredients.items())
-            if self.discovered
-            else (
-                f'{self.REPLACE_REGEX.sub("?", item.name)} x{quantity}' for item, quantity in self.current.ingredients.items()
-            )
-        ))
+        embed.add_field(name='General', value=general, inline=False)
+        embed.add_field(name='Ingredients', value=ingredients if self.discovered else hidden_ingredients)
 
         return embed
 
+    def _build_recipe_fields(self) -> tuple[str, str, str]:
+        recipe = self.current
+
+        general = dedent(f"""
+            **Name:**: {recipe.name}
+            **Query Key: `{recipe.key}`**
+            **Price:** {Emojis.coin} {recipe.price:,}
+        """)
+
+        ingredients = '\n'.join(f'{item.display_name} x{quantity}' for item, quantity in recipe.ingredients.items())
+        hidden_ingredients = '\n'.join(
+            f'{self.REPLACE_REGEX.sub("?", item.name)} x{quantity}' for item, quantity in recipe.ingredients.items()
+        )
+
+        return general, ingredients, hidden_ingredients
+
     def update(self) -> None:
         amount = self._get_max()
         toggle = self.discovered and amount > 0
@@ -248,9 +261,7 @@ class RecipeView(UserView):
             )
 
             try:
-                response = await self.ctx.bot.wait_for(
-                    'message', timeout=30, check=lambda m: m.author == interaction.user,
-                )
+                response = await self.ctx.bot.prompts.wait_for(interaction.user.id, timeout=30)
             except asyncio.TimeoutError:
                 return await self.ctx.reply("You took too long to respond, cancelling.")
 
@@ -319,6 +330,14 @@ class Transactions(Cog):
 
         return embed, REPLY
 
+    @staticmethod
+    def _build_shop_catalog() -> tuple[tuple[Item, str, str], ...]:
+        return tuple(
+            (i, f'• {i.display_name} — {Emojis.coin} {i.price:,}', cutoff(i.description, max_length=100))
+            for i in walk_collection(Items, Item)
+            if i.buyable
+        )
+
     @command(aliases={"store", "market", "sh", "iteminfo", "ii"})
     @simple_cooldown(1, 6)
     async def shop(self, ctx: Context, *, item: query_item = None) -> tuple[Paginator | discord.Embed, Any]:
@@ -330,23 +349,18 @@ class Transactions(Cog):
         await inventory.wait()
 
         if not item:
-            fields = []
-
-            for i in walk_collection(Items, Item):
-                if not i.buyable:
-                    continue
+            embed.title = 'Item Shop'
+            embed.description = f'To buy an item, see `{ctx.clean_prefix}buy`.\nTo view information on an item, see `{ctx.clean_prefix}iteminfo`.'
 
-                embed.title = 'Item Shop'
-                embed.description = f'To buy an item, see `{ctx.clean_prefix}buy`.\nTo view information on an item, see `{ctx.clean_prefix}iteminfo`.'
+            quantity_of = inventory.cached.quantity_of
+            fields = []
 
+            for i, name, description in catalogs.get('shop', self._build_shop_catalog):
                 comment = '*You cannot afford this item.*\n' if i.price > record.wallet else ''
-                owned = inventory.cached.quantity_of(i)
-                owned = f'(You own {owned:,})' if owned else ''
-
-                description = cutoff(i.description, max_length=100)
+                owned = quantity_of(i)
 
                 fields.append({
-                    'name': f'• {i.display_name} — {Emojis.coin} {i.price:,} {owned}',
+                    'name': f'{name} (You own {owned:,})' if owned else name,
                     'value': comment + description,
                     'inline': False,
                 })
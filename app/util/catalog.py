@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import sys
+from typing import Any, Callable, Hashable, TypeVar
+
+from config import version as _bot_version
+
+T = TypeVar('T')
+
+__all__ = (
+    'CatalogCache',
+    'catalogs',
+)
+
+
+def _deep_sizeof(obj: Any, seen: set[int]) -> int:
+    if id(obj) in seen:
+        return 0
+
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+
+    return size
+
+
+class CatalogCache:
+    """Caches the static parts of catalog pages (shop, recipes, skills, item book, etc.)
+
+    This content only changes on deploy, so each entry is built once per catalog version
+    and callers only patch in per-user overlays (owned counts, discovered flags, etc.)
+    """
+
+    def __init__(self, version: str) -> None:
+        self.version: str = version
+        self._entries: dict[Hashable, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, factory: Callable[[], T]) -> T:
+        """Returns the entry under the given key, building it with ``factory`` if it isn't cached.
+
+        Entries are shared between invocations, so they should be treated as read-only.
+        """
+        try:
+            return self._entries[key]
+        except KeyError:
+            entry = self._entries[key] = factory()
+            return entry
+
+    def invalidate(self, version: str | None = None) -> None:
+        """Drops all entries, optionally moving to a new catalog version."""
+        if version is not None:
+            self.version = version
+
+        self._entries.clear()
+
+    def memory_usage(self) -> dict[Hashable, int]:
+        """Returns the approximate size in bytes of each entry.
+
+        Only containers and the strings/numbers within them are counted, objects shared with the catalogs
+        themselves (e.g. :class:`Item` instances) are counted by their shallow size only.
+        """
+        return {key: _deep_sizeof(entry, set()) for key, entry in self._entries.items()}
+
+    @property
+    def total_memory_usage(self) -> int:
+        return sum(self.memory_usage().values())
+
+
+catalogs: CatalogCache = CatalogCache(_bot_version)
@@ -112,21 +112,20 @@ def get_amount(total: float, minimum: int, maximum: int, arg: str) -> int:
 
 @converter
 async def CaseInsensitiveMemberConverter(ctx: Context, argument: str) -> discord.Member:
-    # This may not scale too well.
-    try:
+    if ctx.guild is None:
         return await MemberConverter().convert(ctx, argument)
-    except MemberNotFound:
-        argument = argument.lower()
 
-        def check(member):
-            return (
-                member.name.lower() == argument
-                or member.display_name.lower() == argument
-                or str(member).lower() == argument
-                or str(member.id) == argument
-            )
+    await ctx.bot.chunker.ensure_chunked(ctx.guild)
+    members = ctx.bot.member_index
+
+    # Exact matches on the lowercased username, display name, tag or ID
+    if found := members.get_member(ctx.guild, argument):
+        return found
 
-        if found := discord.utils.find(check, ctx.guild.members):
+    try:
+        return await MemberConverter().convert(ctx, argument)
+    except MemberNotFound:
+        if len(argument) >= 3 and (found := members.get_member(ctx.guild, argument, prefix=True)):
             return found
 
         raise MemberNotFound(argument)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Sequence, TYPE_CHECKING
+
+from app.util.common import level_requirement_for
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+__all__ = (
+    'LevelingCurve',
+    'get_curve',
+)
+
+
+class LevelingCurve:
+    """Answers level queries for a single curve by bisecting precomputed cumulative thresholds.
+
+    Results are identical to :func:`app.util.common.calculate_level`: both use :func:`level_requirement_for`
+    for each level's requirement, and everything past that is integer arithmetic.
+    Tables are extended lazily as higher amounts of EXP are queried.
+    """
+
+    __slots__ = ('base', 'factor', '_requirements', '_thresholds')
+
+    def __init__(self, *, base: int = 1000, factor: float = 1.45) -> None:
+        self.base: int = base
+        self.factor: float = factor
+
+        # _requirements[n] is the EXP needed to go from level n to n + 1,
+        # _thresholds[n] is the total EXP needed to reach level n + 1.
+        self._requirements: list[int] = []
+        self._thresholds: list[int] = []
+        self._extend(64)
+
+    def _extend(self, levels: int) -> None:
+        total = self._thresholds[-1] if self._thresholds else 0
+
+        for level in range(len(self._requirements), len(self._requirements) + levels):
+            requirement = level_requirement_for(level, base=self.base, factor=self.factor)
+            total += requirement
+
+            self._requirements.append(requirement)
+            self._thresholds.append(total)
+
+    def _ensure(self, exp: int) -> None:
+        while self._thresholds[-1] < exp:
+            self._extend(len(self._thresholds))
+
+    def requirement_for(self, level: int) -> int:
+        if level >= len(self._requirements):
+            self._extend(level - len(self._requirements) + 1)
+
+        return self._requirements[level]
+
+    def level_of(self, exp: int) -> int:
+        self._ensure(exp)
+        return bisect_left(self._thresholds, exp)
+
+    def calculate(self, exp: int) -> tuple[int, int, int]:
+        """Returns (level, exp into the level, exp required for the next level), like :func:`calculate_level`."""
+        self._ensure(exp)
+        level = bisect_left(self._thresholds, exp)
+
+        if level:
+            exp -= self._thresholds[level - 1]
+
+        return level, exp, self._requirements[level]
+
+    def levels_of(self, exps: Sequence[int]) -> list[int] | NDArray:
+        """Computes the levels of many EXP values at once, e.g. for leaderboards.
+
+        If NumPy is installed, this is vectorized and returns an array. Otherwise, this returns a list.
+        """
+        if not len(exps):
+            return numpy.zeros(0, dtype=numpy.int64) if numpy is not None else []
+
+        self._ensure(max(exps))
+
+        if numpy is None:
+            thresholds = self._thresholds
+            return [bisect_left(thresholds, exp) for exp in exps]
+
+        thresholds = numpy.asarray(self._thresholds, dtype=numpy.int64)
+        return numpy.searchsorted(thresholds, numpy.asarray(exps, dtype=numpy.int64), side='left')
+
+
+_curves: dict[tuple[int, float], LevelingCurve] = {}
+
+
+def get_curve(*, base: int = 1000, factor: float = 1.45) -> LevelingCurve:
+    """Returns the shared :class:`LevelingCurve` for the given parameters."""
+    try:
+        return _curves[base, factor]
+    except KeyError:
+        curve = _curves[base, factor] = LevelingCurve(base=base, factor=factor)
+        return curve
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from time import perf_counter
+from typing import Callable, Iterable, TYPE_CHECKING
+
+from app.util.metrics import metrics
+
+if TYPE_CHECKING:
+    from discord import Guild, Member, User
+
+__all__ = (
+    'MemberNameIndex',
+    'MemberIndexCache',
+    'GuildChunker',
+)
+
+
+class MemberNameIndex:
+    """Indexes the members of a single guild by their lowercased username, display name and tag.
+
+    Exact lookups are a dict lookup; prefix lookups bisect a sorted list of keys.
+    Keys shared by multiple members are promoted from a single ID to a set of IDs.
+    """
+
+    __slots__ = ('_exact', '_sorted', '_keys')
+
+    def __init__(self, members: Iterable[Member] = ()) -> None:
+        self._exact: dict[str, int | set[int]] = {}
+        self._sorted: list[str] = []
+        self._keys: dict[int, tuple[str, ...]] = {}
+
+        for member in members:
+            self._add_keys(member.id, self.keys_for(member))
+
+        self._sorted = sorted(self._exact)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, member_id: int) -> bool:
+        return member_id in self._keys
+
+    @staticmethod
+    def keys_for(member: Member | User) -> tuple[str, ...]:
+        name = member.name.lower()
+        display_name = member.display_name.lower()
+        tag = str(member).lower()
+
+        if name == display_name:
+            return (name,) if name == tag else (name, tag)
+
+        return (name, display_name) if tag in (name, display_name) else (name, display_name, tag)
+
+    def _add_keys(self, member_id: int, keys: tuple[str, ...]) -> list[str]:
+        self._keys[member_id] = keys
+        new = []
+
+        for key in keys:
+            try:
+                existing = self._exact[key]
+            except KeyError:
+                self._exact[key] = member_id
+                new.append(key)
+                continue
+
+            if isinstance(existing, set):
+                existing.add(member_id)
+            elif existing != member_id:
+                self._exact[key] = {existing, member_id}
+
+        return new
+
+    def add(self, member: Member | User) -> None:
+        self.remove(member.id)
+
+        for key in self._add_keys(member.id, self.keys_for(member)):
+            insort(self._sorted, key)
+
+    def remove(self, member_id: int) -> None:
+        keys = self._keys.pop(member_id, ())
+
+        for key in keys:
+            existing = self._exact[key]
+
+            if isinstance(existing, set):
+                existing.discard(member_id)
+                if len(existing) == 1:
+                    self._exact[key] = existing.pop()
+
+                continue
+
+            del self._exact[key]
+            idx = bisect_left(self._sorted, key)
+            if idx < len(self._sorted) and self._sorted[idx] == key:
+                del self._sorted[idx]
+
+    def _resolve(self, key: str) -> int:
+        existing = self._exact[key]
+        return min(existing) if isinstance(existing, set) else existing
+
+    def find(self, argument: str) -> int | None:
+        """Returns the ID of a member that has a key exactly matching the (lowercased) argument."""
+        argument = argument.lower()
+        if argument.isdigit() and int(argument) in self._keys:
+            return int(argument)
+
+        try:
+            return self._resolve(argument)
+        except KeyError:
+            return None
+
+    def find_prefix(self, argument: str, *, candidates: int = 25) -> int | None:
+        """Returns the ID of the member with the shortest key that starts with the (lowercased) argument.
+
+        Only the first ``candidates`` keys (in sorted order) are considered.
+        """
+        argument = argument.lower()
+        idx = bisect_left(self._sorted, argument)
+
+        best = None
+        for key in self._sorted[idx:idx + candidates]:
+            if not key.startswith(argument):
+                break
+
+            if best is None or len(key) < len(best):
+                best = key
+
+        if best is None:
+            return None
+
+        return self._resolve(best)
+
+
+class MemberIndexCache:
+    """Keeps a bounded number of :class:`MemberNameIndex` objects, evicting the least recently used guild.
+
+    Indexes are built lazily on first lookup, then kept up to date from member events.
+    """
+
+    def __init__(self, *, max_guilds: int = 256) -> None:
+        self.max_guilds: int = max_guilds
+        self._indexes: OrderedDict[int, MemberNameIndex] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def get(self, guild: Guild) -> MemberNameIndex:
+        try:
+            index = self._indexes[guild.id]
+        except KeyError:
+            index = self._indexes[guild.id] = MemberNameIndex(guild.members)
+
+            if len(self._indexes) > self.max_guilds:
+                self._indexes.popitem(last=False)
+        else:
+            self._indexes.move_to_end(guild.id)
+
+        return index
+
+    def get_member(self, guild: Guild, argument: str, *, prefix: bool = False) -> Member | None:
+        index = self.get(guild)
+        member_id = index.find_prefix(argument) if prefix else index.find(argument)
+
+        if member_id is None:
+            return None
+
+        return guild.get_member(member_id)
+
+    def add_member(self, member: Member) -> None:
+        if (index := self._indexes.get(member.guild.id)) is not None:
+            index.add(member)
+
+    def remove_member(self, member: Member) -> None:
+        if (index := self._indexes.get(member.guild.id)) is not None:
+            index.remove(member.id)
+
+    def update_user(self, user: User, get_guild: Callable[[int], Guild | None]) -> None:
+        for guild_id, index in self._indexes.items():
+            if user.id not in index:
+                continue
+
+            if (guild := get_guild(guild_id)) and (member := guild.get_member(user.id)):
+                index.add(member)
+
+    def remove_guild(self, guild: Guild) -> None:
+        self._indexes.pop(guild.id, None)
+
+
+class GuildChunker:
+    """Requests guild member lists on demand rather than at startup.
+
+    Concurrent requests for the same guild share a single chunk request. Chunked guilds are kept in an LRU,
+    and the member cache of the least recently used guild is released once there are more than ``max_guilds``.
+    """
+
+    def __init__(self, *, max_guilds: int = 100, on_release: Callable[[Guild], None] | None = None) -> None:
+        self.max_guilds: int = max_guilds
+        self.chunk_count: int = 0
+        self.release_count: int = 0
+
+        self._chunked: OrderedDict[int, Guild] = OrderedDict()
+        self._pending: dict[int, asyncio.Task[None]] = {}
+        self._on_release: Callable[[Guild], None] | None = on_release
+
+    def __len__(self) -> int:
+        return len(self._chunked)
+
+    @property
+    def member_cache_size(self) -> int:
+        """The total amount of members cached across all chunked guilds."""
+        return sum(len(guild._members) for guild in self._chunked.values())
+
+    async def ensure_chunked(self, guild: Guild) -> None:
+        """Makes sure the member list of the given guild is cached, chunking it if necessary."""
+        if guild.id in self._chunked:
+            self._chunked.move_to_end(guild.id)
+            return
+
+        if guild.chunked:
+            return self._track(guild)
+
+        try:
+            task = self._pending[guild.id]
+        except KeyError:
+            task = self._pending[guild.id] = asyncio.create_task(self._chunk(guild))
+
+        await asyncio.shield(task)
+
+    async def _chunk(self, guild: Guild) -> None:
+        start = perf_counter()
+
+        try:
+            await guild.chunk()
+        finally:
+            del self._pending[guild.id]
+
+        metrics.guild_chunk_latency.observe(perf_counter() - start)
+        self.chunk_count += 1
+        self._track(guild)
+
+    def _track(self, guild: Guild) -> None:
+        self._chunked[guild.id] = guild
+
+        while len(self._chunked) > self.max_guilds:
+            _, released = self._chunked.popitem(last=False)
+            self.release(released)
+
+    def release(self, guild: Guild) -> None:
+        """Drops the cached members of the given guild, except for the bot's own member."""
+        self._chunked.pop(guild.id, None)
+
+        me = guild.me
+        guild._members.clear()
+        if me is not None:
+            guild._add_member(me)
+
+        self.release_count += 1
+        if self._on_release is not None:
+            self._on_release(guild)
+
+    def forget(self, guild: Guild) -> None:
+        self._chunked.pop(guild.id, None)
@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+from typing import Any, Callable, Generic, Hashable, Iterable, TYPE_CHECKING, TypeAlias, TypeVar
+
+from aiohttp import web
+
+if TYPE_CHECKING:
+    from app.core.bot import Bot
+
+    Samples: TypeAlias = float | dict[Hashable, float]
+
+M = TypeVar('M', bound='Counter | Gauge | Histogram')
+
+__all__ = (
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'MetricFamily',
+    'MetricsRegistry',
+    'BotMetrics',
+    'MetricsServer',
+    'metrics',
+)
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Latencies in seconds, from sub-millisecond cache hits up to commands that wait on prompts
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+class Counter:
+    """A monotonically increasing value."""
+
+    __slots__ = ('value',)
+
+    def __init__(self) -> None:
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class Gauge:
+    """A value that can go up and down."""
+
+    __slots__ = ('value',)
+
+    def __init__(self) -> None:
+        self.value: float = 0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+
+class Histogram:
+    """Counts observations into fixed buckets.
+
+    The bucket counts are preallocated and stored non-cumulatively, so observing is a bisect and a few increments.
+    They are only made cumulative when rendered.
+    """
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.bounds: tuple[float, ...] = bounds
+        self.counts: list[int] = [0] * (len(bounds) + 1)  # The last bucket is +Inf
+        self.sum: float = 0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, quantile: float) -> float:
+        """Estimates a quantile as the upper bound of the bucket it falls into, which is ``inf`` past the last bound."""
+        target = quantile * self.count
+        cumulative = 0
+
+        for bound, count in zip((*self.bounds, float('inf')), self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+
+        return float('inf')
+
+
+class MetricFamily(Generic[M]):
+    """A labelled metric. Each distinct label value gets its own child metric, which is created on first use.
+
+    For a single label, children are keyed by the label value itself, otherwise by a tuple of label values.
+    """
+
+    __slots__ = ('_factory', 'children')
+
+    def __init__(self, factory: Callable[[], M]) -> None:
+        self._factory: Callable[[], M] = factory
+        self.children: dict[Hashable, M] = {}
+
+    def labels(self, key: Hashable) -> M:
+        try:
+            return self.children[key]
+        except KeyError:
+            child = self.children[key] = self._factory()
+            return child
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_labels(names: tuple[str, ...], key: Hashable, extra: str = '') -> str:
+    values = key if len(names) > 1 else (key,)
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+
+    if extra:
+        parts.append(extra)
+
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the OpenMetrics text format.
+
+    Metrics that are cheap to read on demand (e.g. the size of a cache) should be registered as collectors
+    instead, which are only evaluated when scraped.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, tuple[str, str, tuple[str, ...], Any]] = {}
+
+    def _register(self, name: str, kind: str, documentation: str, labels: tuple[str, ...], factory: Callable[[], M]) -> Any:
+        if name in self._metrics:
+            raise ValueError(f'metric {name!r} is already registered')
+
+        metric = MetricFamily(factory) if labels else factory()
+        self._metrics[name] = kind, documentation, labels, metric
+        return metric
+
+    def counter(self, name: str, documentation: str, *, labels: tuple[str, ...] = ()) -> Any:
+        return self._register(name, 'counter', documentation, labels, Counter)
+
+    def gauge(self, name: str, documentation: str, *, labels: tuple[str, ...] = ()) -> Any:
+        return self._register(name, 'gauge', documentation, labels, Gauge)
+
+    def histogram(
+        self, name: str, documentation: str, *, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Any:
+        return self._register(name, 'histogram', documentation, labels, lambda: Histogram(buckets))
+
+    def collector(
+        self, name: str, documentation: str, callback: Callable[[], Samples], *, kind: str = 'gauge', labels: tuple[str, ...] = (),
+    ) -> None:
+        """Registers a metric whose value is computed by ``callback`` when scraped.
+
+        The callback returns a single value, or a dict mapping label keys to values if ``labels`` are given.
+        This replaces any previous collector of the same name, e.g. when the bot is constructed again.
+        """
+        if name in self._metrics and not callable(self._metrics[name][3]):
+            raise ValueError(f'metric {name!r} is already registered')
+
+        self._metrics[name] = kind, documentation, labels, callback
+
+    @staticmethod
+    def _render_metric(name: str, kind: str, labels: tuple[str, ...], key: Hashable, metric: Any) -> Iterable[str]:
+        if kind == 'histogram':
+            cumulative = 0
+            for bound, count in zip((*metric.bounds, '+Inf'), metric.counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                yield f'{name}_bucket{_format_labels(labels, key, le)} {cumulative}'
+
+            yield f'{name}_count{_format_labels(labels, key)} {metric.count}'
+            yield f'{name}_sum{_format_labels(labels, key)} {_format_value(metric.sum)}'
+            return
+
+        suffix = '_total' if kind == 'counter' else ''
+        value = metric if isinstance(metric, (int, float)) else metric.value
+        yield f'{name}{suffix}{_format_labels(labels, key)} {_format_value(value)}'
+
+    def render(self) -> str:
+        lines = []
+
+        for name, (kind, documentation, labels, metric) in self._metrics.items():
+            lines.append(f'# TYPE {name} {kind}')
+            lines.append(f'# HELP {name} {_escape(documentation)}')
+
+            if callable(metric):
+                try:
+                    metric = metric()
+                except Exception:
+                    continue  # e.g. the pool isn't connected yet
+
+            if isinstance(metric, MetricFamily):
+                items = metric.children.items()
+            elif labels:
+                items = metric.items()
+            else:
+                items = ((None, metric),)
+
+            for key, child in items:
+                lines.extend(self._render_metric(name, kind, labels, key, child))
+
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+
+class BotMetrics(MetricsRegistry):
+    """The metrics exported by the bot.
+
+    Everything updated on a hot path is preallocated here, so recording is only attribute and dict lookups.
+    Everything else is read from the bot when scraped, see :meth:`bind`.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.command_invocations: MetricFamily[Counter] = self.counter(
+            'bot_command_invocations', 'Command invocations.', labels=('command',),
+        )
+        self.command_errors: MetricFamily[Counter] = self.counter(
+            'bot_command_errors', 'Errors raised by commands, by error type.', labels=('command', 'error'),
+        )
+        self.command_latency: MetricFamily[Histogram] = self.histogram(
+            'bot_command_latency_seconds', 'Time taken to invoke a command.', labels=('command',),
+        )
+        self.slash_first_response: MetricFamily[Histogram] = self.histogram(
+            'bot_slash_first_response_seconds',
+            'Time from receiving a slash command interaction to its first response, by dispatch method.',
+            labels=('dispatch',),
+        )
+        self.pool_acquire_wait: Histogram = self.histogram(
+            'bot_pool_acquire_wait_seconds', 'Time spent waiting for a database connection.',
+        )
+        self.pool_waiters: Gauge = self.gauge(
+            'bot_pool_waiters', 'Tasks currently waiting for a database connection.',
+        )
+        self.user_record_hits: Counter = self.counter(
+            'bot_user_record_cache_hits', 'User record lookups that were served from the cache.',
+        )
+        self.user_record_misses: Counter = self.counter(
+            'bot_user_record_cache_misses', 'User record lookups that created a new record.',
+        )
+        self.loop_lag: Gauge = self.gauge(
+            'bot_event_loop_lag_seconds', 'How late the most recent event loop probe woke up.',
+        )
+        self.loop_lag_histogram: Histogram = self.histogram(
+            'bot_event_loop_lag_distribution_seconds', 'How late event loop probes woke up.',
+        )
+        self.guild_chunk_latency: Histogram = self.histogram(
+            'bot_guild_chunk_seconds', 'Time taken to chunk the member list of a guild on demand.',
+        )
+
+    def bind(self, bot: Bot) -> None:
+        """Registers the collectors that read from the given bot."""
+        db = bot.db
+
+        def pool_stat(method: str) -> Callable[[], float]:
+            return lambda: getattr(db._internal_pool, method)()
+
+        self.collector('bot_pool_size', 'Open database connections.', pool_stat('get_size'))
+        self.collector('bot_pool_idle', 'Idle database connections.', pool_stat('get_idle_size'))
+        self.collector('bot_pool_max_size', 'Maximum database connections.', pool_stat('get_max_size'))
+
+        self.collector('bot_user_records', 'Cached user records.', lambda: len(db.user_records))
+        self.collector(
+            'bot_manager_cache_entries', 'Cached entries across all user records, by manager.',
+            db.cache_sizes, labels=('manager',),
+        )
+        self.collector('bot_pending_prompts', 'Pending message prompts.', lambda: len(bot.prompts))
+        self.collector('bot_live_views', 'Component views still listening for interactions.', lambda: _live_views(bot))
+
+        chunker = bot.chunker
+        self.collector('bot_chunked_guilds', 'Guilds whose member lists are cached.', lambda: len(chunker))
+        self.collector(
+            'bot_member_cache_size', 'Members cached across all chunked guilds.', lambda: chunker.member_cache_size,
+        )
+        self.collector(
+            'bot_guild_chunks', 'Guilds chunked on demand.', lambda: chunker.chunk_count, kind='counter',
+        )
+        self.collector(
+            'bot_guild_releases', 'Guilds whose member caches were released.',
+            lambda: chunker.release_count, kind='counter',
+        )
+
+    async def monitor_loop_lag(self, *, interval: float = 0.5) -> None:
+        """Measures how late the event loop wakes up from a sleep, forever."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+
+            lag = max(loop.time() - start - interval, 0)
+            self.loop_lag.set(lag)
+            self.loop_lag_histogram.observe(lag)
+
+
+def _live_views(bot: Bot) -> int:
+    # noinspection PyProtectedMember
+    store = getattr(bot._connection, '_view_store', None)
+    views = getattr(store, '_synced_message_views', None)
+    return len(views) if views is not None else 0
+
+
+class MetricsServer:
+    """Serves a registry over HTTP at ``/metrics``. This should only ever be bound to a local address."""
+
+    def __init__(self, registry: MetricsRegistry, *, host: str = '127.0.0.1', port: int = 9109) -> None:
+        self.registry: MetricsRegistry = registry
+        self.host: str = host
+        self.port: int = port
+
+        self.app: web.Application = web.Application()
+        self.app.router.add_get('/metrics', self.handle)
+        self._runner: web.AppRunner | None = None
+
+    async def handle(self, _request: web.Request) -> web.Response:
+        return web.Response(body=self.registry.render().encode(), headers={'Content-Type': CONTENT_TYPE})
+
+    async def start(self) -> None:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+metrics: BotMetrics = BotMetrics()
@@ -1,8 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from asyncio import Lock
-from typing import Any, Collection, Generic, TYPE_CHECKING, TypeVar
+from collections import OrderedDict
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Collection,
+    Generic,
+    Iterable,
+    Sequence,
+    TYPE_CHECKING,
+    TypeVar,
+)
 
 from discord import ButtonStyle, Embed, Interaction
 from discord.ui import Button
@@ -20,18 +31,23 @@ T = TypeVar('T')
 
 __all__ = (
     'Paginator',
+    'PageSource',
+    'ListPageSource',
+    'IteratorPageSource',
     'Formatter',
 )
 
 
 class _PaginatorButton(Button['_PaginatorView']):
-    def __init__(self, paginator: Paginator, page: int, *, emoji: str, row: int | None = None) -> None:
-        page += 1
+    def __init__(self, paginator: Paginator, page: int | None, *, emoji: str, row: int | None = None) -> None:
+        # page is None when it isn't known yet (e.g. the last page of a lazy page source)
+        page = page + 1 if page is not None else 0
         self.paginator: Paginator = paginator
         self.page: int = page
 
         current = paginator.current_page + 1
-        disabled = page == current or not 1 <= page <= paginator.max_pages
+        max_pages = paginator.max_pages
+        disabled = page == current or page < 1 or max_pages is not None and page > max_pages
         label = str(page) if not disabled else None
 
         super().__init__(emoji=emoji, label=label, disabled=disabled, row=row)
@@ -53,7 +69,7 @@ class PaginatorView(UserView):
     ) -> None:
         super().__init__(paginator.ctx.author, timeout=timeout)
         self.paginator: Paginator = paginator
-        self.input_lock: Lock = Lock()
+        self.input_lock: asyncio.Lock = asyncio.Lock()
 
         self.dont_render_pagination_buttons: bool = False
 
@@ -62,7 +78,7 @@ class PaginatorView(UserView):
         self._row: int | None = row
 
     def _get_input_button(self) -> Button:
-        label = f'Page {self.paginator.current_page + 1}/{self.paginator.max_pages}'
+        label = f'Page {self.paginator.page_label}'
         button = Button(style=ButtonStyle.primary, label=label, row=self._row)
 
         async def wrapper(interaction: Interaction) -> None:
@@ -73,10 +89,7 @@ class PaginatorView(UserView):
                 ctx = self.paginator.ctx
                 prompt = await ctx.send('What page would you like to go to?')
 
-                msg = await ctx.bot.wait_for(
-                    'message', timeout=None, check=lambda message:
-                    message.author == ctx.author and message.channel == ctx.channel
-                )
+                msg = await ctx.bot.prompts.wait_for(ctx.author.id, ctx.channel.id)
 
                 async def _fallback(content: str) -> None:
                     await ctx.send(content, delete_after=6)
@@ -90,8 +103,13 @@ class PaginatorView(UserView):
                 except ValueError:
                     return await _fallback('Invalid page.')
 
-                if not 1 <= response <= self.paginator.max_pages:
-                    return await _fallback(f'Page number must be between 1 and {self.paginator.max_pages:,}.')
+                max_pages = self.paginator.max_pages
+
+                if max_pages is not None and not 1 <= response <= max_pages:
+                    return await _fallback(f'Page number must be between 1 and {max_pages:,}.')
+
+                if max_pages is None and (response < 1 or not await self.paginator.has_page(response - 1)):
+                    return await _fallback('Invalid page.')
 
                 self.paginator.current_page = response - 1
 
@@ -121,7 +139,9 @@ class PaginatorView(UserView):
 
         if not self.dont_render_pagination_buttons:
             self.add_item(_PaginatorButton(self.paginator, current + 1, emoji=Emojis.Arrows.forward, row=self._row))
-            self.add_item(_PaginatorButton(self.paginator, self.paginator.max_pages - 1, emoji=Emojis.Arrows.last, row=self._row))
+            last = self.paginator.max_pages
+            last = last - 1 if last is not None else None
+            self.add_item(_PaginatorButton(self.paginator, last, emoji=Emojis.Arrows.last, row=self._row))
 
         if self._row == 0:
             for component in self._other_components:
@@ -134,6 +154,14 @@ class PaginatorView(UserView):
 
 
 class Paginator:
+    """Paginates embeds rendered by a :class:`Formatter`.
+
+    Rendered pages are kept in a small LRU so navigating back doesn't refetch or re-render them,
+    and the next page is prefetched in the background when the page source supports it.
+    """
+
+    RENDER_CACHE_SIZE: int = 8
+
     def __init__(
         self,
         ctx: Context,
@@ -149,18 +177,65 @@ class Paginator:
         self.formatter: Formatter = formatter
         self.current_page: int = page
 
+        self._rendered: OrderedDict[int, tuple[int | None, Embed]] = OrderedDict()
+        self._prefetch_task: asyncio.Task[Any] | None = None
+
         self._underlying_view: PaginatorView = PaginatorView(
             self, center_button=center_button, other_components=other_components, row=row, timeout=timeout,
         )
 
     @property
-    def max_pages(self) -> int:
+    def max_pages(self) -> int | None:
+        """The total amount of pages, or ``None`` if it isn't known yet."""
         return self.formatter.max_pages
 
+    @property
+    def page_label(self) -> str:
+        max_pages = self.max_pages
+        return f'{self.current_page + 1}/{max_pages if max_pages is not None else "?"}'
+
+    async def has_page(self, page: int, /) -> bool:
+        try:
+            await self.formatter.fetch_page(page)
+        except IndexError:
+            return False
+
+        return True
+
     async def get_page(self, page: int, /) -> Embed:
-        return await self.formatter.format_page(
-            self, self.formatter.get_page(page)
-        )
+        max_pages = self.max_pages
+
+        # Rendered pages can include the total, so only reuse them if it hasn't changed since
+        if (cached := self._rendered.get(page)) is not None and cached[0] == max_pages:
+            self._rendered.move_to_end(page)
+            embed = cached[1]
+        else:
+            embed = await self.formatter.format_page(self, await self.formatter.fetch_page(page))
+
+            self._rendered[page] = self.max_pages, embed
+            self._rendered.move_to_end(page)
+
+            if len(self._rendered) > self.RENDER_CACHE_SIZE:
+                self._rendered.popitem(last=False)
+
+        self._schedule_prefetch(page + 1)
+        return embed
+
+    def _schedule_prefetch(self, page: int) -> None:
+        source = self.formatter.source
+        max_pages = self.max_pages
+
+        if (
+            not source.prefetch
+            or max_pages is not None and page >= max_pages
+            or page in self._rendered
+            or self._prefetch_task is not None and not self._prefetch_task.done()
+        ):
+            return
+
+        self._prefetch_task = task = asyncio.create_task(source.get_entries(page))
+        # Errors will surface again if the page is actually requested
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
 
     async def start(self, *, edit: bool = False, page: int = None, interaction: Interaction = None, **send_kwargs) -> None:
         if page is not None:
@@ -176,7 +251,7 @@ class Paginator:
 
         # If there is only one page,
         # only send the embed
-        if self.max_pages <= 1:
+        if self.max_pages is not None and self.max_pages <= 1:
             if self._underlying_view._center_button is None and not self._underlying_view._other_components:
                 self._underlying_view.stop()
                 del self._underlying_view
@@ -190,34 +265,162 @@ class Paginator:
         await responder(view=self._underlying_view, **send_kwargs)
 
 
-class Formatter(ABC, Generic[T]):
-    # NOTE: Page indices start from 0, not 1,
-    # add 1 to the current page for display.
+class PageSource(ABC, Generic[T]):
+    """Provides the entries of each page, fetching them on demand."""
+
+    # Whether the next page should be fetched in the background while the current one is shown
+    prefetch: bool = True
 
-    def __init__(self, entries: list[T], *, per_page: int = 1) -> None:
+    def __init__(self, *, per_page: int = 1) -> None:
         assert per_page > 0
-        self.entries: list[T] = entries
         self.per_page: int = per_page
 
-    def get_page(self, page: int, /) -> list[T | list[T]]:
-        if self.per_page == 1:
-            return self.entries[page]
+    @property
+    def max_pages(self) -> int | None:
+        """The total amount of pages, or ``None`` if it isn't cheaply known (yet)."""
+        return None
+
+    @abstractmethod
+    async def get_entries(self, page: int, /) -> list[T]:
+        """Returns the entries on the given page. An empty list means the page does not exist."""
 
-        start = self.per_page * page
-        return self.entries[start:start + self.per_page]
+
+class ListPageSource(PageSource[T]):
+    """Slices entries that are already in memory."""
+
+    prefetch = False
+
+    def __init__(self, entries: Sequence[T], *, per_page: int = 1) -> None:
+        super().__init__(per_page=per_page)
+        self.entries: Sequence[T] = entries
 
     @property
     def max_pages(self) -> int:
         pages, extra = divmod(len(self.entries), self.per_page)
         return max(1, pages + bool(extra))
 
+    def get_entries_sync(self, page: int, /) -> list[T]:
+        start = self.per_page * page
+        return list(self.entries[start:start + self.per_page])
+
+    async def get_entries(self, page: int, /) -> list[T]:
+        return self.get_entries_sync(page)
+
+
+class IteratorPageSource(PageSource[T]):
+    """Lazily consumes a (sync or async) iterator, keeping every entry consumed so far.
+
+    One entry past the requested page is always consumed, so the source knows whether another page exists.
+    If ``total`` (the amount of entries) is given, the total amount of pages is known from the start.
+    """
+
+    def __init__(self, iterable: Iterable[T] | AsyncIterable[T], *, per_page: int = 1, total: int | None = None) -> None:
+        super().__init__(per_page=per_page)
+
+        self._iterator: AsyncIterator[T] = (
+            aiter(iterable) if isinstance(iterable, AsyncIterable) else self._wrap(iter(iterable))
+        )
+        self.total: int | None = total
+        self._buffer: list[T] = []
+        self._exhausted: bool = False
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    @staticmethod
+    async def _wrap(iterator: Iterable[T]) -> AsyncIterator[T]:
+        for entry in iterator:
+            yield entry
+
+    @property
+    def max_pages(self) -> int | None:
+        if self.total is not None:
+            count = self.total
+        elif self._exhausted:
+            count = len(self._buffer)
+        else:
+            return None
+
+        pages, extra = divmod(count, self.per_page)
+        return max(1, pages + bool(extra))
+
+    async def _fill(self, count: int) -> None:
+        async with self._lock:
+            while len(self._buffer) < count and not self._exhausted:
+                try:
+                    self._buffer.append(await anext(self._iterator))
+                except StopAsyncIteration:
+                    self._exhausted = True
+
+    async def get_entries(self, page: int, /) -> list[T]:
+        start = self.per_page * page
+        await self._fill(start + self.per_page + 1)
+
+        return self._buffer[start:start + self.per_page]
+
+
+class Formatter(ABC, Generic[T]):
+    """Renders pages of entries into embeds.
+
+    Entries can either be a sequence, which is sliced in memory, or any :class:`PageSource`.
+    """
+
+    # NOTE: Page indices start from 0, not 1,
+    # add 1 to the current page for display.
+
+    def __init__(self, entries: Sequence[T] | PageSource[T], *, per_page: int = 1) -> None:
+        if isinstance(entries, PageSource):
+            self.source: PageSource[T] = entries
+        else:
+            self.source: PageSource[T] = ListPageSource(entries, per_page=per_page)
+
+        self.per_page: int = self.source.per_page
+
+    @property
+    def entries(self) -> Sequence[T]:
+        if not isinstance(self.source, ListPageSource):
+            raise TypeError('entries are only available when formatting an in-memory sequence')
+
+        return self.source.entries
+
+    def get_page(self, page: int, /) -> T | list[T]:
+        """Synchronously returns the entries on the given page. This is only supported for in-memory sequences."""
+        if not isinstance(self.source, ListPageSource):
+            raise TypeError('get_page is only supported when formatting an in-memory sequence, use fetch_page instead')
+
+        if self.per_page == 1:
+            return self.source.entries[page]
+
+        return self.source.get_entries_sync(page)
+
+    async def fetch_page(self, page: int, /) -> T | list[T]:
+        """Returns the entries on the given page, raising :exc:`IndexError` if it does not exist."""
+        entries = await self.source.get_entries(page)
+
+        if not entries and page > 0:
+            raise IndexError(page)
+
+        if self.per_page == 1:
+            return entries[0]
+
+        return entries
+
+    @property
+    def max_pages(self) -> int | None:
+        return self.source.max_pages
+
     @abstractmethod
     async def format_page(self, paginator: Paginator, entry: T | list[T]) -> Embed:
         ...
 
 
 class LineBasedFormatter(Formatter[str]):
-    def __init__(self, embed: Embed, lines: list[str], *, per_page: int = 10, field_name: str | None = None) -> None:
+    def __init__(
+        self,
+        embed: Embed,
+        lines: Sequence[str] | PageSource[str],
+        *,
+        per_page: int = 10,
+        field_name: str | None = None,
+    ) -> None:
         self.embed: Embed = embed
         self.field_name: str | None = field_name
 
@@ -238,7 +441,7 @@ class FieldBasedFormatter(Formatter[dict[str, Any]]):
     def __init__(
         self,
         embed: Embed,
-        field_kwargs: list[dict[str, Any]],
+        field_kwargs: Sequence[dict[str, Any]] | PageSource[dict[str, Any]],
         *,
         page_in_footer: bool = False,
         per_page: int = 5,
@@ -254,6 +457,6 @@ class FieldBasedFormatter(Formatter[dict[str, Any]]):
             embed.add_field(**field)
 
         if self.page_in_footer:
-            embed.set_footer(text=f'Page {paginator.current_page + 1}/{paginator.max_pages}')
+            embed.set_footer(text=f'Page {paginator.page_label}')
 
         return embed
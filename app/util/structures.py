@@ -1,13 +1,28 @@
 from __future__ import annotations
 
 import asyncio
+import math
 from time import perf_counter
-from typing import TypeVar
+from typing import Any, Awaitable, Callable, Generic, Hashable, Iterator, MutableMapping, TYPE_CHECKING, TypeAlias, TypeVar
+
+if TYPE_CHECKING:
+    from discord import Message
+
+    PromptCheck: TypeAlias = Callable[[Message], bool]
 
 T = TypeVar('T', bound='Timer')
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
 
 __all__ = (
     'Timer',
+    'LockWithReason',
+    'PromptRegistry',
+    'ScheduledTimer',
+    'TimingWheel',
+    'TTLDict',
+    'ExpiringLockRegistry',
+    'timers',
 )
 
 
@@ -64,3 +79,313 @@ class LockWithReason(asyncio.Lock):
 
     def with_reason(self, reason: str | None) -> LockReasonMonitor:
         return LockReasonMonitor(self, reason)
+
+
+class PromptRegistry:
+    """Indexes pending message prompts by ``(channel_id, author_id)``.
+
+    This replaces ``bot.wait_for('message', check=...)`` for prompts that are tied to a specific user,
+    so that each inbound message costs a dict lookup rather than a call to every pending check.
+    Prompts that accept a message from any channel are indexed by ``(None, author_id)``.
+    """
+
+    def __init__(self) -> None:
+        self._waiters: dict[tuple[int | None, int], list[tuple[asyncio.Future[Message], PromptCheck | None]]] = {}
+
+    def __len__(self) -> int:
+        return sum(map(len, self._waiters.values()))
+
+    def _discard(self, key: tuple[int | None, int], future: asyncio.Future[Message]) -> None:
+        try:
+            waiters = self._waiters[key]
+        except KeyError:
+            return
+
+        waiters[:] = [entry for entry in waiters if entry[0] is not future]
+        if not waiters:
+            del self._waiters[key]
+
+    def wait_for(
+        self,
+        author_id: int,
+        channel_id: int | None = None,
+        *,
+        check: PromptCheck | None = None,
+        timeout: float | None = None,
+    ) -> Awaitable[Message]:
+        """Waits for a message sent by the given author, optionally only in the given channel.
+
+        ``check`` is only evaluated against messages that already match the author and channel.
+        Like ``bot.wait_for``, this raises :exc:`asyncio.TimeoutError` if the timeout is reached.
+        """
+        key = channel_id, author_id
+        future = asyncio.get_running_loop().create_future()
+
+        self._waiters.setdefault(key, []).append((future, check))
+        future.add_done_callback(lambda f: self._discard(key, f))
+
+        return asyncio.wait_for(future, timeout)
+
+    def _resolve(self, key: tuple[int | None, int], message: Message) -> None:
+        try:
+            waiters = self._waiters[key]
+        except KeyError:
+            return
+
+        for future, check in tuple(waiters):
+            if future.done():
+                continue
+
+            try:
+                if check is None or check(message):
+                    future.set_result(message)
+            except Exception as exc:
+                future.set_exception(exc)
+
+    def dispatch(self, message: Message) -> None:
+        """Resolves any prompts waiting on this message."""
+        if not self._waiters:
+            return
+
+        author_id = message.author.id
+
+        self._resolve((message.channel.id, author_id), message)
+        self._resolve((None, author_id), message)
+
+
+class ScheduledTimer:
+    """A callback scheduled on a :class:`TimingWheel`."""
+
+    __slots__ = ('wheel', 'expires', 'callback', 'args', 'cancelled', 'fired')
+
+    def __init__(self, wheel: TimingWheel, expires: int, callback: Callable[..., Any], args: tuple[Any, ...]) -> None:
+        self.wheel: TimingWheel = wheel
+        self.expires: int = expires  # The tick this fires on
+        self.callback: Callable[..., Any] = callback
+        self.args: tuple[Any, ...] = args
+        self.cancelled: bool = False
+        self.fired: bool = False
+
+    def cancel(self) -> None:
+        """Cancels this timer. This is O(1), the entry is only dropped from its bucket once the wheel reaches it."""
+        if self.cancelled or self.fired:
+            return
+
+        self.cancelled = True
+        self.wheel._live -= 1
+
+
+class TimingWheel:
+    """A hierarchical timing wheel that runs on the event loop.
+
+    Timers are hashed into ``slots`` buckets per level, where each level covers ``slots`` times the range of the one
+    below it. Timers in higher levels are cascaded down as the wheel turns, so scheduling, cancelling and firing
+    are all O(1) amortized, and there is only ever a single loop callback, which is only scheduled while timers are live.
+    """
+
+    def __init__(self, *, tick: float = 1.0, slots: int = 64, levels: int = 4) -> None:
+        self.tick: float = tick
+        self.slots: int = slots
+        self.levels: int = levels
+
+        self.fired: int = 0
+        self._live: int = 0
+        self._current: int = 0
+        self._origin: float | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self._wheels: list[list[list[ScheduledTimer]]] = [[[] for _ in range(slots)] for _ in range(levels)]
+
+    def __len__(self) -> int:
+        return self._live
+
+    @property
+    def _loop(self) -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    def _now(self) -> int:
+        return int((self._loop.time() - self._origin) / self.tick)
+
+    def _place(self, timer: ScheduledTimer) -> None:
+        delta = timer.expires - self._current
+
+        if delta <= 0:
+            self._wheels[0][self._current % self.slots].append(timer)
+            return
+
+        for level in range(self.levels):
+            if delta < self.slots ** (level + 1) or level == self.levels - 1:
+                # Timers past the range of the top level are cascaded again when they are reached
+                index = min(timer.expires // self.slots ** level, self._current // self.slots ** level + self.slots - 1)
+                self._wheels[level][index % self.slots].append(timer)
+                return
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args: Any) -> ScheduledTimer:
+        """Calls ``callback(*args)`` after ``delay`` seconds, rounded up to the next tick."""
+        if self._origin is None or not self._live:
+            # The wheel is idle, so anything left in it was cancelled and it can just be reset to the present
+            if self._origin is None:
+                self._origin = self._loop.time()
+
+            for wheel in self._wheels:
+                for bucket in wheel:
+                    bucket.clear()
+
+            self._current = self._now()
+
+        expires = math.ceil((self._loop.time() - self._origin + delay) / self.tick)
+        timer = ScheduledTimer(self, max(expires, self._current + 1), callback, args)
+        self._place(timer)
+        self._live += 1
+
+        if self._handle is None:
+            self._schedule_tick()
+
+        return timer
+
+    def _schedule_tick(self) -> None:
+        when = self._origin + (self._current + 1) * self.tick
+        self._handle = self._loop.call_at(when, self._advance)
+
+    def _cascade(self) -> None:
+        levels = 1
+        while levels < self.levels and not self._current % self.slots ** levels:
+            levels += 1
+
+        # Higher levels go first, as they can cascade into the buckets of the lower levels that are due now
+        for level in reversed(range(1, levels)):
+            span = self.slots ** level
+            bucket = self._wheels[level][(self._current // span) % self.slots]
+            timers, bucket[:] = bucket[:], []
+
+            for timer in timers:
+                if not timer.cancelled:
+                    self._place(timer)
+
+    def _advance(self) -> None:
+        self._handle = None
+        target = self._now()
+
+        while self._current < target and self._live:
+            self._current += 1
+            self._cascade()
+
+            bucket = self._wheels[0][self._current % self.slots]
+            timers, bucket[:] = bucket[:], []
+
+            for timer in timers:
+                if timer.cancelled:
+                    continue
+
+                if timer.expires > self._current:
+                    self._place(timer)
+                    continue
+
+                timer.fired = True
+                self._live -= 1
+                self.fired += 1
+
+                try:
+                    timer.callback(*timer.args)
+                except Exception as exc:
+                    self._loop.call_exception_handler({
+                        'message': 'Exception in timing wheel callback',
+                        'exception': exc,
+                    })
+
+        if self._live:
+            self._schedule_tick()
+
+
+# The shared wheel for in-memory expiry
+timers: TimingWheel = TimingWheel()
+
+
+class TTLDict(MutableMapping[K, V], Generic[K, V]):
+    """A dict whose entries are dropped ``ttl`` seconds after they were last set.
+
+    Entries are reclaimed by a :class:`TimingWheel`, so this holds no task per entry.
+    Expiry is rounded up to the wheel's tick, so callers that need an exact window should still check timestamps.
+    """
+
+    __slots__ = ('ttl', 'expired', '_wheel', '_data')
+
+    def __init__(self, ttl: float, *, wheel: TimingWheel = timers) -> None:
+        self.ttl: float = ttl
+        self.expired: int = 0
+        self._wheel: TimingWheel = wheel
+        self._data: dict[K, tuple[V, ScheduledTimer]] = {}
+
+    def _expire(self, key: K) -> None:
+        del self._data[key]
+        self.expired += 1
+
+    def __getitem__(self, key: K) -> V:
+        return self._data[key][0]
+
+    def __setitem__(self, key: K, value: V) -> None:
+        try:
+            self._data[key][1].cancel()
+        except KeyError:
+            pass
+
+        self._data[key] = value, self._wheel.schedule(self.ttl, self._expire, key)
+
+    def __delitem__(self, key: K) -> None:
+        _, timer = self._data.pop(key)
+        timer.cancel()
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f'<TTLDict ttl={self.ttl} live={len(self)} expired={self.expired}>'
+
+
+class ExpiringLockRegistry:
+    """Hands out a :class:`LockWithReason` per key, and drops locks that have gone unused for ``ttl`` seconds.
+
+    Locks that are held or being waited on when they expire are kept for another ``ttl``.
+    """
+
+    __slots__ = ('ttl', 'expired', '_wheel', '_locks')
+
+    def __init__(self, ttl: float = 600, *, wheel: TimingWheel = timers) -> None:
+        self.ttl: float = ttl
+        self.expired: int = 0
+        self._wheel: TimingWheel = wheel
+        self._locks: dict[Hashable, tuple[LockWithReason, ScheduledTimer]] = {}
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._locks
+
+    def _expire(self, key: Hashable) -> None:
+        lock, _ = self._locks[key]
+
+        # noinspection PyProtectedMember
+        if lock.locked() or lock._waiters:
+            self._locks[key] = lock, self._wheel.schedule(self.ttl, self._expire, key)
+            return
+
+        del self._locks[key]
+        self.expired += 1
+
+    def get(self, key: Hashable) -> LockWithReason:
+        """Returns the lock for the given key, creating it if necessary. This also refreshes its expiry."""
+        try:
+            lock, timer = self._locks[key]
+        except KeyError:
+            lock = LockWithReason()
+        else:
+            timer.cancel()
+
+        self._locks[key] = lock, self._wheel.schedule(self.ttl, self._expire, key)
+        return lock
+
+    def __repr__(self) -> str:
+        return f'<ExpiringLockRegistry ttl={self.ttl} live={len(self)} expired={self.expired}>'
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Awaitable, TypeVar
+
+T = TypeVar('T')
+
+__all__ = (
+    'Span',
+    'Trace',
+    'Tracer',
+    'tracer',
+    'sleep',
+)
+
+_current_span: ContextVar[Span | None] = ContextVar('_current_span', default=None)
+
+# Set this to False to skip deliberate delays entirely, e.g. so that they don't dominate load tests
+DELAYS_ENABLED: bool = True
+
+
+class Span:
+    """A timed section of a trace. Child spans are nested under the span that was current when they started."""
+
+    __slots__ = ('name', 'kind', 'start', 'end', 'children', 'error')
+
+    def __init__(self, name: str, kind: str, start: float | None = None) -> None:
+        self.name: str = name
+        self.kind: str = kind
+        self.start: float = perf_counter() if start is None else start
+        self.end: float | None = None
+        self.children: list[Span] = []
+        self.error: str | None = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end or perf_counter()) - self.start
+
+    def walk(self, depth: int = 0):
+        yield depth, self
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+    def __repr__(self) -> str:
+        return f'<Span name={self.name!r} kind={self.kind!r} duration={self.duration:.6f}>'
+
+
+class _SpanContext:
+    __slots__ = ('span', '_parent', '_token')
+
+    def __init__(self, span: Span, parent: Span | None) -> None:
+        self.span: Span = span
+        self._parent: Span | None = parent
+        self._token = None
+
+    def __enter__(self) -> Span:
+        if self._parent is not None:
+            self._parent.children.append(self.span)
+
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, _tb) -> None:
+        self.span.end = perf_counter()
+        if exc_type is not None:
+            self.span.error = exc_type.__name__
+
+        _current_span.reset(self._token)
+
+
+class _NoopContext:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *_) -> None:
+        pass
+
+
+_NOOP = _NoopContext()
+
+
+class Trace:
+    """The spans recorded during a single command invocation."""
+
+    __slots__ = ('command', 'user_id', 'root')
+
+    def __init__(self, command: str, user_id: int) -> None:
+        self.command: str = command
+        self.user_id: int = user_id
+        self.root: Span = Span(command, 'command')
+
+    def waterfall(self, *, width: int = 24) -> str:
+        """Renders this trace as a text waterfall, with one bar per span relative to the whole invocation."""
+        total = self.root.duration or 1e-9
+        origin = self.root.start
+        lines = []
+
+        for depth, span in self.root.walk():
+            offset = round((span.start - origin) / total * width)
+            length = max(1, round(span.duration / total * width))
+            bar = ' ' * min(offset, width - 1) + '█' * min(length, width - min(offset, width - 1))
+
+            name = f'{"  " * depth}{span.kind}: {span.name}'
+            error = f' ({span.error})' if span.error else ''
+            lines.append(f'{bar:<{width}} {span.duration * 1000:>9.2f}ms {name}{error}')
+
+        return '\n'.join(lines)
+
+
+class Tracer:
+    """Records per-command traces into a ring buffer.
+
+    When tracing is disabled, or nothing is being traced in the current context, spans cost a single attribute
+    lookup or context variable lookup and return a shared no-op context manager.
+    """
+
+    def __init__(self, capacity: int = 200) -> None:
+        self.enabled: bool = False
+        self.traces: deque[Trace] = deque(maxlen=capacity)
+
+    @property
+    def active(self) -> bool:
+        """Whether a trace is being recorded in the current context."""
+        return self.enabled and _current_span.get() is not None
+
+    def trace(self, command: str, user_id: int) -> _SpanContext | _NoopContext:
+        """Starts a new trace for a command invocation."""
+        if not self.enabled:
+            return _NOOP
+
+        trace = Trace(command, user_id)
+        self.traces.append(trace)
+        return _SpanContext(trace.root, None)
+
+    def span(self, name: str, kind: str) -> _SpanContext | _NoopContext:
+        """Starts a child span of the current span, if there is one."""
+        if not self.enabled or (parent := _current_span.get()) is None:
+            return _NOOP
+
+        return _SpanContext(Span(name, kind), parent)
+
+    def record(self, name: str, kind: str, duration: float) -> None:
+        """Records a span that has already finished, e.g. from a callback that only knows the elapsed time."""
+        if not self.enabled or (parent := _current_span.get()) is None:
+            return
+
+        end = perf_counter()
+        span = Span(name, kind, start=end - duration)
+        span.end = end
+        parent.children.append(span)
+
+    def wrap(self, awaitable: Awaitable[T], name: str, kind: str) -> Awaitable[T]:
+        """Wraps an awaitable in a span, returning it unchanged if nothing is being traced."""
+        if not self.active:
+            return awaitable
+
+        return self._wrap(awaitable, name, kind)
+
+    async def _wrap(self, awaitable: Awaitable[T], name: str, kind: str) -> T:
+        with self.span(name, kind):
+            return await awaitable
+
+    def find(self, command: str | None = None) -> Trace | None:
+        """Returns the most recent trace, optionally of the given command."""
+        for trace in reversed(self.traces):
+            if command is None or trace.command == command:
+                return trace
+
+        return None
+
+
+tracer: Tracer = Tracer()
+
+
+async def sleep(delay: float, result: Any = None) -> Any:
+    """Like :func:`asyncio.sleep`, but recorded as a span. Use this for deliberate delays."""
+    if not DELAYS_ENABLED:
+        return result
+
+    with tracer.span(f'{delay:.2f}s', 'sleep'):
+        return await asyncio.sleep(delay, result)
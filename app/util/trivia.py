@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+from collections import deque
+from html import unescape
+from time import monotonic
+from typing import Any, Literal, NamedTuple
+
+from aiohttp import ClientSession, ClientTimeout
+
+__all__ = (
+    'TriviaQuestion',
+    'TriviaStore',
+    'TriviaPrefetcher',
+)
+
+OPENTDB_URL = 'https://opentdb.com/api.php'
+
+
+class TriviaQuestion(NamedTuple):
+    category: str
+    type: Literal['multiple', 'boolean']
+    difficulty: Literal['easy', 'medium', 'hard']
+    question: str
+    correct_answer: str
+    incorrect_answers: list[str]
+
+    @property
+    def answers(self) -> list[str]:
+        if self.type == 'multiple':
+            entities = [self.correct_answer] + self.incorrect_answers
+            random.shuffle(entities)
+            return entities
+
+        return ['True', 'False']
+
+    @classmethod
+    def from_data(cls, data: dict[str, Any]) -> TriviaQuestion:
+        data['question'] = unescape(data['question'])
+        data['correct_answer'] = unescape(data['correct_answer'])
+        data['incorrect_answers'] = [unescape(answer) for answer in data['incorrect_answers']]
+
+        return cls(**data)
+
+
+class TriviaStore:
+    """A persistent, deduplicated store of every trivia question fetched so far, kept as JSONL.
+
+    This is what trivia falls back to when the upstream API is slow or down.
+    Questions that were asked recently are skipped when picking from the store.
+    """
+
+    def __init__(self, path: str = 'trivia.jsonl', *, recent: int = 500) -> None:
+        self.path: str = path
+        self.questions: list[TriviaQuestion] = []
+
+        self._known: set[str] = set()
+        self._recent: deque[str] = deque(maxlen=recent)
+        self._recent_set: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def load(self) -> None:
+        """Loads the store from disk. This does blocking I/O, so it should be run in a thread."""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, encoding='utf-8') as fp:
+            for line in fp:
+                if not line.strip():
+                    continue
+
+                question = TriviaQuestion(**json.loads(line))
+                if question.question not in self._known:
+                    self._known.add(question.question)
+                    self.questions.append(question)
+
+    def add(self, questions: list[TriviaQuestion]) -> list[TriviaQuestion]:
+        """Adds the questions that aren't stored yet, and returns them so they can be persisted with :meth:`write`."""
+        new = []
+
+        for question in questions:
+            if question.question not in self._known:
+                self._known.add(question.question)
+                self.questions.append(question)
+                new.append(question)
+
+        return new
+
+    def write(self, questions: list[TriviaQuestion]) -> None:
+        """Appends the given questions to disk. This does blocking I/O, so it should be run in a thread."""
+        with open(self.path, 'a', encoding='utf-8') as fp:
+            fp.writelines(json.dumps(question._asdict()) + '\n' for question in questions)
+
+    def was_asked(self, question: TriviaQuestion) -> bool:
+        return question.question in self._recent_set
+
+    def mark_asked(self, question: TriviaQuestion) -> None:
+        if len(self._recent) == self._recent.maxlen:
+            self._recent_set.discard(self._recent[0])
+
+        self._recent.append(question.question)
+        self._recent_set.add(question.question)
+
+    def pick(self, *, attempts: int = 8) -> TriviaQuestion | None:
+        """Picks a random stored question, preferring ones that weren't asked recently."""
+        if not self.questions:
+            return None
+
+        for _ in range(attempts):
+            question = random.choice(self.questions)
+            if not self.was_asked(question):
+                return question
+
+        return question
+
+
+class TriviaPrefetcher:
+    """Keeps a queue of unasked trivia questions topped up in the background.
+
+    Questions are served from the queue, falling back to the local store, so :meth:`pop` never waits on the network.
+    Whenever the queue drops below ``low_water``, a refill is started using the given aiohttp session.
+    """
+
+    def __init__(
+        self,
+        session: ClientSession,
+        store: TriviaStore,
+        *,
+        url: str = OPENTDB_URL,
+        batch_size: int = 50,
+        low_water: int = 15,
+        timeout: float = 10,
+        retry_after: float = 60,
+    ) -> None:
+        self.session: ClientSession = session
+        self.store: TriviaStore = store
+        self.url: str = url
+        self.batch_size: int = batch_size
+        self.low_water: int = low_water
+        self.timeout: float = timeout
+        self.retry_after: float = retry_after
+
+        self.refills: int = 0
+        self.failures: int = 0
+        self.last_error: BaseException | None = None
+
+        self._queue: deque[TriviaQuestion] = deque()
+        self._task: asyncio.Task | None = None
+        self._loaded: bool = False
+        self._retry_at: float = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    async def start(self) -> None:
+        """Loads the local store and starts the first refill."""
+        await asyncio.to_thread(self.store.load)
+        self._loaded = True
+        self.maybe_refill()
+
+    def maybe_refill(self) -> None:
+        if len(self._queue) >= self.low_water or monotonic() < self._retry_at:
+            return
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refill())
+
+    async def _fetch(self) -> list[TriviaQuestion]:
+        params = {'amount': self.batch_size}
+
+        async with self.session.get(self.url, params=params, timeout=ClientTimeout(total=self.timeout)) as response:
+            if not response.ok:
+                raise RuntimeError(f'failed to retrieve trivia questions (status {response.status})')
+
+            data = await response.json(encoding='utf-8')
+
+        if data['response_code'] != 0:
+            raise RuntimeError(f'failed to retrieve trivia questions (response code {data["response_code"]})')
+
+        return [TriviaQuestion.from_data(question) for question in data['results']]
+
+    async def _refill(self) -> None:
+        try:
+            questions = await self._fetch()
+        except Exception as exc:
+            self.failures += 1
+            self.last_error = exc
+            self._retry_at = monotonic() + self.retry_after
+            return
+
+        self.refills += 1
+        self._queue.extend(question for question in questions if not self.store.was_asked(question))
+
+        if new := self.store.add(questions):
+            await asyncio.to_thread(self.store.write, new)
+
+    def pop(self) -> TriviaQuestion | None:
+        """Returns an unasked question, or ``None`` if there are none available at all."""
+        try:
+            question = self._queue.popleft()
+        except IndexError:
+            question = self.store.pick() if self._loaded else None
+
+        self.maybe_refill()
+
+        if question is not None:
+            self.store.mark_asked(question)
+
+        return question
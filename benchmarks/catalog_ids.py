@@ -0,0 +1,97 @@
+"""Compares inventory rows keyed by TEXT item keys against smallint catalog IDs.
+
+Without arguments, this times resolving each row's key to its item in Python. With ``--dsn``, it also fills two
+temporary copies of the ``items`` table, one keyed by TEXT and one by SMALLINT, with the same rows and reports
+``pg_total_relation_size`` and ``pg_indexes_size`` for each.
+
+Run with ``python -m benchmarks.catalog_ids [--dsn postgres://...] [--users 10000]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+from time import perf_counter
+
+from app.data.items import Item, Items
+from app.data.registry import REGISTRY
+from app.util.common import get_by_key
+
+ROWS = 100_000
+
+TABLES: dict[str, str] = {
+    'TEXT': 'items_text',
+    'SMALLINT': 'items_smallint',
+}
+
+
+def time_lookups(items: list[Item]) -> None:
+    rng = random.Random(0)
+    rows = [rng.choice(items) for _ in range(ROWS)]
+
+    keys = [item.key for item in rows]
+    start = perf_counter()
+    for key in keys:
+        get_by_key(Items, key)
+    text = perf_counter() - start
+
+    ids = [REGISTRY.id_of(item) for item in rows]
+    start = perf_counter()
+    for id in ids:
+        REGISTRY.get(id)
+    smallint = perf_counter() - start
+
+    print(f'TEXT keys: {text / ROWS * 1e9:,.0f} ns/row')
+    print(f'smallint IDs: {smallint / ROWS * 1e9:,.0f} ns/row ({text / smallint:,.1f}x faster)')
+
+
+async def measure_sizes(dsn: str, items: list[Item], users: int) -> None:
+    import asyncpg
+
+    rng = random.Random(0)
+    rows = [
+        (user_id, item, rng.randint(1, 1_000))
+        for user_id in range(users)
+        for item in rng.sample(items, k=min(len(items), 20))
+    ]
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        for type, table in TABLES.items():
+            await conn.execute(
+                f'CREATE TEMPORARY TABLE {table} ('
+                f'user_id BIGINT NOT NULL, item {type} NOT NULL, count BIGINT NOT NULL DEFAULT 0, '
+                f'PRIMARY KEY (user_id, item))'
+            )
+            await conn.copy_records_to_table(table, records=[
+                (user_id, item.key if type == 'TEXT' else REGISTRY.id_of(item), count)
+                for user_id, item, count in rows
+            ])
+            await conn.execute(f'ANALYZE {table}')
+
+        print(f'\n{len(rows):,} rows over {users:,} users')
+        for type, table in TABLES.items():
+            total, indexes = await conn.fetchrow(
+                f"SELECT pg_total_relation_size('{table}'), pg_indexes_size('{table}')"
+            )
+            print(f'{type:<8} total: {total / 1024 ** 2:,.2f} MiB, indexes: {indexes / 1024 ** 2:,.2f} MiB')
+    finally:
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--dsn', help='Postgres DSN to measure table and index sizes against')
+    parser.add_argument('--users', type=int, default=10_000, help='Number of users to fill the tables with')
+    args = parser.parse_args()
+
+    items = list(Items.all())
+    time_lookups(items)
+
+    if args.dsn:
+        asyncio.run(measure_sizes(args.dsn, items, args.users))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""Checks which users the crop readiness scheduler tracks, against an in-memory stand-in for the database.
+
+:class:`FakeDatabase` implements just the queries that user records, crop managers and the scheduler issue here,
+over in-memory ``users`` and ``crops`` tables. The checks cover that users who did not opt into crop notifications
+never enter the scheduler, that toggling the setting adds and removes users, and that loading the scheduler on
+startup copes with crops that were never harvested and with crops that became ready while the bot was down.
+
+Run with ``python -m benchmarks.crop_notifications``. Exits with status 1 if any check fails.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import re
+import sys
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable
+
+import discord
+
+from app.data.items import Items
+from app.data.registry import REGISTRY
+from app.database import CropReadinessScheduler, UserRecord
+
+COLUMN_REGEX: re.Pattern[str] = re.compile(r'"(\w+)" = \$(\d+)')
+CROP = Items.wheat_crop
+
+
+class FakeDatabase:
+    """Stands in for :class:`Database` and its connections, over in-memory tables."""
+
+    def __init__(self) -> None:
+        self.loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        self.bot: Any = SimpleNamespace(wait_until_ready=self._ready)
+        self.users: dict[int, dict[str, Any]] = {}
+        self.crops: dict[tuple[int, int, int], dict[str, Any]] = {}
+        self.user_records: dict[int, UserRecord] = {}
+        self.crop_scheduler: CropReadinessScheduler = CropReadinessScheduler(self)  # type: ignore
+
+    @staticmethod
+    async def _ready() -> None:
+        pass
+
+    def add_user(self, user_id: int, *, crop_notifications: bool) -> None:
+        self.users[user_id] = {
+            'user_id': user_id, 'wallet': 0, 'bank': 0, 'net_worth': 0, 'crop_notifications': crop_notifications,
+        }
+
+    def add_crop(self, user_id: int, x: int, y: int, crop: Any = None, last_harvest: datetime.datetime | None = None) -> None:
+        self.crops[user_id, x, y] = {
+            'user_id': user_id, 'x': x, 'y': y, 'crop': REGISTRY.id_of(crop) if crop is not None else None, 'exp': 0,
+            'last_harvest': last_harvest, 'created_at': discord.utils.utcnow(),
+        }
+
+    def get_user_record(self, user_id: int, *, fetch: bool = True) -> Any:
+        record = self.user_records.setdefault(user_id, UserRecord(user_id, db=self))  # type: ignore
+        return record.fetch_if_necessary() if fetch else record
+
+    def acquire(self) -> FakeDatabase:
+        return self
+
+    async def __aenter__(self) -> FakeDatabase:
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        pass
+
+    async def fetch(self, query: str, *args: Any) -> list[dict[str, Any]]:
+        if 'INNER JOIN users' in query:
+            return [
+                row for row in self.crops.values()
+                if self.users[row['user_id']]['crop_notifications'] and row['crop'] is not None
+            ]
+
+        if 'FROM crops WHERE user_id' in query:
+            return [row for row in self.crops.values() if row['user_id'] == args[0]]
+
+        raise NotImplementedError(query)
+
+    async def executemany(self, query: str, args: list[tuple[Any, ...]]) -> None:
+        if 'INSERT INTO crops' not in query:
+            raise NotImplementedError(query)
+
+        for user_id, x, y in args:
+            self.add_crop(user_id, x, y)
+
+    async def fetchrow(self, query: str, *args: Any) -> dict[str, Any] | None:
+        if 'INSERT INTO users' in query:
+            return self.users[args[0]]
+
+        if 'UPDATE users' in query:
+            row = self.users[args[0]]
+            for column, index in COLUMN_REGEX.findall(query.split('RETURNING')[0]):
+                row[column] = args[int(index) - 1]
+            return row
+
+        if 'UPDATE crops SET crop' in query:
+            user_id, crop, x, y = args
+            row = self.crops[user_id, x, y]
+            row.update(crop=crop, last_harvest=discord.utils.utcnow(), exp=0)
+            return row
+
+        raise NotImplementedError(query)
+
+
+class CheckFailed(Exception):
+    pass
+
+
+def expect(condition: bool, message: str) -> None:
+    if not condition:
+        raise CheckFailed(message)
+
+
+async def farm(db: FakeDatabase, user_id: int) -> UserRecord:
+    record = await db.get_user_record(user_id)
+    manager = await record.crop_manager.wait()
+    await manager.plant_crop(0, 0, CROP)
+    await manager.plant_crop(1, 1, CROP)
+    return record
+
+
+async def check_opted_out(db: FakeDatabase) -> None:
+    db.add_user(1, crop_notifications=False)
+    await farm(db, 1)
+
+    # noinspection PyProtectedMember
+    expect(1 not in db.crop_scheduler._due, 'a user who did not opt in was scheduled')
+    expect(not db.crop_scheduler._heap, 'a user who did not opt in was pushed onto the heap')
+
+
+async def check_toggle(db: FakeDatabase) -> None:
+    db.add_user(2, crop_notifications=True)
+    record = await farm(db, 2)
+
+    # noinspection PyProtectedMember
+    due = db.crop_scheduler._due
+    expect(2 in due, 'an opted-in user was not scheduled')
+
+    await record.update(crop_notifications=False)
+    expect(2 not in due, 'turning the setting off did not unschedule the user')
+
+    await record.update(crop_notifications=True)
+    expect(2 in due, 'turning the setting back on did not schedule the user')
+
+
+async def check_startup(db: FakeDatabase) -> None:
+    now = discord.utils.utcnow()
+    growth = datetime.timedelta(seconds=CROP.metadata.time)
+
+    db.add_user(3, crop_notifications=True)
+    db.add_crop(3, 0, 0, CROP, None)  # Planted but never harvested
+    db.add_user(4, crop_notifications=True)
+    db.add_crop(4, 0, 0, CROP, now - growth * 3)  # Ready while the bot was down
+    db.add_user(5, crop_notifications=True)
+    db.add_crop(5, 0, 0, CROP, now)  # Still growing
+    db.add_user(6, crop_notifications=False)
+    db.add_crop(6, 0, 0, CROP, now - growth * 3)
+
+    scheduler = db.crop_scheduler
+    await scheduler.start()
+    # noinspection PyProtectedMember
+    scheduler._task.cancel()
+
+    # noinspection PyProtectedMember
+    due = scheduler._due
+    expect(3 not in due, 'a crop that was never harvested was scheduled')
+    expect(4 in due and due[4] <= discord.utils.utcnow().timestamp(), 'a crop that is already ready was not due now')
+    expect(5 in due and due[5] > now.timestamp(), 'a growing crop was not scheduled for later')
+    expect(6 not in due, 'a user who did not opt in was scheduled on startup')
+
+
+CHECKS: dict[str, Callable[[FakeDatabase], Awaitable[None]]] = {
+    'opted out users': check_opted_out,
+    'toggling the setting': check_toggle,
+    'loading on startup': check_startup,
+}
+
+
+async def main() -> int:
+    failed = 0
+
+    for name, check in CHECKS.items():
+        try:
+            await check(FakeDatabase())
+        except CheckFailed as exc:
+            failed += 1
+            print(f'{name:<24} FAILED: {exc}')
+        else:
+            print(f'{name:<24} ok')
+
+    if failed:
+        print(f'{failed:,} check(s) failed.', file=sys.stderr)
+
+    return int(bool(failed))
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,50 @@
+"""Compares the iterative level calculation against the precomputed threshold tables.
+
+Run with ``python -m benchmarks.leveling``.
+"""
+
+from __future__ import annotations
+
+import random
+from time import perf_counter
+
+from app.util.common import calculate_level
+from app.util.leveling import get_curve, numpy
+
+QUERIES = 100_000
+CURVES = {
+    'users': dict(base=100, factor=1.26),
+    'crops': dict(base=50, factor=1.15),
+    'default': dict(base=1000, factor=1.45),
+}
+
+
+def main() -> None:
+    rng = random.Random(0)
+    exps = [rng.randrange(10 ** rng.randint(1, 9)) for _ in range(QUERIES)]
+
+    for name, kwargs in CURVES.items():
+        curve = get_curve(**kwargs)
+
+        start = perf_counter()
+        expected = [calculate_level(exp, **kwargs) for exp in exps]
+        loop = perf_counter() - start
+
+        start = perf_counter()
+        actual = [curve.calculate(exp) for exp in exps]
+        table = perf_counter() - start
+
+        assert actual == expected, f'{name}: results differ'
+        print(f'{name}: loop {loop / QUERIES * 1e9:,.0f} ns, bisect {table / QUERIES * 1e9:,.0f} ns ({loop / table:,.1f}x faster)')
+
+        start = perf_counter()
+        levels = curve.levels_of(exps)
+        bulk = perf_counter() - start
+
+        assert list(levels) == [level for level, _, _ in expected]
+        kind = 'numpy' if numpy is not None else 'bisect'
+        print(f'{name}: bulk ({kind}) {bulk / QUERIES * 1e9:,.0f} ns/value')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,520 @@
+"""Drives the whole bot end to end through a fake Discord transport, against a local Postgres database.
+
+The bot never connects to Discord. Gateway payloads (``MESSAGE_CREATE`` and ``INTERACTION_CREATE``) are fed straight
+into the connection state's parsers, and every REST call is acknowledged by :class:`FakeTransport` after a
+configurable latency. Each simulated user gets their own channel and runs commands back to back from the given mix.
+They confirm any confirmation view (by clicking its success-styled button) and type the answer to any typing prompt.
+
+The database configured in ``config.py`` is seeded with the simulated users, so point it at a disposable local database.
+Command cooldowns are disabled, and deliberate delays (``tracing.sleep``) are skipped unless ``--delays`` is given.
+Commands prefixed with ``/`` in the mix are sent as application command interactions instead of messages.
+
+Run with ``python -m benchmarks.loadtest --users 1000 --concurrency 50 --duration 60``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import random
+import re
+from collections import Counter, defaultdict, deque
+from time import perf_counter
+from typing import Any
+
+import discord
+import tabulate
+from discord.ext import commands
+
+from app.core.bot import Bot
+from app.data.items import ItemType, Items
+from app.data.registry import REGISTRY
+from app.util import tracing
+from app.util.metrics import Histogram, metrics
+from app.util.tracing import tracer
+
+DEFAULT_MIX = 'beg=4,fish=3,search=3,balance=3,harvest=2,share=2,rob=1,shop=1,inventory=1,/beg=1'
+
+USER_ID_OFFSET = 10 ** 17
+GUILD_ID = 10 ** 17 - 1
+BOT_ID = 10 ** 17 - 2
+
+PROMPT_REGEX: re.Pattern[str] = re.compile(r'Type `([^`]+)`')
+MESSAGE_ID_REGEX: re.Pattern[str] = re.compile(r'/messages/(\d+)$')
+INTERACTION_ID_REGEX: re.Pattern[str] = re.compile(r'/interactions/(\d+)/|token-(\d+)')
+
+
+def _timestamp() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+def _user_payload(user_id: int, *, bot: bool = False) -> dict[str, Any]:
+    return {
+        'id': str(user_id),
+        'username': f'loadtest{user_id % USER_ID_OFFSET}',
+        'discriminator': format(user_id % 10_000, '04'),
+        'avatar': 'a' * 32,
+        'bot': bot,
+    }
+
+
+def _member_payload(user_id: int, *, bot: bool = False) -> dict[str, Any]:
+    return {'user': _user_payload(user_id, bot=bot), 'roles': [], 'joined_at': _timestamp(), 'deaf': False, 'mute': False}
+
+
+class FakeTransport:
+    """Stands in for ``HTTPClient.request``, acknowledging every REST call after ``latency`` seconds.
+
+    Messages created or edited by the bot are echoed back as message payloads and passed to ``on_message``.
+    Interaction responses are attributed to the channel the interaction was created in, through ``interaction_channels``.
+    """
+
+    def __init__(self, *, latency: float, jitter: float, on_message: Any) -> None:
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.on_message: Any = on_message
+        self.calls: Counter[str] = Counter()
+        self.interaction_channels: dict[int, int] = {}
+        self._ids: itertools.count = itertools.count(USER_ID_OFFSET * 5)
+
+    @staticmethod
+    def _payload(json_payload: Any, form: list[dict[str, Any]] | None) -> dict[str, Any]:
+        if form:
+            for part in form:
+                if part.get('name') == 'payload_json':
+                    return json.loads(part['value'])
+
+        return json_payload or {}
+
+    def _message(self, channel_id: int, payload: dict[str, Any], message_id: int | None = None) -> dict[str, Any]:
+        message = {
+            'id': str(message_id or next(self._ids)),
+            'channel_id': str(channel_id),
+            'guild_id': str(GUILD_ID),
+            'author': _user_payload(BOT_ID, bot=True),
+            'content': payload.get('content') or '',
+            'timestamp': _timestamp(),
+            'edited_timestamp': _timestamp() if message_id else None,
+            'tts': False,
+            'mention_everyone': False,
+            'mentions': [],
+            'mention_roles': [],
+            'attachments': [],
+            'embeds': payload.get('embeds') or [],
+            'components': payload.get('components') or [],
+            'pinned': False,
+            'type': 0,
+            'flags': 0,
+        }
+        self.on_message(channel_id, message)
+        return message
+
+    def _interaction_channel(self, url: str) -> int:
+        if match := INTERACTION_ID_REGEX.search(url):
+            return self.interaction_channels.get(int(match.group(1) or match.group(2)), 0)
+
+        return 0
+
+    async def request(self, route: Any, *, files: Any = None, form: Any = None, **kwargs: Any) -> Any:
+        method, path = route.method, route.path
+        self.calls[f'{method} {path}'] += 1
+        await asyncio.sleep(max(self.latency + random.uniform(-self.jitter, self.jitter), 0))
+
+        payload = self._payload(kwargs.get('json'), form)
+        match = MESSAGE_ID_REGEX.search(route.url)
+        message_id = int(match.group(1)) if match else None
+
+        if path.startswith('/channels/{channel_id}/messages') and method in ('POST', 'PATCH'):
+            return self._message(route.channel_id, payload, message_id if method == 'PATCH' else None)
+
+        if path.startswith('/interactions/'):
+            # Only responses of type 4 (message) and 7 (update message) carry a message
+            if payload.get('type') in (4, 7) and (data := payload.get('data')):
+                self._message(self._interaction_channel(route.url), data)
+            return None
+
+        if path.startswith('/webhooks/') and method in ('POST', 'PATCH'):
+            # Interaction followups and edits of the original response
+            return self._message(self._interaction_channel(route.url), payload, message_id)
+
+        return None
+
+
+class LoadTest:
+    """Injects synthetic gateway events into a bot and measures how it handles them."""
+
+    def __init__(self, bot: Bot, *, users: int, concurrency: int, mix: dict[str, int], latency: float, jitter: float) -> None:
+        self.bot: Bot = bot
+        self.user_ids: list[int] = [USER_ID_OFFSET + i for i in range(users)]
+        self.concurrency: int = concurrency
+        self.mix: dict[str, int] = mix
+        self.transport: FakeTransport = FakeTransport(latency=latency, jitter=jitter, on_message=self._on_bot_message)
+
+        self.latencies: defaultdict[str, list[float]] = defaultdict(list)
+        self.errors: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        self.timeouts: Counter[str] = Counter()
+        self.pool_samples: list[tuple[int, int, int, float]] = []  # (size, idle, max size, waiters)
+        self.acquire_wait: Histogram = Histogram(metrics.pool_acquire_wait.bounds)
+
+        self._ids: itertools.count = itertools.count(USER_ID_OFFSET * 2)
+        self._pending: dict[int, tuple[str, float, asyncio.Future[None]]] = {}
+        self._channel_users: dict[int, int] = {}
+
+    # Setup
+
+    def install(self) -> None:
+        bot = self.bot
+        state = bot._connection
+
+        bot.http.request = self.transport.request
+        state.user = discord.ClientUser(state=state, data=_user_payload(BOT_ID, bot=True))
+        state.application_id = BOT_ID
+
+        channels = [
+            {'id': str(self._channel_for(user_id)), 'type': 0, 'name': f'sim-{i}', 'position': i, 'permission_overwrites': []}
+            for i, user_id in enumerate(self.user_ids[:self.concurrency])
+        ]
+        state.parsers['GUILD_CREATE']({
+            'id': str(GUILD_ID),
+            'name': 'Load test',
+            'owner_id': str(BOT_ID),
+            'roles': [{
+                'id': str(GUILD_ID), 'name': '@everyone', 'permissions': '8', 'position': 0, 'color': 0,
+                'hoist': False, 'managed': False, 'mentionable': False,
+            }],
+            'channels': channels,
+            'members': [_member_payload(BOT_ID, bot=True), *map(_member_payload, self.user_ids)],
+            'member_count': len(self.user_ids) + 1,
+            'emojis': [],
+            'stickers': [],
+            'threads': [],
+            'features': [],
+            'voice_states': [],
+            'presences': [],
+            'large': False,
+            'unavailable': False,
+        })
+        bot._ready.set()
+
+        for command in bot.walk_commands():
+            command._buckets = commands.CooldownMapping(None, commands.BucketType.default)
+
+        bot.add_listener(self._on_command_done, 'on_command_completion')
+        bot.add_listener(self._on_command_error, 'on_command_error')
+
+    async def seed(self) -> None:
+        db = self.bot.db
+        await db.wait_until_connected()
+
+        crops = [REGISTRY.id_of(item) for item in Items.all() if item.type is ItemType.crop]
+        tools = [REGISTRY.id_of(item) for item in (Items.fishing_pole, Items.shovel, Items.pickaxe)]
+        rng = random.Random(0)
+        long_ago = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=1)
+
+        async with db.acquire() as conn:
+            async with conn.transaction():
+                await conn.executemany(
+                    """
+                    INSERT INTO users (user_id, wallet, bank, max_bank) VALUES ($1, 100000, 100000, 1000000)
+                    ON CONFLICT (user_id) DO UPDATE SET wallet = 100000, bank = 100000, max_bank = 1000000
+                    """,
+                    [(user_id,) for user_id in self.user_ids],
+                )
+                await conn.executemany(
+                    """
+                    INSERT INTO items (user_id, item, count) VALUES ($1, $2, 1000)
+                    ON CONFLICT (user_id, item) DO UPDATE SET count = 1000
+                    """,
+                    [(user_id, item) for user_id in self.user_ids for item in tools],
+                )
+                await conn.executemany(
+                    """
+                    INSERT INTO crops (user_id, x, y, crop, last_harvest) VALUES ($1, $2, $3, $4, $5)
+                    ON CONFLICT (user_id, x, y) DO UPDATE SET crop = $4, last_harvest = $5
+                    """,
+                    [
+                        (user_id, x, y, rng.choice(crops), long_ago)
+                        for user_id in self.user_ids for x in range(2) for y in range(2)
+                    ],
+                )
+
+        # Anything cached from a previous run in this process is stale now
+        db.user_records.clear()
+
+    # Event injection
+
+    @staticmethod
+    def _channel_for(user_id: int) -> int:
+        return user_id + USER_ID_OFFSET * 3
+
+    def inject_message(self, user_id: int, content: str) -> int:
+        message_id = next(self._ids)
+        self.bot._connection.parsers['MESSAGE_CREATE']({
+            'id': str(message_id),
+            'channel_id': str(self._channel_for(user_id)),
+            'guild_id': str(GUILD_ID),
+            'author': _user_payload(user_id),
+            'member': {'roles': [], 'joined_at': _timestamp(), 'deaf': False, 'mute': False},
+            'content': content,
+            'timestamp': _timestamp(),
+            'edited_timestamp': None,
+            'tts': False,
+            'mention_everyone': False,
+            'mentions': [],
+            'mention_roles': [],
+            'attachments': [],
+            'embeds': [],
+            'pinned': False,
+            'type': 0,
+            'flags': 0,
+        })
+        return message_id
+
+    def _interaction(self, user_id: int, type: int, data: dict[str, Any], **extra: Any) -> int:
+        interaction_id = next(self._ids)
+        self.transport.interaction_channels[interaction_id] = self._channel_for(user_id)
+
+        self.bot._connection.parsers['INTERACTION_CREATE']({
+            'id': str(interaction_id),
+            'application_id': str(BOT_ID),
+            'type': type,
+            'data': data,
+            'guild_id': str(GUILD_ID),
+            'channel_id': str(self._channel_for(user_id)),
+            'member': {**_member_payload(user_id), 'permissions': '8'},
+            'token': f'token-{interaction_id}',
+            'version': 1,
+            **extra,
+        })
+        return interaction_id
+
+    def inject_application_command(self, user_id: int, name: str) -> int:
+        return self._interaction(user_id, 2, {'id': str(next(self._ids)), 'name': name, 'type': 1, 'options': []})
+
+    def click(self, user_id: int, message: dict[str, Any], custom_id: str) -> int:
+        return self._interaction(user_id, 3, {'custom_id': custom_id, 'component_type': 2}, message=message)
+
+    def _on_bot_message(self, channel_id: int | None, message: dict[str, Any]) -> None:
+        user_id = self._channel_users.get(int(channel_id or 0))
+        if user_id is None:
+            return
+
+        for row in message['components']:
+            for component in row.get('components', ()):
+                # Confirmation views are the only ones with a success-styled button, paginators and such are left alone
+                if component.get('type') == 2 and component.get('style') == 3 and not component.get('disabled'):
+                    # This is deferred so that the view is registered by the time the click arrives
+                    self.bot.loop.call_soon(self.click, user_id, message, component['custom_id'])
+                    return
+
+        if match := PROMPT_REGEX.search(message['content']):
+            self.bot.loop.call_soon(self.inject_message, user_id, match.group(1).replace('\u200b', ''))
+
+    # Measurement
+
+    def _resolve(self, ctx: commands.Context, error: Exception | None = None) -> None:
+        try:
+            name, start, future = self._pending.pop(ctx.message.id)
+        except KeyError:
+            return
+
+        self.latencies[name].append(perf_counter() - start)
+        if error is not None:
+            self.errors[name][type(getattr(error, 'original', error)).__name__] += 1
+
+        if not future.done():
+            future.set_result(None)
+
+    async def _on_command_done(self, ctx: commands.Context) -> None:
+        self._resolve(ctx)
+
+    async def _on_command_error(self, ctx: commands.Context, error: Exception) -> None:
+        self._resolve(ctx, error)
+
+    async def _sample_pool(self, interval: float = 0.05) -> None:
+        # noinspection PyProtectedMember
+        pool = self.bot.db._internal_pool
+
+        while True:
+            self.pool_samples.append((pool.get_size(), pool.get_idle_size(), pool.get_max_size(), metrics.pool_waiters.value))
+            await asyncio.sleep(interval)
+
+    def _command_for(self, name: str, user_id: int, rng: random.Random) -> str:
+        target = rng.choice(self.user_ids)
+        while target == user_id and len(self.user_ids) > 1:
+            target = rng.choice(self.user_ids)
+
+        match name:
+            case 'share':
+                return f'share <@{target}> {rng.randint(1, 100)}'
+            case 'rob':
+                return f'rob <@{target}>'
+            case 'balance' | 'inventory':
+                return name if rng.random() < 0.5 else f'{name} <@{target}>'
+            case _:
+                return name
+
+    async def _simulate(self, user_id: int, deadline: float, *, timeout: float, seed: int) -> None:
+        rng = random.Random(seed)
+        names, weights = list(self.mix), list(self.mix.values())
+        self._channel_users[self._channel_for(user_id)] = user_id
+
+        while perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            future = self.bot.loop.create_future()
+            start = perf_counter()
+
+            if name.startswith('/'):
+                key = self.inject_application_command(user_id, name[1:])
+            else:
+                key = self.inject_message(user_id, f'<@{BOT_ID}> {self._command_for(name, user_id, rng)}')
+
+            self._pending[key] = name, start, future
+            try:
+                await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                self._pending.pop(key, None)
+                self.timeouts[name] += 1
+
+    async def run(self, duration: float, *, timeout: float) -> float:
+        tracer.enabled = True
+        tracer.traces = deque()  # Unbounded for the duration of the run, to count queries per command
+
+        acquire_before = list(metrics.pool_acquire_wait.counts), metrics.pool_acquire_wait.sum
+        sampler = asyncio.create_task(self._sample_pool())
+        deadline = perf_counter() + duration
+        start = perf_counter()
+
+        await asyncio.gather(*(
+            self._simulate(user_id, deadline, timeout=timeout, seed=i)
+            for i, user_id in enumerate(self.user_ids[:self.concurrency])
+        ))
+
+        elapsed = perf_counter() - start
+        sampler.cancel()
+        tracer.enabled = False
+
+        # Only count acquires made during the run, not while seeding
+        counts, total = acquire_before
+        self.acquire_wait.counts = [after - before for after, before in zip(metrics.pool_acquire_wait.counts, counts)]
+        self.acquire_wait.count = sum(self.acquire_wait.counts)
+        self.acquire_wait.sum = metrics.pool_acquire_wait.sum - total
+        return elapsed
+
+    # Reporting
+
+    @staticmethod
+    def _percentile(values: list[float], percentile: float) -> float:
+        ordered = sorted(values)
+        return ordered[min(int(len(ordered) * percentile), len(ordered) - 1)]
+
+    @staticmethod
+    def _histogram_percentile(histogram: Histogram, percentile: float) -> float:
+        """The upper bound of the bucket that the given percentile falls in."""
+        target = histogram.count * percentile
+        cumulative = 0
+
+        for bound, count in zip((*histogram.bounds, float('inf')), histogram.counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+
+        return float('inf')
+
+    def report(self, elapsed: float) -> str:
+        queries: defaultdict[str, list[int]] = defaultdict(list)
+
+        for trace in tracer.traces:
+            spans = [span for _, span in trace.root.walk()]
+            queries[trace.command].append(sum(span.kind == 'sql' for span in spans))
+
+        rows = []
+        for name in sorted(self.latencies.keys() | self.timeouts.keys()):
+            latencies = self.latencies.get(name) or [0.0]
+            command = self.bot.get_command(name.lstrip('/'))
+            counts = queries.get(command.qualified_name if command else name) or [0]
+
+            rows.append((
+                name,
+                f'{len(self.latencies.get(name, ())):,}',
+                f'{self._percentile(latencies, 0.5) * 1000:,.1f}',
+                f'{self._percentile(latencies, 0.99) * 1000:,.1f}',
+                f'{sum(counts) / len(counts):.1f}',
+                ', '.join(f'{error} x{count}' for error, count in self.errors[name].most_common(3)) or '-',
+                f'{self.timeouts[name]:,}',
+            ))
+
+        completed = sum(map(len, self.latencies.values()))
+        table = tabulate.tabulate(rows, headers=('Command', 'Count', 'p50 (ms)', 'p99 (ms)', 'Queries', 'Errors', 'Timeouts'))
+
+        saturated = sum(idle == 0 and size >= max_size for size, idle, max_size, _ in self.pool_samples)
+        waiters = max((sample[3] for sample in self.pool_samples), default=0)
+        wait = self.acquire_wait
+
+        lines = [
+            table,
+            '',
+            f'{completed:,} commands in {elapsed:.1f}s: {completed / elapsed:,.1f} commands/s',
+            f'pool: saturated in {saturated / max(len(self.pool_samples), 1):.1%} of samples, at most {waiters:,.0f} waiters',
+            f'pool acquire wait: mean {wait.sum / max(wait.count, 1) * 1000:,.2f}ms, '
+            f'p99 <= {self._histogram_percentile(wait, 0.99) * 1000:,.1f}ms over {wait.count:,} acquires',
+            f'REST calls: {sum(self.transport.calls.values()):,} '
+            f'({", ".join(f"{route} x{count:,}" for route, count in self.transport.calls.most_common(4))})',
+        ]
+        return '\n'.join(lines)
+
+
+def _parse_mix(mix: str) -> dict[str, int]:
+    result = {}
+
+    for entry in mix.split(','):
+        name, _, weight = entry.strip().partition('=')
+        result[name] = int(weight or 1)
+
+    return result
+
+
+async def _main(bot: Bot, args: argparse.Namespace) -> None:
+    harness = LoadTest(
+        bot,
+        users=args.users,
+        concurrency=min(args.concurrency, args.users),
+        mix=_parse_mix(args.mix),
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+    )
+
+    tracing.DELAYS_ENABLED = args.delays
+    harness.install()
+
+    print(f'Seeding {args.users:,} users...')
+    await harness.seed()
+
+    print(f'Running {harness.concurrency:,} simulated users for {args.duration:.0f}s...')
+    elapsed = await harness.run(args.duration, timeout=args.timeout)
+    print(harness.report(elapsed))
+
+    await bot.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=1000, help='Users to seed, which are also the targets of share and rob.')
+    parser.add_argument('--concurrency', type=int, default=50, help='Simulated users running commands at once.')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to run for.')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='Weighted command mix, e.g. beg=4,fish=2,/beg=1.')
+    parser.add_argument('--latency', type=float, default=50, help='Simulated REST latency in milliseconds.')
+    parser.add_argument('--jitter', type=float, default=10, help='Random REST latency jitter in milliseconds.')
+    parser.add_argument('--timeout', type=float, default=30, help='Seconds before a command counts as timed out.')
+    parser.add_argument('--delays', action='store_true', help='Keep the deliberate delays in commands.')
+    args = parser.parse_args()
+
+    bot = Bot()
+    bot.loop.run_until_complete(_main(bot, args))
+
+
+if __name__ == '__main__':
+    main()
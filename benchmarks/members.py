@@ -0,0 +1,86 @@
+"""Measures building and querying the per-guild member name index.
+
+Run with ``python -m benchmarks.members``.
+"""
+
+from __future__ import annotations
+
+import random
+import string
+import tracemalloc
+from time import perf_counter
+
+from app.util.members import MemberNameIndex
+
+LOOKUPS = 10_000
+
+
+class FakeMember:
+    __slots__ = ('id', 'name', 'display_name', 'discriminator')
+
+    def __init__(self, id: int, name: str, display_name: str) -> None:
+        self.id = id
+        self.name = name
+        self.display_name = display_name
+        self.discriminator = format(id % 10_000, '04')
+
+    def __str__(self) -> str:
+        return f'{self.name}#{self.discriminator}'
+
+
+def _members(count: int) -> list[FakeMember]:
+    rng = random.Random(count)
+    letters = string.ascii_letters + string.digits
+
+    def name() -> str:
+        return ''.join(rng.choices(letters, k=rng.randint(4, 16)))
+
+    return [FakeMember(10 ** 17 + i, name(), name()) for i in range(count)]
+
+
+def _scan(members: list[FakeMember], argument: str) -> FakeMember | None:
+    for member in members:
+        if (
+            member.name.lower() == argument
+            or member.display_name.lower() == argument
+            or str(member).lower() == argument
+            or str(member.id) == argument
+        ):
+            return member
+
+
+def main() -> None:
+    for count in (10_000, 100_000, 500_000):
+        members = _members(count)
+        queries = [m.display_name.upper() for m in random.Random(0).sample(members, 100)]
+
+        tracemalloc.start()
+        start = perf_counter()
+        index = MemberNameIndex(members)
+        built = perf_counter() - start
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = perf_counter()
+        for i in range(LOOKUPS):
+            index.find(queries[i % 100])
+        exact = (perf_counter() - start) / LOOKUPS
+
+        start = perf_counter()
+        for i in range(LOOKUPS):
+            index.find_prefix(queries[i % 100][:3])
+        prefix = (perf_counter() - start) / LOOKUPS
+
+        start = perf_counter()
+        for query in queries[:10]:
+            _scan(members, query.lower())
+        scan = (perf_counter() - start) / 10
+
+        print(
+            f'{count:>7,} members: build {built * 1e3:,.0f} ms, {size / 2 ** 20:,.1f} MiB, '
+            f'exact {exact * 1e6:,.2f} us, prefix {prefix * 1e6:,.2f} us, linear scan {scan * 1e3:,.1f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
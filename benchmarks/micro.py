@@ -0,0 +1,298 @@
+"""Micro-benchmarks for pure hot-path helpers, with baselines stored in ``benchmarks/baselines.json``.
+
+None of these touch the database or the network, and the whole suite runs in well under a minute.
+Each benchmark reports the best time per call over several repeats, which is the least noisy statistic for code
+this small. Timings are only comparable on the same machine and Python version, which are stored with the baselines.
+
+Run with ``python -m benchmarks.micro``. Pass ``--save`` to record new baselines, ``--compare`` to compare against
+the stored ones, and ``-k`` to filter by name. ``--compare`` exits with status 1 if anything regressed past
+``--threshold``, or if anything could not be compared (no baselines file, no baseline for a benchmark, or a skipped one).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable
+
+BASELINES = Path(__file__).with_name('baselines.json')
+
+Setup = Callable[[], Callable[[], Any]]
+BENCHMARKS: dict[str, Setup] = {}
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    """Registers a benchmark. The decorated function does any setup and returns the callable to time."""
+    def decorator(func: Setup) -> Setup:
+        BENCHMARKS[name] = func
+        return func
+
+    return decorator
+
+
+@benchmark('leveling.calculate_level')
+def _calculate_level() -> Callable[[], Any]:
+    from app.util.common import calculate_level
+    return lambda: calculate_level(1_234_567, base=100, factor=1.26)
+
+
+@benchmark('leveling.level_requirement_for')
+def _level_requirement_for() -> Callable[[], Any]:
+    from app.util.common import level_requirement_for
+    return lambda: level_requirement_for(45, base=100, factor=1.26)
+
+
+@benchmark('leveling.curve_calculate')
+def _curve_calculate() -> Callable[[], Any]:
+    from app.util.leveling import get_curve
+    curve = get_curve(base=100, factor=1.26)
+    return lambda: curve.calculate(1_234_567)
+
+
+@benchmark('collections.get_by_key')
+def _get_by_key() -> Callable[[], Any]:
+    from app.data.items import Items
+    from app.util.common import get_by_key
+    return lambda: get_by_key(Items, 'loaf_of_bread')
+
+
+@benchmark('collections.walk_collection')
+def _walk_collection() -> Callable[[], Any]:
+    from app.data.items import Item, Items
+    from app.util.common import walk_collection
+    return lambda: list(walk_collection(Items, Item))
+
+
+@benchmark('collections.query_collection')
+def _query_collection() -> Callable[[], Any]:
+    from app.data.items import Item, Items
+    from app.util.common import query_collection
+    return lambda: query_collection(Items, Item, 'fishin pole')
+
+
+@benchmark('converters.parse_quantity_and_item')
+def _parse_quantity_and_item() -> Callable[[], Any]:
+    from app.util.converters import parse_quantity_and_item
+    return lambda: parse_quantity_and_item('fishing pole 25')
+
+
+@benchmark('converters.get_number')
+def _get_number() -> Callable[[], Any]:
+    from app.util.converters import get_number
+    return lambda: get_number('1.5m')
+
+
+@benchmark('converters.get_amount')
+def _get_amount() -> Callable[[], Any]:
+    from app.util.converters import get_amount
+    return lambda: get_amount(1_000_000, 1, 10_000_000, '3/4')
+
+
+@benchmark('formatting.pluralize')
+def _pluralize() -> Callable[[], Any]:
+    from app.util.common import pluralize
+    return lambda: pluralize('You have 1,234 coin(s) and 1 fish(es) in 3 slot(s).')
+
+
+@benchmark('formatting.humanize_duration')
+def _humanize_duration() -> Callable[[], Any]:
+    from app.util.common import humanize_duration
+    return lambda: humanize_duration(93784)
+
+
+@benchmark('formatting.progress_bar')
+def _progress_bar() -> Callable[[], Any]:
+    from app.util.common import progress_bar
+    return lambda: progress_bar(0.37, length=12)
+
+
+@benchmark('formatting.insert_random_u200b')
+def _insert_random_u200b() -> Callable[[], Any]:
+    from app.util.common import insert_random_u200b
+    return lambda: insert_random_u200b('hurry up and wind up the fishing pole')
+
+
+@benchmark('farming.get_letters')
+def _get_letters() -> Callable[[], Any]:
+    from app.database import CropInfo
+
+    def run() -> None:
+        for x in range(57):
+            CropInfo.get_letters(x)
+
+    return run
+
+
+def _sample_command() -> Any:
+    from discord.ext.commands import Greedy
+
+    from app.core.models import Command
+
+    async def callback(ctx: Any, user: int, amount: int = 1, items: Any = None, *, reason: str = None) -> None:
+        pass
+
+    # Annotations are resolved against the module globals, where Greedy isn't imported
+    callback.__annotations__['items'] = Greedy[int]
+    return Command(callback, name='sample')
+
+
+@benchmark('commands.ansi_signature_until')
+def _ansi_signature_until() -> Callable[[], Any]:
+    command = _sample_command()
+    return lambda: command.ansi_signature_until('amount')
+
+
+@benchmark('commands.ansi_signature_until_uncached')
+def _ansi_signature_until_uncached() -> Callable[[], Any]:
+    from app.core.models import Command
+
+    command = _sample_command()
+    return lambda: Command._ansi_signature_until(command, 'amount')
+
+
+def _inventory() -> Any:
+    from app.data.items import Items
+    from app.database import InventoryMapping
+
+    inventory = InventoryMapping()
+    for item in Items.all():
+        inventory[item] = random.randrange(1, 1000)
+
+    return inventory
+
+
+@benchmark('inventory.quantity_of_str')
+def _inventory_str() -> Callable[[], Any]:
+    inventory = _inventory()
+    return lambda: inventory.quantity_of('loaf_of_bread')
+
+
+@benchmark('inventory.quantity_of_item')
+def _inventory_item() -> Callable[[], Any]:
+    from app.data.items import Items
+
+    inventory = _inventory()
+    item = Items.bread
+    return lambda: inventory.quantity_of(item)
+
+
+@benchmark('pagination.get_page')
+def _get_page() -> Callable[[], Any]:
+    from app.util.pagination import Formatter
+
+    class ListFormatter(Formatter[int]):
+        async def format_page(self, paginator: Any, entry: Any) -> Any:
+            return entry
+
+    formatter = ListFormatter(list(range(1_000_000)), per_page=10)
+    return lambda: formatter.get_page(54_321)
+
+
+def measure(setup: Setup, *, repeat: int, budget: float) -> float:
+    """Returns the best time per call, in nanoseconds."""
+    random.seed(0)
+    func = setup()
+
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()  # At least 0.2 seconds worth of calls
+    number = max(1, int(number * budget / max(elapsed, 1e-9)))
+
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def environment() -> dict[str, str]:
+    return {'python': platform.python_version(), 'implementation': platform.python_implementation(), 'machine': platform.machine()}
+
+
+def load_baselines() -> dict[str, Any]:
+    if not BASELINES.exists():
+        return {}
+
+    with BASELINES.open(encoding='utf-8') as fp:
+        return json.load(fp)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-k', dest='pattern', default='', help='Only run benchmarks whose name contains this.')
+    parser.add_argument('--save', action='store_true', help='Record the results as the new baselines.')
+    parser.add_argument('--compare', action='store_true', help='Compare the results against the stored baselines.')
+    parser.add_argument('--threshold', type=float, default=0.15, help='Relative slowdown that counts as a regression.')
+    parser.add_argument('--repeat', type=int, default=5, help='Repeats per benchmark, the best one is reported.')
+    parser.add_argument('--budget', type=float, default=0.1, help='Approximate seconds per repeat.')
+    args = parser.parse_args()
+
+    if args.compare and not BASELINES.exists():
+        print(f'error: no baselines to compare against, record them with --save first ({BASELINES})', file=sys.stderr)
+        return 1
+
+    stored = load_baselines()
+    baselines = stored.get('results', {})
+
+    if args.compare and stored.get('environment') not in (None, environment()):
+        print(f'warning: baselines were recorded on {stored["environment"]}, this is {environment()}', file=sys.stderr)
+
+    results = {}
+    regressions = []
+    uncompared = []
+
+    for name, setup in BENCHMARKS.items():
+        if args.pattern not in name:
+            continue
+
+        try:
+            results[name] = ns = measure(setup, repeat=args.repeat, budget=args.budget)
+        except ImportError as exc:
+            print(f'{name:<42} skipped ({exc})')
+            uncompared.append(name)
+            continue
+
+        line = f'{name:<42} {ns:>12,.1f} ns/call'
+
+        if args.compare:
+            if baseline := baselines.get(name):
+                change = ns / baseline - 1
+                line += f'  {baseline:>12,.1f} baseline  {change:>+7.1%}'
+
+                if change > args.threshold:
+                    regressions.append(name)
+                    line += '  REGRESSION'
+            else:
+                uncompared.append(name)
+                line += '  NO BASELINE'
+
+        print(line)
+
+    if args.save and results:
+        # Merge, so that saving a filtered run only updates the benchmarks that ran
+        stored = {'environment': environment(), 'results': {**baselines, **results}}
+        with BASELINES.open('w', encoding='utf-8') as fp:
+            json.dump(stored, fp, indent=2, sort_keys=True)
+            fp.write('\n')
+
+        print(f'Saved {len(results):,} baselines to {BASELINES.name}.')
+
+    failed = False
+
+    if regressions:
+        print(f'{len(regressions):,} regression(s): {", ".join(regressions)}', file=sys.stderr)
+        failed = True
+
+    if args.compare and uncompared:
+        print(f'{len(uncompared):,} benchmark(s) could not be compared: {", ".join(uncompared)}', file=sys.stderr)
+        failed = True
+
+    if args.compare and not results and not uncompared:
+        print(f'error: no benchmarks matched {args.pattern!r}', file=sys.stderr)
+        failed = True
+
+    return int(failed)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
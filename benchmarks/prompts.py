@@ -0,0 +1,48 @@
+"""Measures the per-message cost of resolving pending message prompts.
+
+Run with ``python -m benchmarks.prompts``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from time import perf_counter
+from types import SimpleNamespace
+
+from app.util.structures import PromptRegistry
+
+MESSAGES = 10_000
+
+
+def _message(author_id: int, channel_id: int) -> SimpleNamespace:
+    return SimpleNamespace(author=SimpleNamespace(id=author_id), channel=SimpleNamespace(id=channel_id), content='')
+
+
+async def _run(pending: int) -> float:
+    registry = PromptRegistry()
+    waiters = [asyncio.ensure_future(registry.wait_for(i, 1)) for i in range(pending)]
+    await asyncio.sleep(0)
+
+    # Messages from users who have no pending prompt, i.e. the common case
+    messages = [_message(pending + i, 1) for i in range(MESSAGES)]
+
+    start = perf_counter()
+    for message in messages:
+        registry.dispatch(message)
+    elapsed = perf_counter() - start
+
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+
+    return elapsed / MESSAGES
+
+
+async def main() -> None:
+    for pending in (0, 10, 100, 1_000, 10_000):
+        per_message = await _run(pending)
+        print(f'{pending:>6,} pending prompts: {per_message * 1e9:,.0f} ns/message')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+"""Measures the resident memory of cached user records, comparing the previous dict/NamedTuple layout to the current one.
+
+Each simulated user has a full users row, a 4x4 farm, 3 skills, 5 cooldowns and 20 notifications.
+
+Run with ``python -m benchmarks.records``.
+"""
+
+from __future__ import annotations
+
+import datetime
+import gc
+import random
+import tracemalloc
+from collections import namedtuple
+from typing import Any, Callable
+
+from app.data.items import ItemType, Items
+from app.database import CooldownInfo, CropGrid, CropInfo, Notification, SkillInfo, UserData
+
+USERS = 10_000
+
+# The previous layout: a plain dict per row and NamedTuples in dicts for each manager
+LegacyNotification = namedtuple('LegacyNotification', 'created_at title content')
+LegacySkillInfo = namedtuple('LegacySkillInfo', 'skill points cooldown_until')
+LegacyCooldownInfo = namedtuple('LegacyCooldownInfo', 'command expires previous_expiry')
+LegacyCropInfo = namedtuple('LegacyCropInfo', 'x y crop exp last_harvest created_at')
+
+TITLES = ('You leveled up!', 'You died!', 'You almost died!', 'Someone robbed you!')
+COMMANDS = ('daily', 'weekly', 'beg', 'fish', 'rob')
+SKILLS = ('begging', 'robbery', 'defense')
+
+
+def _row(rng: random.Random, user_id: int) -> dict[str, Any]:
+    return {
+        'user_id': user_id,
+        'wallet': rng.randrange(10 ** 7),
+        'bank': rng.randrange(10 ** 7),
+        'max_bank': rng.randrange(10 ** 7),
+        'exp': rng.randrange(10 ** 6),
+        'exp_multiplier': 0.0,
+        'net_worth': rng.randrange(10 ** 7),
+        'daily_streak': rng.randrange(100),
+        'weekly_streak': rng.randrange(10),
+        'unread_notifications': rng.randrange(20),
+        'discovered_recipes': [],
+        'padlock_active': False,
+        'dm_notifications': False,
+        'plain_text_errors': False,
+    }
+
+
+def _title(rng: random.Random) -> str:
+    # Strings decoded from the database are new objects each time, this mimics that
+    return ''.join(list(rng.choice(TITLES)))
+
+
+def legacy_user(rng: random.Random, user_id: int, now: datetime.datetime, crops: list) -> tuple:
+    return (
+        dict(_row(rng, user_id)),
+        {(x, y): LegacyCropInfo(x, y, rng.choice(crops), rng.randrange(500), now, now) for x in range(4) for y in range(4)},
+        {skill: LegacySkillInfo(skill, rng.randrange(50), None) for skill in SKILLS},
+        {command: LegacyCooldownInfo(command, now, None) for command in COMMANDS},
+        [LegacyNotification(now, _title(rng), f'Content {i}') for i in range(20)],
+    )
+
+
+def current_user(rng: random.Random, user_id: int, now: datetime.datetime, crops: list) -> tuple:
+    data = UserData()
+    data.load(_row(rng, user_id))
+
+    grid = CropGrid()
+    for x in range(4):
+        for y in range(4):
+            grid[x, y] = CropInfo(x, y, rng.choice(crops), rng.randrange(500), now, now)
+
+    return (
+        data,
+        grid,
+        {skill: SkillInfo(skill, rng.randrange(50), None) for skill in SKILLS},
+        {command: CooldownInfo(command, now, None) for command in COMMANDS},
+        [Notification.from_record({'created_at': now, 'title': _title(rng), 'content': f'Content {i}'}) for i in range(20)],
+    )
+
+
+def measure(factory: Callable[..., tuple]) -> float:
+    rng = random.Random(0)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    crops = [item for item in Items.all() if item.type is ItemType.crop]
+
+    gc.collect()
+    tracemalloc.start()
+
+    users = [factory(rng, user_id, now, crops) for user_id in range(USERS)]
+    size, _ = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+    del users
+    return size / USERS
+
+
+def main() -> None:
+    before = measure(legacy_user)
+    after = measure(current_user)
+
+    print(f'before: {before:,.0f} bytes/user')
+    print(f'after: {after:,.0f} bytes/user ({1 - after / before:.1%} less)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+"""Exercises the trivia prefetcher against a local stand-in for the opentdb API.
+
+:class:`FakeOpenTDB` serves ``/api.php`` from a fixed pool of questions on an ephemeral local port, and can be told
+to be slow, to fail with an HTTP error, or to answer with a non-zero response code. Each check below runs a
+:class:`TriviaPrefetcher` against a fresh server and a fresh JSONL store in a temporary directory, covering the
+initial refill, low-water refills, retries after failures, deduplication and persistence.
+
+Run with ``python -m benchmarks.trivia``. Exits with status 1 if any check fails.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+
+from aiohttp import ClientSession, web
+
+from app.util.trivia import TriviaPrefetcher, TriviaStore
+
+
+def _question(i: int) -> dict[str, Any]:
+    # HTML entities, as opentdb escapes everything
+    return {
+        'category': 'General Knowledge',
+        'type': 'multiple',
+        'difficulty': random.choice(('easy', 'medium', 'hard')),
+        'question': f'Which of these is &quot;answer {i}&quot;?',
+        'correct_answer': f'Answer {i}',
+        'incorrect_answers': [f'Wrong {i}&amp;{j}' for j in range(3)],
+    }
+
+
+class FakeOpenTDB:
+    """Serves random samples of a fixed pool of ``pool`` questions, without repeats within one response."""
+
+    def __init__(self, *, pool: int = 200, latency: float = 0) -> None:
+        self.questions: list[dict[str, Any]] = [_question(i) for i in range(pool)]
+        self.latency: float = latency
+        self.requests: int = 0
+        self.failures: int = 0  # The next this many requests fail with a 503
+        self.response_code: int = 0
+
+        self.app: web.Application = web.Application()
+        self.app.router.add_get('/api.php', self.handle)
+        self._runner: web.AppRunner | None = None
+        self.url: str = ''
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+
+        if self.failures:
+            self.failures -= 1
+            return web.Response(status=503)
+
+        if self.response_code:
+            return web.json_response({'response_code': self.response_code, 'results': []})
+
+        amount = int(request.query.get('amount', 10))
+        results = random.sample(self.questions, min(amount, len(self.questions)))
+        return web.json_response({'response_code': 0, 'results': results})
+
+    async def start(self) -> None:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, '127.0.0.1', 0).start()
+
+        host, port = self._runner.addresses[0][:2]
+        self.url = f'http://{host}:{port}/api.php'
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+class Harness:
+    """A fake server, a client session and a store in a temporary directory, shared by a single check."""
+
+    def __init__(self, directory: str, **server_kwargs: Any) -> None:
+        self.path: str = os.path.join(directory, 'trivia.jsonl')
+        self.server: FakeOpenTDB = FakeOpenTDB(**server_kwargs)
+        self.session: ClientSession | None = None
+
+    async def __aenter__(self) -> Harness:
+        await self.server.start()
+        self.session = ClientSession()
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.session.close()
+        await self.server.close()
+
+    def prefetcher(self, **kwargs: Any) -> TriviaPrefetcher:
+        kwargs.setdefault('batch_size', 50)
+        kwargs.setdefault('low_water', 15)
+        return TriviaPrefetcher(self.session, TriviaStore(self.path), url=self.server.url, **kwargs)
+
+    def persisted(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+
+        with open(self.path, encoding='utf-8') as fp:
+            return sum(1 for line in fp if line.strip())
+
+
+class CheckFailed(Exception):
+    pass
+
+
+def expect(condition: bool, message: str) -> None:
+    if not condition:
+        raise CheckFailed(message)
+
+
+async def settle(prefetcher: TriviaPrefetcher) -> None:
+    # noinspection PyProtectedMember
+    if (task := prefetcher._task) is not None:
+        await task
+
+
+async def check_initial_refill(directory: str) -> None:
+    async with Harness(directory) as harness:
+        prefetcher = harness.prefetcher()
+        await prefetcher.start()
+        await settle(prefetcher)
+
+        expect(harness.server.requests == 1, f'expected 1 request, got {harness.server.requests}')
+        expect(len(prefetcher) == 50, f'expected 50 queued questions, got {len(prefetcher)}')
+        expect(harness.persisted() == 50, f'expected 50 persisted questions, got {harness.persisted()}')
+
+        question = prefetcher.pop()
+        expect('&quot;' not in question.question, 'question was not unescaped')
+        expect(all('&amp;' not in answer for answer in question.incorrect_answers), 'answers were not unescaped')
+
+
+async def check_low_water(directory: str) -> None:
+    async with Harness(directory, latency=0.05) as harness:
+        prefetcher = harness.prefetcher()
+        await prefetcher.start()
+        await settle(prefetcher)
+
+        # Above the low-water mark, popping must not touch the network
+        for _ in range(50 - 15):
+            prefetcher.pop()
+        expect(harness.server.requests == 1, f'refilled above the low-water mark ({harness.server.requests} requests)')
+
+        # Below it, every pop asks for a refill but only one may be in flight
+        start = perf_counter()
+        for _ in range(10):
+            expect(prefetcher.pop() is not None, 'ran out of questions while a refill was pending')
+        elapsed = perf_counter() - start
+
+        expect(elapsed < 0.01, f'popping waited on the network ({elapsed * 1000:.1f}ms for 10 pops)')
+        await settle(prefetcher)
+
+        expect(harness.server.requests == 2, f'expected 2 requests, got {harness.server.requests}')
+        expect(prefetcher.refills == 2, f'expected 2 refills, got {prefetcher.refills}')
+
+
+async def check_retry(directory: str) -> None:
+    async with Harness(directory) as harness:
+        harness.server.failures = 1
+        prefetcher = harness.prefetcher(retry_after=0.2)
+        await prefetcher.start()
+        await settle(prefetcher)
+
+        expect(prefetcher.failures == 1, f'expected 1 failure, got {prefetcher.failures}')
+        expect(prefetcher.last_error is not None, 'the failure was not recorded')
+        expect(prefetcher.pop() is None, 'served a question with nothing fetched or stored')
+
+        # Within the retry window, no further requests are made
+        prefetcher.maybe_refill()
+        await settle(prefetcher)
+        expect(harness.server.requests == 1, f'retried too early ({harness.server.requests} requests)')
+
+        await asyncio.sleep(0.25)
+        prefetcher.maybe_refill()
+        await settle(prefetcher)
+
+        expect(harness.server.requests == 2, f'did not retry ({harness.server.requests} requests)')
+        expect(len(prefetcher) == 50, f'expected 50 queued questions after retrying, got {len(prefetcher)}')
+
+
+async def check_response_code(directory: str) -> None:
+    async with Harness(directory) as harness:
+        harness.server.response_code = 5  # Rate limited
+        prefetcher = harness.prefetcher()
+        await prefetcher.start()
+        await settle(prefetcher)
+
+        expect(prefetcher.failures == 1, f'expected 1 failure, got {prefetcher.failures}')
+        expect(len(prefetcher) == 0 and harness.persisted() == 0, 'stored questions from a failed response')
+
+
+async def check_dedupe(directory: str) -> None:
+    # Consecutive batches of 50 out of 60 questions overlap by at least 40
+    async with Harness(directory, pool=60) as harness:
+        prefetcher = harness.prefetcher(low_water=60)
+
+        await prefetcher.start()
+        await settle(prefetcher)
+        asked = {prefetcher.pop().question for _ in range(10)}
+
+        prefetcher.maybe_refill()
+        await settle(prefetcher)
+
+        store = prefetcher.store
+        expect(harness.server.requests == 2, f'expected 2 requests, got {harness.server.requests}')
+        expect(len(store) <= 60, f'stored {len(store)} questions out of a pool of 60')
+        expect(harness.persisted() == len(store), f'persisted {harness.persisted()} lines for {len(store)} questions')
+
+        # noinspection PyProtectedMember
+        queued = [question.question for question in prefetcher._queue]
+        expect(not asked.intersection(queued[40:]), 'requeued questions that were already asked')
+
+
+async def check_persistence(directory: str) -> None:
+    async with Harness(directory) as harness:
+        prefetcher = harness.prefetcher()
+        await prefetcher.start()
+        await settle(prefetcher)
+
+    # A new process with the API down still serves questions from the store, without waiting
+    async with Harness(directory) as harness:
+        harness.server.failures = 1_000
+        prefetcher = harness.prefetcher()
+        await prefetcher.start()
+
+        expect(len(prefetcher.store) == 50, f'expected 50 questions loaded from disk, got {len(prefetcher.store)}')
+
+        start = perf_counter()
+        question = prefetcher.pop()
+        elapsed = perf_counter() - start
+
+        expect(question is not None, 'did not fall back to the store')
+        expect(elapsed < 0.01, f'falling back to the store took {elapsed * 1000:.1f}ms')
+        expect(prefetcher.store.was_asked(question), 'the question was not marked as asked')
+
+        await settle(prefetcher)
+        expect(prefetcher.failures == 1, f'expected 1 failure, got {prefetcher.failures}')
+        expect(harness.persisted() == 50, 'the store changed without a successful refill')
+
+
+CHECKS: dict[str, Callable[[str], Awaitable[None]]] = {
+    'initial refill': check_initial_refill,
+    'low-water refill': check_low_water,
+    'retry after failure': check_retry,
+    'non-zero response code': check_response_code,
+    'deduplication': check_dedupe,
+    'persistence': check_persistence,
+}
+
+
+async def main() -> int:
+    random.seed(0)
+    failed = 0
+
+    for name, check in CHECKS.items():
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                await check(directory)
+            except CheckFailed as exc:
+                failed += 1
+                print(f'{name:<24} FAILED: {exc}')
+            else:
+                print(f'{name:<24} ok')
+
+    if failed:
+        print(f'{failed:,} check(s) failed.', file=sys.stderr)
+
+    return int(bool(failed))
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
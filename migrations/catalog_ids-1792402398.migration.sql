@@ -0,0 +1,121 @@
+CREATE TABLE catalog_ids (
+    id SMALLINT NOT NULL PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    UNIQUE (kind, key)
+);
+
+INSERT INTO catalog_ids (id, kind, key) VALUES
+    (1, 'item', 'lifesaver'),
+    (2, 'item', 'padlock'),
+    (3, 'item', 'banknote'),
+    (4, 'item', 'cheese'),
+    (5, 'item', 'spinning_coin'),
+    (6, 'item', 'key'),
+    (7, 'item', 'fishing_pole'),
+    (8, 'item', 'fish_bait'),
+    (9, 'item', 'stick'),
+    (10, 'item', 'axe'),
+    (11, 'item', 'dirt'),
+    (12, 'item', 'worm'),
+    (13, 'item', 'gummy_worm'),
+    (14, 'item', 'earthworm'),
+    (15, 'item', 'hook_worm'),
+    (16, 'item', 'poly_worm'),
+    (17, 'item', 'ancient_relic'),
+    (18, 'item', 'shovel'),
+    (19, 'item', 'durable_shovel'),
+    (20, 'item', 'fish'),
+    (21, 'item', 'sardine'),
+    (22, 'item', 'angel_fish'),
+    (23, 'item', 'blowfish'),
+    (24, 'item', 'crab'),
+    (25, 'item', 'lobster'),
+    (26, 'item', 'octopus'),
+    (27, 'item', 'dolphin'),
+    (28, 'item', 'shark'),
+    (29, 'item', 'whale'),
+    (30, 'item', 'axolotl'),
+    (31, 'item', 'vibe_fish'),
+    (32, 'item', 'wood'),
+    (33, 'item', 'redwood'),
+    (34, 'item', 'blackwood'),
+    (35, 'item', 'iron'),
+    (36, 'item', 'copper'),
+    (37, 'item', 'silver'),
+    (38, 'item', 'gold'),
+    (39, 'item', 'obsidian'),
+    (40, 'item', 'emerald'),
+    (41, 'item', 'diamond'),
+    (42, 'item', 'pickaxe'),
+    (43, 'item', 'durable_pickaxe'),
+    (44, 'item', 'diamond_pickaxe'),
+    (45, 'item', 'common_crate'),
+    (46, 'item', 'uncommon_crate'),
+    (47, 'item', 'rare_crate'),
+    (48, 'item', 'epic_crate'),
+    (49, 'item', 'legendary_crate'),
+    (50, 'item', 'mythic_crate'),
+    (51, 'item', 'cup'),
+    (52, 'item', 'watering_can'),
+    (53, 'item', 'glass_of_water'),
+    (54, 'item', 'tomato'),
+    (55, 'item', 'tomato_crop'),
+    (56, 'item', 'wheat'),
+    (57, 'item', 'wheat_crop'),
+    (58, 'item', 'carrot'),
+    (59, 'item', 'carrot_crop'),
+    (60, 'item', 'corn'),
+    (61, 'item', 'corn_crop'),
+    (62, 'item', 'lettuce'),
+    (63, 'item', 'lettuce_crop'),
+    (64, 'item', 'potato'),
+    (65, 'item', 'potato_crop'),
+    (66, 'item', 'tobacco'),
+    (67, 'item', 'tobacco_crop'),
+    (68, 'item', 'flour'),
+    (69, 'item', 'loaf_of_bread'),
+    (10000, 'skill', 'begging'),
+    (10001, 'skill', 'robbery'),
+    (10002, 'skill', 'defense'),
+    (20000, 'recipe', 'durable_shovel'),
+    (20001, 'recipe', 'durable_pickaxe'),
+    (20002, 'recipe', 'diamond_pickaxe'),
+    (20003, 'recipe', 'fish_bait'),
+    (20004, 'recipe', 'stick'),
+    (20005, 'recipe', 'flour'),
+    (20006, 'recipe', 'bread'),
+    (20007, 'recipe', 'glass_of_water');
+
+-- items.item
+ALTER TABLE items ADD COLUMN item_id SMALLINT;
+UPDATE items SET item_id = catalog_ids.id FROM catalog_ids WHERE catalog_ids.kind = 'item' AND catalog_ids.key = items.item;
+DELETE FROM items WHERE item_id IS NULL;
+ALTER TABLE items DROP COLUMN item;
+ALTER TABLE items RENAME COLUMN item_id TO item;
+ALTER TABLE items ALTER COLUMN item SET NOT NULL;
+ALTER TABLE items ADD PRIMARY KEY (user_id, item);
+
+-- item_prices.item
+ALTER TABLE item_prices ADD COLUMN item_id SMALLINT;
+UPDATE item_prices SET item_id = catalog_ids.id FROM catalog_ids WHERE catalog_ids.kind = 'item' AND catalog_ids.key = item_prices.item;
+DELETE FROM item_prices WHERE item_id IS NULL;
+ALTER TABLE item_prices DROP COLUMN item;
+ALTER TABLE item_prices RENAME COLUMN item_id TO item;
+ALTER TABLE item_prices ALTER COLUMN item SET NOT NULL;
+ALTER TABLE item_prices ADD PRIMARY KEY (item);
+
+-- crops.crop (crops that no longer exist become empty land)
+ALTER TABLE crops ADD COLUMN crop_id SMALLINT;
+UPDATE crops SET crop_id = catalog_ids.id FROM catalog_ids WHERE catalog_ids.kind = 'item' AND catalog_ids.key = crops.crop;
+ALTER TABLE crops DROP COLUMN crop;
+ALTER TABLE crops RENAME COLUMN crop_id TO crop;
+
+-- skills.skill
+ALTER TABLE skills ADD COLUMN skill_id SMALLINT;
+UPDATE skills SET skill_id = catalog_ids.id FROM catalog_ids WHERE catalog_ids.kind = 'skill' AND catalog_ids.key = skills.skill;
+DELETE FROM skills WHERE skill_id IS NULL;
+ALTER TABLE skills DROP COLUMN skill;
+ALTER TABLE skills RENAME COLUMN skill_id TO skill;
+ALTER TABLE skills ALTER COLUMN skill SET NOT NULL;
+ALTER TABLE skills ADD PRIMARY KEY (user_id, skill);
@@ -0,0 +1,2 @@
+ALTER TABLE users
+ADD COLUMN crop_notifications BOOLEAN NOT NULL DEFAULT false;
@@ -0,0 +1,4 @@
+CREATE TABLE guilds (
+    guild_id BIGINT NOT NULL PRIMARY KEY,
+    prefixes TEXT[] NOT NULL DEFAULT ARRAY []::TEXT[]
+);
@@ -0,0 +1,29 @@
+CREATE TABLE item_prices (
+    item TEXT NOT NULL PRIMARY KEY,
+    price BIGINT NOT NULL DEFAULT 0
+);
+
+ALTER TABLE users ADD COLUMN net_worth BIGINT NOT NULL DEFAULT 0;
+CREATE INDEX users_net_worth_idx ON users (net_worth DESC);
+
+CREATE FUNCTION update_net_worth() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE users
+        SET net_worth = net_worth - OLD.count * COALESCE((SELECT price FROM item_prices WHERE item = OLD.item), 0)
+        WHERE user_id = OLD.user_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE users
+        SET net_worth = net_worth + NEW.count * COALESCE((SELECT price FROM item_prices WHERE item = NEW.item), 0)
+        WHERE user_id = NEW.user_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER items_net_worth
+AFTER INSERT OR UPDATE OF count OR DELETE ON items
+FOR EACH ROW EXECUTE FUNCTION update_net_worth();
@@ -0,0 +1,2 @@
+ALTER TABLE users
+ADD COLUMN plain_text_errors BOOLEAN NOT NULL DEFAULT false;
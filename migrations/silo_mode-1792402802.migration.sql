@@ -0,0 +1,2 @@
+ALTER TABLE users
+ADD COLUMN silo_mode BOOLEAN NOT NULL DEFAULT false;